@@ -7,10 +7,55 @@ API Reference: https://thesadru.github.io/genshin.py/pdoc/genshin
 Source Code: https://github.com/thesadru/genshin.py
 """
 
-from . import models, utility
-from .client import *
-from .constants import *
-from .errors import *
-from .types import *
+import importlib as _importlib
+import types as _types
+import typing as _typing
+
+if _typing.TYPE_CHECKING:
+    from . import models, utility
+    from .client import *
+    from .constants import *
+    from .errors import *
+    from .types import *
 
 __version__ = "1.0.0"
+
+# submodules are only imported once one of their attributes is accessed
+_SUBMODULES = ("client", "constants", "errors", "models", "paginators", "types", "utility")
+_STAR_MODULES = ("client", "constants", "errors", "types")
+
+
+def _get_public_names(module: _types.ModuleType) -> _typing.Sequence[str]:
+    """Get the names a star import of a module would import."""
+    if hasattr(module, "__all__"):
+        return module.__all__
+
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __getattr__(name: str) -> _typing.Any:
+    if name in _SUBMODULES:
+        return _importlib.import_module(f".{name}", __name__)
+
+    if name == "__all__":
+        names = {*_SUBMODULES}
+        for module_name in _STAR_MODULES:
+            names.update(_get_public_names(_importlib.import_module(f".{module_name}", __name__)))
+
+        value: _typing.Any = sorted(names)
+        globals()[name] = value
+        return value
+
+    # later star imports take priority
+    for module_name in reversed(_STAR_MODULES):
+        module = _importlib.import_module(f".{module_name}", __name__)
+        if name in _get_public_names(module):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> _typing.Sequence[str]:
+    return sorted({*globals(), *__getattr__("__all__")})
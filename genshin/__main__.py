@@ -296,6 +296,32 @@ async def pity(client: genshin.Client) -> None:
             click.secho(f"Never pulled a 5*. At most {a} pulls left until pity")
 
 
+@cli.command()
+@click.argument("path", type=click.Path(dir_okay=False))
+@click.option(
+    "--history",
+    help="The history to export.",
+    type=click.Choice(["wishes", "transactions", "rewards", "diary"]),
+    default="wishes",
+)
+@click.option("--format", "format_", help="Defaults to the file extension.", type=click.Choice(["jsonl", "csv"]))
+@client_command
+async def export(client: genshin.Client, path: str, history: str, format_: typing.Any = None) -> None:
+    """Export a history to a JSONL or CSV file."""
+    if history in ("wishes", "transactions"):
+        client.set_authkey()
+
+    getters: dict[str, typing.Callable[[], genshin.paginators.Paginator[typing.Any]]] = {
+        "wishes": client.wish_history,
+        "transactions": client.transaction_log,
+        "rewards": client.claimed_rewards,
+        "diary": client.genshin_diary_log,
+    }
+    count = await genshin.utility.export_history(getters[history](), path, format=format_)
+
+    click.echo(f"Exported {click.style(str(count), bold=True)} items to {path}")
+
+
 @cli.command(hidden=True)
 @client_command
 async def banner_ids(client: genshin.Client) -> None:
@@ -1,6 +1,7 @@
 """Default client implementation."""
 
 from . import components
+from .archive import *
 from .cache import *
 from .clients import *
 from .compatibility import *
@@ -0,0 +1,220 @@
+"""Persistent archive of gacha histories."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import datetime
+import json
+import typing
+
+from genshin import types
+from genshin.models.genshin import gacha as models
+
+if typing.TYPE_CHECKING:
+    import aiosqlite
+
+
+__all__ = ["BaseGachaArchive", "GachaArchive", "SQLiteGachaArchive"]
+
+GACHA_MODELS: typing.Mapping[types.Game, type[models.BaseWish]] = {
+    types.Game.GENSHIN: models.Wish,
+    types.Game.STARRAIL: models.Warp,
+    types.Game.ZZZ: models.SignalSearch,
+}
+
+
+def _sort_history(items: typing.Iterable[models.BaseWish]) -> list[models.BaseWish]:
+    """Sort pulls of one or more banners from the newest."""
+    return sorted(items, key=lambda item: (item.time.timestamp(), item.id), reverse=True)
+
+
+class BaseGachaArchive(abc.ABC):
+    """Base archive of pulls stored per game, uid and banner.
+
+    Pull ids only ever increase, so the newest stored id tells how far a history has to be fetched.
+    """
+
+    @abc.abstractmethod
+    async def get_last_id(self, game: types.Game, uid: int, banner_type: int) -> int:
+        """Get the id of the newest stored pull of a banner, 0 if there are none."""
+
+    @abc.abstractmethod
+    async def add(self, game: types.Game, uid: int, banner_type: int, items: typing.Sequence[models.BaseWish]) -> None:
+        """Store pulls of a banner, already stored ones are ignored."""
+
+    @abc.abstractmethod
+    async def get(
+        self,
+        game: types.Game,
+        uid: int,
+        banner_types: typing.Sequence[int],
+        *,
+        since: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Sequence[models.BaseWish]:
+        """Get the stored pulls of several banners merged from the newest.
+
+        Pulls older than since are skipped.
+        """
+
+
+class GachaArchive(BaseGachaArchive):
+    """In-memory gacha archive."""
+
+    _banners: dict[tuple[types.Game, int, int], dict[int, models.BaseWish]]
+
+    def __init__(self) -> None:
+        self._banners = {}
+
+    async def get_last_id(self, game: types.Game, uid: int, banner_type: int) -> int:
+        """Get the id of the newest stored pull of a banner, 0 if there are none."""
+        return max(self._banners.get((game, uid, banner_type)) or (0,))
+
+    async def add(self, game: types.Game, uid: int, banner_type: int, items: typing.Sequence[models.BaseWish]) -> None:
+        """Store pulls of a banner, already stored ones are ignored."""
+        banner = self._banners.setdefault((game, uid, banner_type), {})
+        for item in items:
+            banner.setdefault(item.id, item)
+
+    async def get(
+        self,
+        game: types.Game,
+        uid: int,
+        banner_types: typing.Sequence[int],
+        *,
+        since: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Sequence[models.BaseWish]:
+        """Get the stored pulls of several banners merged from the newest."""
+        return _sort_history(
+            item
+            for banner_type in banner_types
+            for item in self._banners.get((game, uid, banner_type), {}).values()
+            if since is None or item.time >= since
+        )
+
+
+class SQLiteGachaArchive(BaseGachaArchive):
+    """SQLite implementation of the gacha archive.
+
+    Pulls are stored in the shape returned by the API, so they're parsed exactly like fetched ones.
+    """
+
+    conn: aiosqlite.Connection | None
+    db_name: str
+
+    _owns_conn: bool
+    _setup_task: asyncio.Task[aiosqlite.Connection] | None
+
+    def __init__(self, conn: aiosqlite.Connection | None = None, *, db_name: str = "genshin_py_gacha.db") -> None:
+        self.conn = conn
+        self.db_name = db_name
+
+        self._owns_conn = conn is None
+        self._setup_task = None
+
+    async def _setup(self) -> aiosqlite.Connection:
+        """Open the connection and prepare the schema."""
+        import aiosqlite
+
+        if self.conn is None:
+            self.conn = await aiosqlite.connect(self.db_name)
+
+        conn = self.conn
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute(
+            "CREATE TABLE IF NOT EXISTS gacha ("
+            "game TEXT, uid INTEGER, banner_type INTEGER, id INTEGER, time INTEGER, data TEXT, "
+            "PRIMARY KEY (game, uid, banner_type, id))"
+        )
+        await conn.execute("CREATE INDEX IF NOT EXISTS gacha_time ON gacha (game, uid, time)")
+        await conn.commit()
+
+        return conn
+
+    async def _get_conn(self) -> aiosqlite.Connection:
+        """Get the shared connection, setting it up on first use."""
+        if self._setup_task is None:
+            self._setup_task = asyncio.create_task(self._setup())
+
+        return await self._setup_task
+
+    async def initialize(self) -> None:
+        """Initialize the archive."""
+        await self._get_conn()
+
+    async def close(self) -> None:
+        """Close the connection if it was opened by the archive."""
+        if self._owns_conn and self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+
+        self._setup_task = None
+
+    def serialize_item(self, item: models.BaseWish) -> str:
+        """Serialize a pull back into the shape returned by the API."""
+        data = item.model_dump(mode="json", by_alias=True, exclude={"time", "banner_type"})
+        # the time is parsed as local time of the server
+        data["time"] = item.time.replace(tzinfo=None).isoformat(" ")
+        return json.dumps(data)
+
+    def deserialize_items(
+        self,
+        game: types.Game,
+        rows: typing.Iterable[typing.Sequence[typing.Any]],
+    ) -> list[models.BaseWish]:
+        """Parse rows of (banner_type, data) into pulls."""
+        model = GACHA_MODELS[game]
+        return model.parse_many(dict(json.loads(data), banner_type=banner_type) for banner_type, data in rows)
+
+    async def get_last_id(self, game: types.Game, uid: int, banner_type: int) -> int:
+        """Get the id of the newest stored pull of a banner, 0 if there are none."""
+        conn = await self._get_conn()
+
+        async with conn.execute(
+            "SELECT MAX(id) FROM gacha WHERE game = ? AND uid = ? AND banner_type = ?",
+            (game.value, uid, banner_type),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        return row[0] if row and row[0] is not None else 0
+
+    async def add(self, game: types.Game, uid: int, banner_type: int, items: typing.Sequence[models.BaseWish]) -> None:
+        """Store pulls of a banner, already stored ones are ignored."""
+        conn = await self._get_conn()
+
+        await conn.executemany(
+            "INSERT OR IGNORE INTO gacha (game, uid, banner_type, id, time, data) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (game.value, uid, banner_type, item.id, int(item.time.timestamp()), self.serialize_item(item))
+                for item in items
+            ],
+        )
+        await conn.commit()
+
+    async def get(
+        self,
+        game: types.Game,
+        uid: int,
+        banner_types: typing.Sequence[int],
+        *,
+        since: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Sequence[models.BaseWish]:
+        """Get the stored pulls of several banners merged from the newest.
+
+        Pulls older than since are skipped using the time index.
+        """
+        conn = await self._get_conn()
+
+        params: list[typing.Any] = [game.value, uid, *banner_types]
+        placeholders = ",".join("?" * len(banner_types))
+        query = f"SELECT banner_type, data FROM gacha WHERE game = ? AND uid = ? AND banner_type IN ({placeholders})"  # noqa: S608
+        if since is not None:
+            query += " AND time >= ?"
+            params.append(int(since.timestamp()))
+
+        query += " ORDER BY time DESC, id DESC"
+
+        async with conn.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+
+        return self.deserialize_items(game, rows)
@@ -3,19 +3,31 @@
 from __future__ import annotations
 
 import abc
-import dataclasses
+import asyncio
+import collections
 import enum
 import json
 import sys
 import time
+import types
 import typing
+import zlib
 
 if typing.TYPE_CHECKING:
     import aioredis
     import aiosqlite
 
 
-__all__ = ["BaseCache", "Cache", "RedisCache", "SQLiteCache", "StaticCache"]
+__all__ = [
+    "BaseCache",
+    "Cache",
+    "CompressedSerializer",
+    "JSONSerializer",
+    "RedisCache",
+    "SQLiteCache",
+    "Serializer",
+    "StaticCache",
+]
 
 MINUTE = 60
 HOUR = MINUTE * 60
@@ -40,24 +52,104 @@ def _separate(values: typing.Iterable[typing.Any], sep: str = ":") -> str:
     return sep.join(parts)
 
 
-@dataclasses.dataclass(eq=False)
+def _field_property(index: int, field: str) -> property:
+    """Create a property returning a field of a cache key."""
+    return property(lambda self: self.values[index], doc=f"Value of the {field} field.")
+
+
+class CacheKeyFamily:
+    """Factory for cache keys sharing a name and fields.
+
+    Families should be created once, usually at module level, and called to create keys.
+    Keys are instances of a class made for the family, with a property for every field.
+    """
+
+    __slots__ = ("fields", "key_type", "name")
+
+    name: str
+    fields: tuple[str, ...]
+    key_type: type[CacheKey]
+    """Class of the keys of the family."""
+
+    def __init__(self, name: str, *fields: str) -> None:
+        reserved = set(fields) & {"family", "key", "values"}
+        if reserved:
+            raise ValueError(f"Reserved cache key field names: {', '.join(sorted(reserved))}")
+
+        self.name = name
+        self.fields = fields
+
+        class_name = "".join(part.capitalize() for part in name.split("_")) + "CacheKey"
+        self.key_type = types.new_class(class_name, (CacheKey,), {"family": self}, lambda ns: ns.update(__slots__=()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(map(repr, (self.name, *self.fields)))})"
+
+    def __call__(self, *values: typing.Any, **kwargs: typing.Any) -> CacheKey:
+        """Create a key from field values."""
+        if len(values) + len(kwargs) != len(self.fields):
+            raise TypeError(f"{self!r} expects the fields {', '.join(self.fields)}")
+
+        if kwargs:
+            values += tuple(kwargs[field] for field in self.fields[len(values) :])
+
+        return self.key_type(self, values)
+
+
 class CacheKey:
+    """Cache key with a precomputed string and hash.
+
+    Subclasses defined with a `family` keyword get a property for every field of the family.
+    """
+
+    __slots__ = ("_hash", "_string", "family", "values")
+
+    family: CacheKeyFamily
+    values: tuple[typing.Any, ...]
+
+    def __init__(self, family: CacheKeyFamily, values: tuple[typing.Any, ...]) -> None:
+        self.family = family
+        self.values = values
+
+        self._string = _separate((family.name, *values))
+        self._hash = hash(self._string)
+
+    def __init_subclass__(cls, family: typing.Optional[CacheKeyFamily] = None, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        for i, field in enumerate(family.fields if family else ()):
+            setattr(cls, field, _field_property(i, field))
+
     def __str__(self) -> str:
-        values = [getattr(self, field.name) for field in dataclasses.fields(self)]
-        return _separate(values)
+        return self._string
+
+    def __repr__(self) -> str:
+        kwargs = ", ".join(f"{field}={value!r}" for field, value in zip(self.family.fields, self.values))
+        return f"{self.__class__.__name__}({self.family.name!r}, {kwargs})"
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, o: object) -> bool:
-        return isinstance(o, CacheKey) and str(self) == str(o)
+        return self is o or (isinstance(o, CacheKey) and self._hash == o._hash and self._string == o._string)
+
+    @property
+    def key(self) -> str:
+        """Name of the key's family."""
+        return self.family.name
+
+
+_CACHE_KEY_FAMILIES: dict[tuple[str, tuple[str, ...]], CacheKeyFamily] = {}
 
 
 def cache_key(key: str, **kwargs: typing.Any) -> CacheKey:
-    name = key.capitalize() + "CacheKey"
-    fields = ["key"] + list(kwargs.keys())
-    cls = dataclasses.make_dataclass(name, fields, bases=(CacheKey,), eq=False)
-    return typing.cast("CacheKey", cls(key, **kwargs))
+    """Create a cache key, reusing the family for the same key and fields."""
+    fields = tuple(kwargs)
+    family = _CACHE_KEY_FAMILIES.get((key, fields))
+    if family is None:
+        family = _CACHE_KEY_FAMILIES[key, fields] = CacheKeyFamily(key, *fields)
+
+    return family(*kwargs.values())
 
 
 class BaseCache(abc.ABC):
@@ -79,22 +171,62 @@ class BaseCache(abc.ABC):
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
 
+    async def delete(self, key: typing.Any) -> None:
+        """Delete an object with a key."""
+        raise NotImplementedError(f"{type(self).__name__} does not support deleting objects.")
+
+    async def get_many(
+        self, keys: typing.Sequence[typing.Any], *, static: bool = False
+    ) -> list[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys.
+
+        Missing objects are returned as None.
+        """
+        if static:
+            return [await self.get_static(key) for key in keys]
+
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys."""
+        for key, value in items.items():
+            if static:
+                await self.set_static(key, value)
+            else:
+                await self.set(key, value)
+
+    async def delete_many(self, keys: typing.Sequence[typing.Any]) -> None:
+        """Delete multiple objects with their keys."""
+        for key in keys:
+            await self.delete(key)
+
 
 class Cache(BaseCache):
-    """Standard implementation of the cache."""
+    """Standard implementation of the cache.
 
-    cache: dict[typing.Any, tuple[float, typing.Any]]
+    Entries are evicted in least recently used order and expire lazily when accessed.
+    """
+
+    cache: collections.OrderedDict[typing.Any, tuple[float, typing.Any]]
     maxsize: int
     ttl: float
     static_ttl: float
 
+    hits: int
+    misses: int
+    evictions: int
+
     def __init__(self, maxsize: int = 1024, *, ttl: float = HOUR, static_ttl: float = DAY) -> None:
-        self.cache = {}
+        self.cache = collections.OrderedDict()
         self.maxsize = maxsize
 
         self.ttl = ttl
         self.static_ttl = static_ttl
 
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
     def __len__(self) -> int:
         self._clear_cache()
         return len(self.cache)
@@ -104,31 +236,37 @@ class Cache(BaseCache):
         # since this is always called from an async function we don't need locks
         now = time.time()
 
-        for key, value in self.cache.copy().items():
-            if value[0] < now:
-                del self.cache[key]
+        for key in [key for key, (expiration, _) in self.cache.items() if expiration < now]:
+            del self.cache[key]
 
-        if len(self.cache) > self.maxsize:
-            overflow = len(self.cache) - self.maxsize
-            keys = list(self.cache.keys())[:overflow]
+    def _store(self, key: typing.Any, value: typing.Any, ttl: float) -> None:
+        """Store a value and evict the least recently used items over maxsize."""
+        self.cache[key] = (time.time() + ttl, value)
+        self.cache.move_to_end(key)
 
-            for key in keys:
-                del self.cache[key]
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        self._clear_cache()
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
 
-        if key not in self.cache:
+        if entry[0] < time.time():
+            del self.cache[key]
+            self.misses += 1
             return None
 
-        return self.cache[key][1]
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return entry[1]
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        self.cache[key] = (time.time() + self.ttl, value)
-
-        self._clear_cache()
+        self._store(key, value, self.ttl)
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -136,9 +274,11 @@ class Cache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        self.cache[key] = (time.time() + self.static_ttl, value)
+        self._store(key, value, self.static_ttl)
 
-        self._clear_cache()
+    async def delete(self, key: typing.Any) -> None:
+        """Delete an object with a key."""
+        self.cache.pop(key, None)
 
 
 class StaticCache(Cache):
@@ -151,17 +291,98 @@ class StaticCache(Cache):
         """Do nothing."""
 
 
+class Serializer(abc.ABC):
+    """Value serializer for external caches."""
+
+    @abc.abstractmethod
+    def dumps(self, value: typing.Any) -> typing.Union[str, bytes]:
+        """Serialize a value into a string or bytes."""
+
+    @abc.abstractmethod
+    def loads(self, value: typing.Union[str, bytes]) -> typing.Any:
+        """Deserialize a string or bytes back into data."""
+
+
+class JSONSerializer(Serializer):
+    """Plain json serializer."""
+
+    def dumps(self, value: typing.Any) -> str:
+        """Serialize a value into a json string."""
+        return json.dumps(value)
+
+    def loads(self, value: typing.Union[str, bytes]) -> typing.Any:
+        """Deserialize a json string."""
+        return json.loads(value)
+
+
+class CompressedSerializer(Serializer):
+    """Compact binary serializer.
+
+    Uses msgpack if it is installed and json otherwise. Payloads over `threshold` bytes are zlib compressed.
+    Plain json values written by `JSONSerializer` are still readable.
+    """
+
+    threshold: int
+    level: int
+
+    def __init__(self, *, threshold: int = 1024, level: int = 6) -> None:
+        self.threshold = threshold
+        self.level = level
+
+    def dumps(self, value: typing.Any) -> bytes:
+        """Serialize a value into framed bytes."""
+        try:
+            import msgpack
+        except ImportError:
+            body, codec = json.dumps(value, separators=(",", ":")).encode(), b"j"
+        else:
+            body, codec = msgpack.packb(value), b"m"
+
+        if len(body) >= self.threshold:
+            return b"z" + codec + zlib.compress(body, self.level)
+
+        return b"r" + codec + body
+
+    def loads(self, value: typing.Union[str, bytes]) -> typing.Any:
+        """Deserialize framed bytes."""
+        if isinstance(value, str):
+            value = value.encode()
+
+        frame, codec, body = value[:1], value[1:2], value[2:]
+        if frame not in (b"z", b"r"):
+            return json.loads(value)
+
+        if frame == b"z":
+            body = zlib.decompress(body)
+
+        if codec == b"m":
+            import msgpack
+
+            return msgpack.unpackb(body)
+
+        return json.loads(body)
+
+
 class RedisCache(BaseCache):
     """Redis implementation of the cache."""
 
     redis: aioredis.Redis
     ttl: int
     static_ttl: int
+    serializer: Serializer
 
-    def __init__(self, redis: aioredis.Redis, *, ttl: int = HOUR, static_ttl: int = DAY) -> None:
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        *,
+        ttl: int = HOUR,
+        static_ttl: int = DAY,
+        serializer: typing.Optional[Serializer] = None,
+    ) -> None:
         self.redis = redis
         self.ttl = ttl
         self.static_ttl = static_ttl
+        self.serializer = serializer or JSONSerializer()
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
@@ -169,11 +390,11 @@ class RedisCache(BaseCache):
 
     def serialize_value(self, value: typing.Any) -> typing.Union[str, bytes]:
         """Serialize a value by turning it into bytes."""
-        return json.dumps(value)
+        return self.serializer.dumps(value)
 
     def deserialize_value(self, value: bytes) -> typing.Any:
         """Deserialize a value back into data."""
-        return json.loads(value)
+        return self.serializer.loads(value)
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
@@ -183,6 +404,19 @@ class RedisCache(BaseCache):
 
         return self.deserialize_value(value)
 
+    async def get_many(
+        self, keys: typing.Sequence[typing.Any], *, static: bool = False
+    ) -> list[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys using MGET."""
+        if not keys:
+            return []
+
+        values = typing.cast(
+            "list[typing.Optional[bytes]]",
+            await self.redis.mget([self.serialize_key(key) for key in keys]),  # pyright: ignore
+        )
+        return [None if value is None else self.deserialize_value(value) for value in values]
+
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
         await self.redis.set(  # pyright: ignore
@@ -191,6 +425,27 @@ class RedisCache(BaseCache):
             ex=self.ttl,
         )
 
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys in a single pipeline."""
+        if not items:
+            return
+
+        ttl = self.static_ttl if static else self.ttl
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            for key, value in items.items():
+                pipe.set(self.serialize_key(key), self.serialize_value(value), ex=ttl)  # pyright: ignore
+
+            await pipe.execute()  # pyright: ignore
+
+    async def delete(self, key: typing.Any) -> None:
+        """Delete an object with a key."""
+        await self.redis.delete(self.serialize_key(key))  # pyright: ignore
+
+    async def delete_many(self, keys: typing.Sequence[typing.Any]) -> None:
+        """Delete multiple objects with their keys."""
+        if keys:
+            await self.redis.delete(*(self.serialize_key(key) for key in keys))  # pyright: ignore
+
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
         return await self.get(key)
@@ -205,11 +460,22 @@ class RedisCache(BaseCache):
 
 
 class SQLiteCache(BaseCache):
-    """SQLite implementation of the cache."""
+    """SQLite implementation of the cache.
+
+    A single connection is kept open for the lifetime of the cache. Writes are committed
+    in groups after `commit_delay` seconds and expired rows are swept every `sweep_interval` seconds.
+    """
 
     conn: aiosqlite.Connection | None
     ttl: int
     static_ttl: int
+    commit_delay: float
+    sweep_interval: float
+
+    _owns_conn: bool
+    _setup_task: asyncio.Task[aiosqlite.Connection] | None
+    _commit_task: asyncio.Task[None] | None
+    _sweep_task: asyncio.Task[None] | None
 
     def __init__(
         self,
@@ -218,11 +484,50 @@ class SQLiteCache(BaseCache):
         ttl: int = HOUR,
         static_ttl: int = DAY,
         db_name: str = "genshin_py.db",
+        commit_delay: float = 0.05,
+        sweep_interval: float = MINUTE,
     ) -> None:
         self.conn = conn
         self.ttl = ttl
         self.static_ttl = static_ttl
         self.db_name = db_name
+        self.commit_delay = commit_delay
+        self.sweep_interval = sweep_interval
+
+        self._owns_conn = conn is None
+        self._setup_task = None
+        self._commit_task = None
+        self._sweep_task = None
+
+    async def _setup(self) -> aiosqlite.Connection:
+        """Open the connection and prepare the schema."""
+        import aiosqlite
+
+        if self.conn is None:
+            self.conn = await aiosqlite.connect(self.db_name)
+
+        conn = self.conn
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)")
+        await conn.execute("CREATE INDEX IF NOT EXISTS cache_expiration ON cache (expiration)")
+        await conn.commit()
+
+        self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+        return conn
+
+    async def _get_conn(self) -> aiosqlite.Connection:
+        """Get the shared connection, setting it up on first use."""
+        if self._setup_task is None:
+            self._setup_task = asyncio.create_task(self._setup())
+
+        try:
+            return await self._setup_task
+        except Exception:
+            # let a later call retry
+            self._setup_task = None
+            raise
 
     async def _clear_cache(self, conn: aiosqlite.Connection) -> None:
         """Clear timed-out items."""
@@ -231,20 +536,52 @@ class SQLiteCache(BaseCache):
         await conn.execute("DELETE FROM cache WHERE expiration < ?", (now,))
         await conn.commit()
 
+    async def _sweep_loop(self) -> None:
+        """Periodically clear timed-out items."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            if self.conn is not None:
+                await self._clear_cache(self.conn)
+
+    async def _delayed_commit(self) -> None:
+        """Commit all writes made within the commit window."""
+        await asyncio.sleep(self.commit_delay)
+        self._commit_task = None
+
+        if self.conn is not None:
+            await self.conn.commit()
+
+    def _schedule_commit(self) -> None:
+        """Schedule a group commit unless one is already pending."""
+        if self._commit_task is None:
+            self._commit_task = asyncio.create_task(self._delayed_commit())
+
     async def initialize(self) -> None:
         """Initialize the cache."""
-        import aiosqlite
+        await self._get_conn()
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+    async def flush(self) -> None:
+        """Commit pending writes immediately."""
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            self._commit_task = None
 
-        await conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)")
-        await conn.commit()
+        if self.conn is not None:
+            await self.conn.commit()
 
-        if self.conn is None:
-            await conn.close()
+    async def close(self) -> None:
+        """Commit pending writes and close the connection if it was opened by the cache."""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+
+        await self.flush()
+
+        if self._owns_conn and self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+
+        self._setup_task = None
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
@@ -260,44 +597,69 @@ class SQLiteCache(BaseCache):
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        import aiosqlite
-
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+        conn = await self._get_conn()
 
         async with conn.execute(
             "SELECT value FROM cache WHERE key = ? AND expiration > ?", (self.serialize_key(key), int(time.time()))
         ) as cursor:
             value = await cursor.fetchone()
 
-        if self.conn is None:
-            await conn.close()
-
         if value is None:
             return None
 
         return self.deserialize_value(value[0])
 
+    async def get_many(
+        self, keys: typing.Sequence[typing.Any], *, static: bool = False
+    ) -> list[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys in a single query.
+
+        Missing objects are returned as None.
+        """
+        conn = await self._get_conn()
+        serialized = [self.serialize_key(key) for key in keys]
+
+        found: dict[str, str] = {}
+        # stay well below the sqlite host parameter limit
+        for i in range(0, len(serialized), 500):
+            chunk = serialized[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expiration > ?"  # noqa: S608
+            async with conn.execute(query, (*chunk, int(time.time()))) as cursor:
+                for key, value in await cursor.fetchall():
+                    found[key] = value
+
+        return [self.deserialize_value(found[key]) if key in found else None for key in serialized]
+
+    async def _insert(self, items: typing.Iterable[tuple[typing.Any, typing.Any]], ttl: int) -> None:
+        """Insert items and schedule a group commit."""
+        conn = await self._get_conn()
+        expiration = int(time.time() + ttl)
+
+        await conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
+            [(self.serialize_key(key), self.serialize_value(value), expiration) for key, value in items],
+        )
+        self._schedule_commit()
+
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        import aiosqlite
+        await self._insert([(key, value)], self.ttl)
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys in a single transaction."""
+        await self._insert(items.items(), self.static_ttl if static else self.ttl)
 
-        await conn.execute(
-            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-            (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.ttl)),
-        )
-        await conn.commit()
-        await self._clear_cache(conn)
+    async def delete(self, key: typing.Any) -> None:
+        """Delete an object with a key."""
+        await self.delete_many([key])
 
-        if self.conn is None:
-            await conn.close()
+    async def delete_many(self, keys: typing.Sequence[typing.Any]) -> None:
+        """Delete multiple objects with their keys."""
+        conn = await self._get_conn()
+
+        await conn.executemany("DELETE FROM cache WHERE key = ?", [(self.serialize_key(key),) for key in keys])
+        self._schedule_commit()
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -305,19 +667,4 @@ class SQLiteCache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        import aiosqlite
-
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
-
-        await conn.execute(
-            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-            (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.static_ttl)),
-        )
-        await conn.commit()
-        await self._clear_cache(conn)
-
-        if self.conn is None:
-            await conn.close()
+        await self._insert([(key, value)], self.static_ttl)
@@ -16,13 +16,15 @@ import yarl
 
 from genshin import constants, errors, types, utility
 from genshin.client import cache as client_cache
-from genshin.client import routes
+from genshin.client import ratelimit, routes
 from genshin.client.manager import managers
 from genshin.models import hoyolab as hoyolab_models
-from genshin.utility import concurrency, deprecation, ds
+from genshin.utility import concurrency, deprecation, ds, httpcache
 
 __all__ = ["BaseClient"]
 
+ACCOUNTS_CACHE_KEY = client_cache.CacheKeyFamily("accounts", "hoyolab_id")
+
 
 T = typing.TypeVar("T")
 CallableT = typing.TypeVar("CallableT", bound="typing.Callable[..., object]")
@@ -36,12 +38,29 @@ def parse_loose_headers(
     return multidict.CIMultiDict((str(k), str(v)) for k, v in dict(loose_headers or ()).items())
 
 
+def _get_request_key(
+    url: aiohttp.typedefs.StrOrURL,
+    params: typing.Optional[typing.Mapping[str, typing.Any]],
+    headers: multidict.CIMultiDict[str],
+) -> typing.Hashable:
+    """Get a key identifying an uncached request.
+
+    The DS header is randomized per request and therefore ignored.
+    """
+    return (
+        str(url),
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        tuple(sorted((k.lower(), v) for k, v in headers.items() if k.lower() != "ds")),
+    )
+
+
 class BaseClient(abc.ABC):
     """Base ABC Client."""
 
     __slots__ = (
         "cookie_manager",
         "cache",
+        "http_cache",
         "_lang",
         "_region",
         "_default_game",
@@ -50,6 +69,7 @@ class BaseClient(abc.ABC):
         "_hoyolab_id",
         "_accounts",
         "custom_headers",
+        "_inflight",
     )
 
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"  # noqa: E501
@@ -58,6 +78,7 @@ class BaseClient(abc.ABC):
 
     cookie_manager: managers.BaseCookieManager
     cache: client_cache.BaseCache
+    http_cache: httpcache.BaseValidatorCache
     _lang: str
     _region: types.Region
     _default_game: typing.Optional[types.Game]
@@ -67,6 +88,7 @@ class BaseClient(abc.ABC):
     _hoyolab_id: typing.Optional[int]
     _accounts: dict[types.Game, hoyolab_models.GenshinAccount]
     custom_headers: multidict.CIMultiDict[str]
+    _inflight: concurrency.SingleFlight
 
     def __init__(
         self,
@@ -87,10 +109,12 @@ class BaseClient(abc.ABC):
     ) -> None:
         self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies)
         self.cache = cache or client_cache.StaticCache()
+        self.http_cache = httpcache.ValidatorCache()
 
         self.uids = {}
         self.authkeys = {}
         self._accounts = {}
+        self._inflight = concurrency.SingleFlight()
 
         self.default_game = game
         self.lang = lang
@@ -118,6 +142,21 @@ class BaseClient(abc.ABC):
         )
         return f"<{type(self).__name__} {', '.join(f'{k}={v!r}' for k, v in kwargs.items() if v)}>"
 
+    async def __aenter__(self: T) -> T:
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying http session and release pooled connections."""
+        await self.cookie_manager.close()
+
+    @property
+    def coalesced_requests(self) -> int:
+        """The amount of requests which were served by an identical request already in flight."""
+        return self._inflight.coalesced
+
     @property
     def device_id(self) -> typing.Optional[str]:
         """The device id used in headers."""
@@ -264,14 +303,18 @@ class BaseClient(abc.ABC):
         if not bool(cookies) ^ bool(kwargs):
             raise TypeError("Cannot use both positional and keyword arguments at once")
 
-        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies or kwargs)
+        cookie_manager = managers.BaseCookieManager.from_cookies(cookies or kwargs)
+        cookie_manager.inherit_session(self.cookie_manager)
+        self.cookie_manager = cookie_manager
 
     def set_browser_cookies(self, browser: typing.Optional[str] = None) -> None:
         """Extract cookies from your browser and set them as client cookies.
 
         Available browsers: chrome, chromium, opera, edge, firefox.
         """
-        self.cookie_manager = managers.BaseCookieManager.from_browser_cookies(browser)
+        cookie_manager = managers.BaseCookieManager.from_browser_cookies(browser)
+        cookie_manager.inherit_session(self.cookie_manager)
+        self.cookie_manager = cookie_manager
 
     def set_authkey(self, authkey: typing.Optional[str] = None, *, game: typing.Optional[types.Game] = None) -> None:
         """Set an authkey for wish & transaction logs.
@@ -296,13 +339,19 @@ class BaseClient(abc.ABC):
         self.cache = client_cache.Cache(maxsize, ttl=ttl, static_ttl=static_ttl)
 
     def set_redis_cache(
-        self, url: str, *, ttl: int = client_cache.HOUR, static_ttl: int = client_cache.DAY, **redis_kwargs: typing.Any
+        self,
+        url: str,
+        *,
+        ttl: int = client_cache.HOUR,
+        static_ttl: int = client_cache.DAY,
+        serializer: typing.Optional[client_cache.Serializer] = None,
+        **redis_kwargs: typing.Any,
     ) -> None:
         """Create and set a new redis cache."""
         import aioredis
 
         redis = aioredis.Redis.from_url(url, **redis_kwargs)  # pyright: ignore[reportUnknownMemberType]
-        self.cache = client_cache.RedisCache(redis, ttl=ttl, static_ttl=static_ttl)
+        self.cache = client_cache.RedisCache(redis, ttl=ttl, static_ttl=static_ttl, serializer=serializer)
 
     @property
     def proxy(self) -> typing.Optional[str]:
@@ -316,6 +365,15 @@ class BaseClient(abc.ABC):
     def proxy(self, proxy: typing.Optional[aiohttp.typedefs.StrOrURL]) -> None:
         self.cookie_manager.proxy = yarl.URL(proxy) if proxy else None
 
+    @property
+    def ratelimiter(self) -> typing.Optional[ratelimit.RateLimiter]:
+        """Ratelimiter for outgoing requests, may be shared between multiple clients."""
+        return self.cookie_manager.ratelimiter
+
+    @ratelimiter.setter
+    def ratelimiter(self, ratelimiter: typing.Optional[ratelimit.RateLimiter]) -> None:
+        self.cookie_manager.ratelimiter = ratelimiter
+
     async def _request_hook(
         self,
         method: str,
@@ -373,20 +431,32 @@ class BaseClient(abc.ABC):
         if "json" in kwargs:
             raise TypeError("Use data instead of json in request.")
 
-        await self._request_hook(method, url, params=params, data=data, headers=headers, **kwargs)
+        async def perform() -> typing.Mapping[str, typing.Any]:
+            await self._request_hook(method, url, params=params, data=data, headers=headers, **kwargs)
 
-        response = await self.cookie_manager.request(
-            url, method=method, params=params, json=data, headers=headers, **kwargs
-        )
+            response = await self.cookie_manager.request(
+                url, method=method, params=params, json=data, headers=headers, **kwargs
+            )
 
-        # cache
+            # cache
 
-        if cache is not None:
-            await self.cache.set(cache, response)
-        elif static_cache is not None:
-            await self.cache.set_static(static_cache, response)
+            if cache is not None:
+                await self.cache.set(cache, response)
+            elif static_cache is not None:
+                await self.cache.set_static(static_cache, response)
+
+            return response
 
-        return response
+        # concurrent identical requests share a single response
+
+        key = cache if cache is not None else static_cache
+        if key is None and method == "GET" and not kwargs:
+            key = _get_request_key(url, params, headers)
+
+        if key is None:
+            return await perform()
+
+        return await self._inflight.run(key, perform)
 
     async def request_webstatic(
         self,
@@ -397,7 +467,10 @@ class BaseClient(abc.ABC):
         region: types.Region = types.Region.OVERSEAS,
         **kwargs: typing.Any,
     ) -> typing.Any:
-        """Request a static json file."""
+        """Request a static json file.
+
+        Once the cache expires the file is revalidated and only downloaded again if it changed.
+        """
         if cache is not None:
             value = await self.cache.get_static(cache)
             if value is not None:
@@ -411,10 +484,10 @@ class BaseClient(abc.ABC):
 
         await self._request_hook("GET", url, headers=headers, **kwargs)
 
-        async with self.cookie_manager.create_session() as session:
-            async with session.get(url, headers=headers, proxy=self.proxy, **kwargs) as r:
-                r.raise_for_status()
-                data = await r.json()
+        session = self.cookie_manager.get_session()
+        data = await httpcache.conditional_get(
+            session, url, self.http_cache, headers=headers, proxy=self.proxy, **kwargs
+        )
 
         if cache is not None:
             await self.cache.set_static(cache, data)
@@ -487,7 +560,7 @@ class BaseClient(abc.ABC):
         data = await self.request_hoyolab(
             "binding/api/getUserGameRolesByCookie",
             lang=lang,
-            cache=client_cache.cache_key("accounts", hoyolab_id=self.hoyolab_id),
+            cache=ACCOUNTS_CACHE_KEY(self.hoyolab_id),
         )
         return [hoyolab_models.GenshinAccount(**i) for i in data["list"]]
 
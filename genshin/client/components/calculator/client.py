@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import typing
 import warnings
@@ -21,6 +20,10 @@ from .calculator import Calculator, FurnishingCalculator
 
 __all__ = ["CalculatorClient"]
 
+CALCULATOR_CACHE_KEY = client_cache.CacheKeyFamily("calculator", "slug", "lang")
+ARTIFACT_SET_CACHE_KEY = client_cache.CacheKeyFamily("calculator", "slug", "artifact", "lang")
+BLUEPRINT_CACHE_KEY = client_cache.CacheKeyFamily("calculator", "slug", "share_code", "lang")
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,14 +58,15 @@ class CalculatorClient(base.BaseClient):
 
         if self.region == types.Region.CHINESE:
             headers["referer"] = str(routes.CALCULATOR_REFERER_URL.get_url())
-        update_task = asyncio.create_task(utility.update_characters_any(lang or self.lang, lenient=True))
+        update_task = utility.CHARACTER_REFRESHER.ensure(lang or self.lang)
 
         data = await self.request(url, method=method, params=params, data=data, headers=headers, **kwargs)
 
-        try:
-            await update_task
-        except Exception as e:
-            warnings.warn(f"Failed to update characters: {e!r}")
+        if update_task is not None:
+            try:
+                await update_task
+            except Exception as e:
+                warnings.warn(f"Failed to update characters: {e!r}")
 
         return data
 
@@ -128,7 +132,7 @@ class CalculatorClient(base.BaseClient):
 
         cache: typing.Optional[client_cache.CacheKey] = None
         if not any(filters.values()) and not sync:
-            cache = client_cache.cache_key("calculator", slug=slug, lang=lang or self.lang)
+            cache = CALCULATOR_CACHE_KEY(slug, lang or self.lang)
 
         try:
             data = await self.request_calculator(endpoint, lang=lang, data=payload, cache=cache)
@@ -167,7 +171,7 @@ class CalculatorClient(base.BaseClient):
                 weapon_cat_ids=weapon_types or [],
             ),
         )
-        return [models.CalculatorCharacter(**i) for i in data]
+        return models.CalculatorCharacter.parse_many(data)
 
     async def get_calculator_weapons(
         self,
@@ -187,7 +191,7 @@ class CalculatorClient(base.BaseClient):
                 weapon_levels=rarities or [],
             ),
         )
-        return [models.CalculatorWeapon(**i) for i in data]
+        return models.CalculatorWeapon.parse_many(data)
 
     async def get_calculator_artifacts(
         self,
@@ -207,7 +211,7 @@ class CalculatorClient(base.BaseClient):
                 reliquary_levels=rarities or [],
             ),
         )
-        return [models.CalculatorArtifact(**i) for i in data]
+        return models.CalculatorArtifact.parse_many(data)
 
     async def get_calculator_furnishings(
         self,
@@ -225,7 +229,7 @@ class CalculatorClient(base.BaseClient):
                 weapon_levels=rarities or 0,
             ),
         )
-        return [models.CalculatorFurnishing(**i) for i in data]
+        return models.CalculatorFurnishing.parse_many(data)
 
     async def get_character_details(
         self,
@@ -287,7 +291,7 @@ class CalculatorClient(base.BaseClient):
             method="GET",
             lang=lang,
             params=dict(reliquary_id=int(artifact)),
-            cache=client_cache.cache_key("calculator", slug="set", artifact=int(artifact), lang=lang or self.lang),
+            cache=ARTIFACT_SET_CACHE_KEY("set", int(artifact), lang or self.lang),
         )
         return [models.CalculatorArtifact(**i) for i in data["reliquary_list"]]
 
@@ -314,7 +318,7 @@ class CalculatorClient(base.BaseClient):
             method="GET",
             lang=lang,
             params=dict(share_code=share_code, region=region),
-            cache=client_cache.cache_key("calculator", slug="blueprint", share_code=share_code, lang=lang or self.lang),
+            cache=BLUEPRINT_CACHE_KEY("blueprint", share_code, lang or self.lang),
         )
         return [models.CalculatorFurnishing(**i) for i in data["list"]]
 
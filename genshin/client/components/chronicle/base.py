@@ -1,7 +1,5 @@
 """Base battle chronicle component."""
 
-import asyncio
-import dataclasses
 import typing
 import warnings
 
@@ -14,24 +12,27 @@ from genshin.utility import deprecation
 
 __all__ = ["BaseBattleChronicleClient"]
 
+RECORDS_CACHE_KEY = cache.CacheKeyFamily("records", "hoyolab_id", "lang")
 
-@dataclasses.dataclass(unsafe_hash=True)
-class HoyolabCacheKey(cache.CacheKey):
-    endpoint: str
-    hoyolab_id: int
-    lang: str
 
+HOYOLAB_CACHE_KEY = cache.CacheKeyFamily("hoyolab", "endpoint", "hoyolab_id", "lang")
+CHRONICLE_CACHE_KEY = cache.CacheKeyFamily("chronicle", "game", "endpoint", "uid", "lang", "params")
 
-@dataclasses.dataclass(unsafe_hash=True)
-class ChronicleCacheKey(cache.CacheKey):
-    def __str__(self) -> str:
-        return "chronicle" + ":" + super().__str__()
 
-    game: types.Game
-    endpoint: str
-    uid: int
-    lang: str
-    params: tuple[typing.Any, ...] = ()
+class HoyolabCacheKey(cache.CacheKey, family=HOYOLAB_CACHE_KEY):
+    __slots__ = ()
+
+    def __init__(self, endpoint: str, hoyolab_id: int, lang: str) -> None:
+        super().__init__(HOYOLAB_CACHE_KEY, (endpoint, hoyolab_id, lang))
+
+
+class ChronicleCacheKey(cache.CacheKey, family=CHRONICLE_CACHE_KEY):
+    __slots__ = ()
+
+    def __init__(
+        self, game: types.Game, endpoint: str, uid: int, lang: str, params: tuple[typing.Any, ...] = ()
+    ) -> None:
+        super().__init__(CHRONICLE_CACHE_KEY, (game, endpoint, uid, lang, params))
 
 
 class BaseBattleChronicleClient(base.BaseClient):
@@ -60,14 +61,15 @@ class BaseBattleChronicleClient(base.BaseClient):
 
         url = base_url / endpoint
 
-        update_task = asyncio.create_task(utility.update_characters_any(lang or self.lang, lenient=True))
+        update_task = utility.CHARACTER_REFRESHER.ensure(lang or self.lang)
 
         data = await self.request_hoyolab(url, lang=lang, region=region, **kwargs)
 
-        try:
-            await update_task
-        except Exception as e:
-            warnings.warn(f"Failed to update characters: {e!r}")
+        if update_task is not None:
+            try:
+                await update_task
+            except Exception as e:
+                warnings.warn(f"Failed to update characters: {e!r}")
 
         return data
 
@@ -77,7 +79,7 @@ class BaseBattleChronicleClient(base.BaseClient):
         """Get a user's record cards."""
         hoyolab_id = hoyolab_id or self._get_hoyolab_id()
 
-        cache_key = cache.cache_key("records", hoyolab_id=hoyolab_id, lang=lang or self.lang)
+        cache_key = RECORDS_CACHE_KEY(hoyolab_id, lang or self.lang)
         if not (data := await self.cache.get(cache_key)):
             data = await self.request_game_record(
                 "getGameRecordCard", lang=lang, params=dict(uid=hoyolab_id), custom_route=routes.CARD_WAPI_URL
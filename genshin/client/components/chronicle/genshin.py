@@ -5,6 +5,7 @@ import functools
 import typing
 
 from genshin import errors, paginators, types, utility
+from genshin.models import model
 from genshin.models.genshin import character as character_models
 from genshin.models.genshin import chronicle as models
 
@@ -82,7 +83,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
     ) -> typing.Sequence[models.Character]:
         """Get genshin user characters."""
         data = await self._request_genshin_record("character/list", uid, lang=lang, method="POST")
-        return [models.Character(**i) for i in data["list"]]
+        return models.Character.parse_many(data["list"])
 
     @typing.overload
     async def get_genshin_detailed_characters(
@@ -242,10 +243,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             need_stats="false",
         )
         data = await self._request_genshin_record("gcg/cardList", uid, lang=lang, payload=params)
-        return [
-            (models.TCGCharacterCard(**i) if i["card_type"] == models.TCGCardType.CHARACTER else models.TCGCard(**i))
-            for i in data["card_list"]
-        ]
+        return model.parse_many(typing.Union[models.TCGCharacterCard, models.TCGCard], data["card_list"])
 
     def genshin_tcg(
         self,
@@ -256,6 +254,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         action: bool = True,
         page_size: int = 32,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
     ) -> paginators.PagedPaginator[models.TCGBaseCard]:
         """Get genshin tcg cards."""
         return paginators.PagedPaginator(
@@ -269,6 +268,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             ),
             limit=limit,
             page_size=page_size,
+            concurrency=concurrency,
         )
 
     async def get_full_genshin_user(
@@ -17,6 +17,8 @@ from genshin.utility import ds as ds_utility
 
 __all__ = ["DailyRewardClient"]
 
+REWARDS_CACHE_KEY = cache.CacheKeyFamily("rewards", "month", "region", "game", "lang")
+
 
 class DailyRewardClient(base.BaseClient):
     """Daily reward component."""
@@ -102,15 +104,14 @@ class DailyRewardClient(base.BaseClient):
         data = await self.request_daily_reward(
             "home",
             game=game,
-            static_cache=cache.cache_key(
-                "rewards",
+            static_cache=REWARDS_CACHE_KEY(
                 month=datetime.datetime.now(constants.CN_TIMEZONE).month,
                 region=self.region,
                 game=typing.cast("types.Game", game or self.default_game),  # (resolved later)
                 lang=lang or self.lang,
             ),
         )
-        return [models.DailyReward(**i) for i in data["awards"]]
+        return models.DailyReward.parse_many(data["awards"])
 
     async def _get_claimed_rewards_page(
         self,
@@ -121,7 +122,7 @@ class DailyRewardClient(base.BaseClient):
     ) -> typing.Sequence[models.ClaimedDailyReward]:
         """Get a single page of claimed rewards for the current user."""
         data = await self.request_daily_reward("award", params=dict(current_page=page), game=game, lang=lang)
-        return [models.ClaimedDailyReward(**i) for i in data["list"]]
+        return models.ClaimedDailyReward.parse_many(data["list"])
 
     def claimed_rewards(
         self,
@@ -129,6 +130,8 @@ class DailyRewardClient(base.BaseClient):
         limit: typing.Optional[int] = None,
         game: typing.Optional[types.Game] = None,
         lang: typing.Optional[str] = None,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> paginators.Paginator[models.ClaimedDailyReward]:
         """Get all claimed rewards for the current user."""
         return paginators.PagedPaginator(
@@ -139,6 +142,8 @@ class DailyRewardClient(base.BaseClient):
             ),
             limit=limit,
             page_size=10,
+            since=since,
+            until=until,
         )
 
     @typing.overload
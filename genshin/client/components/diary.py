@@ -14,6 +14,8 @@ from genshin.utility import deprecation
 
 __all__ = ["DiaryClient"]
 
+DIARY_CACHE_KEY = cache.CacheKeyFamily("diary", "uid", "game", "month", "lang")
+
 
 class DiaryCallback(typing.Protocol):
     """Callback which requires a diary page."""
@@ -29,16 +31,27 @@ class DiaryPaginator(paginators.PagedPaginator[models.DiaryAction]):
     _data: typing.Optional[models.DiaryPage]
     """Metadata of the paginator"""
 
-    def __init__(self, getter: DiaryCallback, *, limit: typing.Optional[int] = None) -> None:
+    def __init__(
+        self,
+        getter: DiaryCallback,
+        *,
+        limit: typing.Optional[int] = None,
+        concurrency: int = 1,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+    ) -> None:
         self._get_page = getter
         self._data = None
 
-        super().__init__(self._getter, limit=limit, page_size=100)
+        super().__init__(self._getter, limit=limit, page_size=100, concurrency=concurrency, since=since, until=until)
 
     async def _getter(self, page: int) -> typing.Sequence[models.DiaryAction]:
         self._data = await self._get_page(page)
         return self._data.actions
 
+    def _get_total(self) -> typing.Optional[int]:
+        return self._data.total if self._data is not None else None
+
     @property
     def data(self) -> models.BaseDiary:
         """Get data bound to the diary.
@@ -65,16 +78,27 @@ class StarRailDiaryPaginator(paginators.PagedPaginator[models.StarRailDiaryActio
     _data: typing.Optional[models.StarRailDiaryPage]
     """Metadata of the paginator"""
 
-    def __init__(self, getter: StarRailDiaryCallback, *, limit: typing.Optional[int] = None) -> None:
+    def __init__(
+        self,
+        getter: StarRailDiaryCallback,
+        *,
+        limit: typing.Optional[int] = None,
+        concurrency: int = 1,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+    ) -> None:
         self._get_page = getter
         self._data = None
 
-        super().__init__(self._getter, limit=limit, page_size=100)
+        super().__init__(self._getter, limit=limit, page_size=100, concurrency=concurrency, since=since, until=until)
 
     async def _getter(self, page: int) -> typing.Sequence[models.StarRailDiaryAction]:
         self._data = await self._get_page(page)
         return self._data.actions
 
+    def _get_total(self) -> typing.Optional[int]:
+        return self._data.total if self._data is not None else None
+
     @property
     def data(self) -> models.BaseDiary:
         """Get data bound to the diary.
@@ -153,9 +177,7 @@ class DiaryClient(base.BaseClient):
         """Get a traveler's diary with earning details for the month."""
         game = types.Game.GENSHIN
         uid = uid or await self._get_uid(game)
-        cache_key = cache.cache_key(
-            "diary", uid=uid, game=game, month=month or datetime.datetime.now(CN_TIMEZONE).month, lang=lang or self.lang
-        )
+        cache_key = DIARY_CACHE_KEY(uid, game, month or datetime.datetime.now(CN_TIMEZONE).month, lang or self.lang)
         data = await self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key)
         return models.Diary(**data)
 
@@ -169,9 +191,7 @@ class DiaryClient(base.BaseClient):
         """Get a blazer's diary with earning details for the month."""
         game = types.Game.STARRAIL
         uid = uid or await self._get_uid(game)
-        cache_key = cache.cache_key(
-            "diary", uid=uid, game=game, month=month or datetime.datetime.now(CN_TIMEZONE).month, lang=lang or self.lang
-        )
+        cache_key = DIARY_CACHE_KEY(uid, game, month or datetime.datetime.now(CN_TIMEZONE).month, lang or self.lang)
         data = await self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key)
         return models.StarRailDiary(**data)
 
@@ -221,6 +241,9 @@ class DiaryClient(base.BaseClient):
         type: int = models.DiaryType.PRIMOGEMS,
         month: typing.Optional[int] = None,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> DiaryPaginator:
         """Create a new daily reward paginator."""
         return DiaryPaginator(
@@ -232,6 +255,9 @@ class DiaryClient(base.BaseClient):
                 lang=lang,
             ),
             limit=limit,
+            concurrency=concurrency,
+            since=since,
+            until=until,
         )
 
     async def _get_starrail_diary_page(
@@ -261,6 +287,9 @@ class DiaryClient(base.BaseClient):
         type: int = models.StarRailDiaryType.STELLARJADE,
         month: typing.Optional[str] = None,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> StarRailDiaryPaginator:
         """Create a new daily reward paginator."""
         return StarRailDiaryPaginator(
@@ -272,4 +301,7 @@ class DiaryClient(base.BaseClient):
                 lang=lang,
             ),
             limit=limit,
+            concurrency=concurrency,
+            since=since,
+            until=until,
         )
@@ -1,12 +1,14 @@
 """Wish component."""
 
 import asyncio
+import datetime
 import functools
 import typing
 import urllib.parse
 import warnings
 
 from genshin import paginators, types, utility
+from genshin.client import archive as client_archive
 from genshin.client import cache as client_cache
 from genshin.client import routes
 from genshin.client.components import base
@@ -15,6 +17,10 @@ from genshin.utility import deprecation
 
 __all__ = ["WishClient"]
 
+BANNER_CACHE_KEY = client_cache.CacheKeyFamily("banner", "endpoint", "lang")
+BANNER_DETAILS_CACHE_KEY = client_cache.CacheKeyFamily("banner", "endpoint", "banner", "lang")
+BANNER_IDS_CACHE_KEY = client_cache.CacheKeyFamily("banner", "endpoint")
+
 
 class WishClient(base.BaseClient):
     """Wish component."""
@@ -95,7 +101,7 @@ class WishClient(base.BaseClient):
             authkey=authkey,
             game=types.Game.GENSHIN,
         )
-        return [models.Wish(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.Wish.parse_many(data, banner_type=banner_type, tz_offset=tz_offset)
 
     async def _get_warp_page(
         self,
@@ -114,7 +120,7 @@ class WishClient(base.BaseClient):
             game=types.Game.STARRAIL,
         )
 
-        return [models.Warp(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.Warp.parse_many(data, banner_type=banner_type, tz_offset=tz_offset)
 
     async def _get_signal_page(
         self,
@@ -133,7 +139,7 @@ class WishClient(base.BaseClient):
             game=types.Game.ZZZ,
         )
 
-        return [models.SignalSearch(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.SignalSearch.parse_many(data, banner_type=banner_type, tz_offset=tz_offset)
 
     def wish_history(
         self,
@@ -143,6 +149,9 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> paginators.Paginator[models.Wish]:
         """Get the wish history of a user."""
         banner_types = banner_type or [100, 200, 301, 302, 500]
@@ -162,13 +171,16 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    prefetch=prefetch,
+                    since=since,
+                    until=until,
                 )
             )
 
         if len(iterators) == 1:
             return iterators[0]
 
-        return paginators.MergedPaginator(iterators, key=lambda wish: wish.time.timestamp())
+        return paginators.MergedPaginator(iterators, key=lambda wish: -wish.time.timestamp(), limit=limit)
 
     def warp_history(
         self,
@@ -178,6 +190,9 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> paginators.Paginator[models.Warp]:
         """Get the warp history of a user."""
         banner_types = banner_type or [1, 2, 11, 12]
@@ -197,13 +212,16 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    prefetch=prefetch,
+                    since=since,
+                    until=until,
                 )
             )
 
         if len(iterators) == 1:
             return iterators[0]
 
-        return paginators.MergedPaginator(iterators, key=lambda wish: wish.time.timestamp())
+        return paginators.MergedPaginator(iterators, key=lambda wish: -wish.time.timestamp(), limit=limit)
 
     def signal_history(
         self,
@@ -213,6 +231,9 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> paginators.Paginator[models.SignalSearch]:
         """Get the signal search history of a user."""
         banner_types = banner_type or [1, 2, 3, 5]
@@ -232,13 +253,116 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    prefetch=prefetch,
+                    since=since,
+                    until=until,
                 )
             )
 
         if len(iterators) == 1:
             return iterators[0]
 
-        return paginators.MergedPaginator(iterators, key=lambda wish: wish.time.timestamp())
+        return paginators.MergedPaginator(iterators, key=lambda wish: -wish.time.timestamp(), limit=limit)
+
+    async def _sync_gacha_history(
+        self,
+        archive: client_archive.BaseGachaArchive,
+        game: types.Game,
+        getter: typing.Callable[..., typing.Awaitable[typing.Sequence[models.BaseWish]]],
+        banner_types: typing.Sequence[int],
+        *,
+        uid: typing.Optional[int] = None,
+    ) -> typing.Sequence[typing.Any]:
+        """Fetch pulls newer than the archived ones and return the merged archive."""
+        uids: set[int] = set()
+
+        async def sync_banner(banner_type: int) -> None:
+            last_id: typing.Optional[int] = None
+            items: list[models.BaseWish] = []
+
+            async def get_page(end_id: int, /) -> typing.Sequence[models.BaseWish]:
+                return await getter(end_id, banner_type=banner_type)
+
+            async for item in paginators.CursorPaginator(get_page):
+                if last_id is None:
+                    uids.add(item.uid)
+                    last_id = await archive.get_last_id(game, item.uid, banner_type)
+                if item.id <= last_id:
+                    break
+
+                items.append(item)
+
+            if items:
+                await archive.add(game, items[0].uid, banner_type, items)
+
+        await asyncio.gather(*(sync_banner(banner_type) for banner_type in banner_types))
+
+        # the authkey decides the account, the uid is only needed when there are no pulls
+        uid = next(iter(uids), None) or uid or self.uids.get(game)
+        if uid is None:
+            return []
+
+        return await archive.get(game, uid, banner_types)
+
+    async def sync_wish_history(
+        self,
+        archive: client_archive.BaseGachaArchive,
+        banner_type: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None,
+        *,
+        uid: typing.Optional[int] = None,
+        lang: typing.Optional[str] = None,
+        authkey: typing.Optional[str] = None,
+    ) -> typing.Sequence[models.Wish]:
+        """Add new wishes to an archive and return the whole archived wish history.
+
+        Only pulls newer than the newest archived one are fetched.
+        """
+        banner_types = banner_type or [100, 200, 301, 302, 500]
+        if not isinstance(banner_types, typing.Sequence):
+            banner_types = [banner_types]
+
+        getter = functools.partial(self._get_wish_page, lang=lang, authkey=authkey)
+        return await self._sync_gacha_history(archive, types.Game.GENSHIN, getter, banner_types, uid=uid)
+
+    async def sync_warp_history(
+        self,
+        archive: client_archive.BaseGachaArchive,
+        banner_type: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None,
+        *,
+        uid: typing.Optional[int] = None,
+        lang: typing.Optional[str] = None,
+        authkey: typing.Optional[str] = None,
+    ) -> typing.Sequence[models.Warp]:
+        """Add new warps to an archive and return the whole archived warp history.
+
+        Only pulls newer than the newest archived one are fetched.
+        """
+        banner_types = banner_type or [1, 2, 11, 12]
+        if not isinstance(banner_types, typing.Sequence):
+            banner_types = [banner_types]
+
+        getter = functools.partial(self._get_warp_page, lang=lang, authkey=authkey)
+        return await self._sync_gacha_history(archive, types.Game.STARRAIL, getter, banner_types, uid=uid)
+
+    async def sync_signal_history(
+        self,
+        archive: client_archive.BaseGachaArchive,
+        banner_type: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None,
+        *,
+        uid: typing.Optional[int] = None,
+        lang: typing.Optional[str] = None,
+        authkey: typing.Optional[str] = None,
+    ) -> typing.Sequence[models.SignalSearch]:
+        """Add new signal searches to an archive and return the whole archived signal search history.
+
+        Only pulls newer than the newest archived one are fetched.
+        """
+        banner_types = banner_type or [1, 2, 3, 5]
+        if not isinstance(banner_types, typing.Sequence):
+            banner_types = [banner_types]
+
+        getter = functools.partial(self._get_signal_page, lang=lang, authkey=authkey)
+        return await self._sync_gacha_history(archive, types.Game.ZZZ, getter, banner_types, uid=uid)
 
     @deprecation.deprecated("get_genshin_banner_names")
     async def get_banner_names(
@@ -262,10 +386,30 @@ class WishClient(base.BaseClient):
             lang=lang,
             game=types.Game.GENSHIN,
             authkey=authkey,
-            static_cache=client_cache.cache_key("banner", endpoint="names", lang=lang or self.lang),
+            static_cache=BANNER_CACHE_KEY("names", lang or self.lang),
         )
         return {int(i["key"]): i["name"] for i in data["gacha_type_list"]}
 
+    async def _request_banner_details(
+        self,
+        banner_id: str,
+        *,
+        game: types.Game,
+        lang: str,
+        cache: bool = True,
+    ) -> typing.Mapping[str, typing.Any]:
+        """Request the raw details of a specific banner."""
+        if game == types.Game.STARRAIL:
+            warnings.warn("Banner details for Star Rail are not fully supported.")
+
+        region = "hkrpg" if game == types.Game.STARRAIL else "hk4e"
+        server = "prod_official_asia" if game == types.Game.STARRAIL else "os_asia"
+
+        return await self.request_webstatic(
+            f"/gacha_info/{region}/{server}/{banner_id}/{lang}.json",
+            cache=BANNER_DETAILS_CACHE_KEY("details", banner_id, lang) if cache else None,
+        )
+
     async def _get_banner_details(
         self,
         banner_id: str,
@@ -274,20 +418,11 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
     ) -> models.BannerDetails:
         """Get details of a specific banner using its id."""
-        lang = lang or self.lang
         game = game or self.default_game
         if game is None:
             raise RuntimeError("No game provided")
-        if game == types.Game.STARRAIL:
-            warnings.warn("Banner details for Star Rail are not fully supported.")
 
-        region = "hkrpg" if game == types.Game.STARRAIL else "hk4e"
-        server = "prod_official_asia" if game == types.Game.STARRAIL else "os_asia"
-
-        data = await self.request_webstatic(
-            f"/gacha_info/{region}/{server}/{banner_id}/{lang}.json",
-            cache=client_cache.cache_key("banner", endpoint="details", banner=banner_id, lang=lang),
-        )
+        data = await self._request_banner_details(banner_id, game=game, lang=lang or self.lang)
         return models.BannerDetails(**data, banner_id=banner_id)
 
     @deprecation.deprecated("get_genshin_banner_ids")
@@ -313,7 +448,7 @@ class WishClient(base.BaseClient):
         data = await self.request_webstatic(
             "gacha_info/hk4e/cn_gf01/gacha/list.json",
             region=types.Region.CHINESE,
-            cache=client_cache.cache_key("banner", endpoint="ids"),
+            cache=BANNER_IDS_CACHE_KEY("ids"),
         )
         return list(map(process_gacha, data["data"]["list"]))
 
@@ -324,16 +459,34 @@ class WishClient(base.BaseClient):
         game: typing.Optional[types.Game] = None,
         lang: typing.Optional[str] = None,
     ) -> typing.Sequence[models.BannerDetails]:
-        """Get all banner details at once in a batch."""
+        """Get all banner details at once in a batch.
+
+        Cached details are looked up in a single cache call and only the missing ones are requested.
+        """
+        lang = lang or self.lang
         game = game or self.default_game
+        if game is None:
+            raise RuntimeError("No game provided")
         if game == types.Game.STARRAIL and not banner_ids:
             raise RuntimeError("No banner ids provided for star rail")
 
         banner_ids = banner_ids or await self.get_genshin_banner_ids()
 
-        coros = (self._get_banner_details(i, lang=lang, game=game) for i in banner_ids)
-        data = await asyncio.gather(*coros)
-        return list(data)
+        keys = [BANNER_DETAILS_CACHE_KEY("details", banner_id, lang) for banner_id in banner_ids]
+        cached = await self.cache.get_many(keys, static=True)
+
+        missing = [i for i, details in enumerate(cached) if details is None]
+        fetched = await asyncio.gather(
+            *(self._request_banner_details(banner_ids[i], game=game, lang=lang, cache=False) for i in missing)
+        )
+        if missing:
+            await self.cache.set_many({keys[i]: details for i, details in zip(missing, fetched)}, static=True)
+
+        data: list[typing.Any] = list(cached)
+        for i, details in zip(missing, fetched):
+            data[i] = details
+
+        return [models.BannerDetails(**details, banner_id=banner_id) for banner_id, details in zip(banner_ids, data)]
 
     @deprecation.deprecated("get_genshin_gacha_items")
     async def get_gacha_items(
@@ -356,6 +509,6 @@ class WishClient(base.BaseClient):
         lang = lang or self.lang
         data = await self.request_webstatic(
             f"/hk4e/gacha_info/{server}/items/{lang}.json",
-            cache=client_cache.cache_key("banner", endpoint="items", lang=lang),
+            cache=BANNER_CACHE_KEY("items", lang),
         )
-        return [models.GachaItem(**i) for i in data]
+        return models.GachaItem.parse_many(data)
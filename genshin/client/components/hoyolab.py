@@ -18,6 +18,12 @@ from genshin.models import hoyolab as models
 
 __all__ = ["HoyolabClient"]
 
+SERVER_REGION_CACHE_KEY = client_cache.CacheKeyFamily("server_region", "game", "uid", "region")
+SEARCH_CACHE_KEY = client_cache.CacheKeyFamily("search", "keyword", "lang")
+HOYOLAB_CACHE_KEY = client_cache.CacheKeyFamily("hoyolab", "uid", "lang")
+RECOMMENDED_CACHE_KEY = client_cache.CacheKeyFamily("recommended")
+MI18N_CACHE_KEY = client_cache.CacheKeyFamily("mi18n", "filename", "url", "lang")
+
 
 class HoyolabClient(base.BaseClient):
     """Hoyolab component."""
@@ -27,7 +33,7 @@ class HoyolabClient(base.BaseClient):
         data = await self.request(
             routes.GET_USER_REGION_URL.get_url(),
             params=dict(game_biz=utility.get_prod_game_biz(self.region, game)),
-            cache=client_cache.cache_key("server_region", game=game, uid=uid, region=self.region),
+            cache=SERVER_REGION_CACHE_KEY(game, uid, self.region),
         )
         for account in data["list"]:
             if account["game_uid"] == str(uid):
@@ -137,7 +143,7 @@ class HoyolabClient(base.BaseClient):
             "community/search/wapi/search/user",
             lang=lang,
             params=dict(keyword=keyword, page_size=20),
-            cache=client_cache.cache_key("search", keyword=keyword, lang=self.lang),
+            cache=SEARCH_CACHE_KEY(keyword, self.lang),
         )
         return [models.PartialHoyolabUser(**i["user"]) for i in data["list"]]
 
@@ -159,7 +165,7 @@ class HoyolabClient(base.BaseClient):
             url=url,
             lang=lang,
             params=dict(uid=hoyolab_id) if hoyolab_id else None,
-            cache=client_cache.cache_key("hoyolab", uid=hoyolab_id, lang=lang or self.lang),
+            cache=HOYOLAB_CACHE_KEY(hoyolab_id, lang or self.lang),
         )
         return models.FullHoyolabUser(**data["user_info"])
 
@@ -168,7 +174,7 @@ class HoyolabClient(base.BaseClient):
         data = await self.request_bbs(
             "community/user/wapi/recommendActive",
             params=dict(page_size=limit),
-            cache=client_cache.cache_key("recommended"),
+            cache=RECOMMENDED_CACHE_KEY(),
         )
         return [models.PartialHoyolabUser(**i["user"]) for i in data["list"]]
 
@@ -263,7 +269,7 @@ class HoyolabClient(base.BaseClient):
         """Fetch a mi18n file."""
         return await self.request(
             yarl.URL(url) / f"{filename}/{filename}-{lang or self.lang}.json",
-            cache=client_cache.cache_key("mi18n", filename=filename, url=url, lang=lang or self.lang),
+            cache=MI18N_CACHE_KEY(filename, url, lang or self.lang),
         )
 
     @base.region_specific(types.Region.OVERSEAS)
@@ -12,6 +12,9 @@ from genshin.models.genshin import lineup as models
 
 __all__ = ["LineupClient"]
 
+LINEUP_CACHE_KEY = cache.CacheKeyFamily("lineup", "endpoint", "lang")
+LINEUP_DETAIL_CACHE_KEY = cache.CacheKeyFamily("lineup", "endpoint", "id", "lang")
+
 
 class LineupClient(base.BaseClient):
     """Lineup component."""
@@ -42,7 +45,7 @@ class LineupClient(base.BaseClient):
         data = await self.request_lineup(
             "config",
             lang=lang,
-            static_cache=cache.cache_key("lineup", endpoint="config", lang=lang or self.lang) if use_cache else None,
+            static_cache=LINEUP_CACHE_KEY("config", lang or self.lang) if use_cache else None,
         )
 
         return models.LineupFields(**data)
@@ -56,7 +59,7 @@ class LineupClient(base.BaseClient):
         data = await self.request_lineup(
             "tags",
             lang=lang,
-            static_cache=cache.cache_key("lineup", endpoint="tags", lang=lang or self.lang),
+            static_cache=LINEUP_CACHE_KEY("tags", lang or self.lang),
         )
         dummy: dict[str, typing.Any] = dict(id=0, name="", children=data["tree"])
 
@@ -90,7 +93,7 @@ class LineupClient(base.BaseClient):
 
         data = await self.request_lineup("lineup/index", lang=lang, params=params)
 
-        return data["next_page_token"], [models.LineupPreview(**i) for i in data["list"]]
+        return data["next_page_token"], models.LineupPreview.parse_many(data["list"])
 
     def get_lineups(
         self,
@@ -141,7 +144,7 @@ class LineupClient(base.BaseClient):
             "lineup/detail",
             lang=lang,
             params=dict(id=lineup_id),
-            cache=cache.cache_key("lineup", endpoint="detail", id=lineup_id, lang=lang or self.lang),
+            cache=LINEUP_DETAIL_CACHE_KEY("detail", lineup_id, lang or self.lang),
         )
 
         return models.Lineup(**data["lineup"])
@@ -158,10 +161,10 @@ class LineupClient(base.BaseClient):
             "user/lineup",
             lang=lang,
             params=dict(limit=limit or 1000),
-            cache=cache.cache_key("lineup", endpoint="user", lang=lang or self.lang),
+            cache=LINEUP_CACHE_KEY("user", lang or self.lang),
         )
 
-        return [models.LineupPreview(**i) for i in data["list"]]
+        return models.LineupPreview.parse_many(data["list"])
 
     @managers.no_multi
     async def get_favorite_lineups(
@@ -175,10 +178,10 @@ class LineupClient(base.BaseClient):
             "user/favour_lineup",
             lang=lang,
             params=dict(limit=limit or 1000),
-            cache=cache.cache_key("lineup", endpoint="favorite", lang=lang or self.lang),
+            cache=LINEUP_CACHE_KEY("favorite", lang or self.lang),
         )
 
-        return [models.LineupPreview(**i) for i in data["list"]]
+        return models.LineupPreview.parse_many(data["list"])
 
     @managers.no_multi
     async def get_lineup_character_history(
@@ -192,7 +195,7 @@ class LineupClient(base.BaseClient):
             "lineup/history",
             lang=lang,
             params=dict(limit=limit or 1000),
-            cache=cache.cache_key("lineup", endpoint="history", lang=lang or self.lang),
+            cache=LINEUP_CACHE_KEY("history", lang or self.lang),
         )
 
-        return [models.LineupCharacter(**i) for i in data["list"]]
+        return models.LineupCharacter.parse_many(data["list"])
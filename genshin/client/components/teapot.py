@@ -56,7 +56,7 @@ class TeapotClient(base.BaseClient):
             limit=limit,
         )
         data = await self.request_teapot("list", lang=lang, params=params)
-        return [models.TeapotReplica(**entry) for entry in data["articles"]]
+        return models.TeapotReplica.parse_many(data["articles"])
 
     def teapot_replicas(
         self,
@@ -70,6 +70,7 @@ class TeapotClient(base.BaseClient):
         version: typing.Optional[str] = None,
         page_size: int = 20,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
     ) -> paginators.PagedPaginator[models.TeapotReplica]:
         """Get a teapot replica paginator."""
         if not region and uid:
@@ -88,4 +89,5 @@ class TeapotClient(base.BaseClient):
             ),
             limit=limit,
             page_size=page_size,
+            concurrency=concurrency,
         )
@@ -1,5 +1,6 @@
 """Transaction client."""
 
+import datetime
 import functools
 import typing
 import urllib.parse
@@ -61,13 +62,11 @@ class TransactionClient(base.BaseClient):
             params=dict(end_id=end_id, size=20),
         )
 
-        transactions: list[models.BaseTransaction] = []
-        for trans in data["list"]:
-            model = models.ItemTransaction if "name" in trans else models.Transaction
-            model = typing.cast("type[models.BaseTransaction]", model)
-            transactions.append(model(**trans, kind=kind))
+        # a page only ever contains transactions of a single kind
+        if kind in (models.TransactionKind.ARTIFACT, models.TransactionKind.WEAPON):
+            return models.ItemTransaction.parse_many(data["list"], kind=kind)
 
-        return transactions
+        return models.Transaction.parse_many(data["list"], kind=kind)
 
     def transaction_log(
         self,
@@ -77,6 +76,8 @@ class TransactionClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> paginators.Paginator[models.BaseTransaction]:
         """Get the transaction log of a user."""
         kinds = kind or ["primogem", "crystal", "resin", "artifact", "weapon"]
@@ -96,10 +97,12 @@ class TransactionClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    since=since,
+                    until=until,
                 )
             )
 
         if len(iterators) == 1:
             return iterators[0]
 
-        return paginators.MergedPaginator(iterators, key=lambda trans: trans.time.timestamp())
+        return paginators.MergedPaginator(iterators, key=lambda trans: -trans.time.timestamp(), limit=limit)
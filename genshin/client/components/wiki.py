@@ -9,6 +9,9 @@ from genshin.models.genshin import wiki as models
 
 __all__ = ["WikiClient"]
 
+WIKI_ENTRY_CACHE_KEY = cache.CacheKeyFamily("wiki", "endpoint", "menu", "lang")
+WIKI_PAGE_CACHE_KEY = cache.CacheKeyFamily("wiki", "endpoint", "id", "lang")
+
 
 class WikiClient(base.BaseClient):
     """Wiki component."""
@@ -77,7 +80,7 @@ class WikiClient(base.BaseClient):
     ) -> typing.Sequence[models.BaseWikiPreview]:
         """Get a list of wiki previews."""
         payload = dict(filters=[], menu_id=int(menu), page_num=1, page_size=1000, use_es=True)
-        cache_key = cache.cache_key("wiki", endpoint="entry", menu=menu, lang=lang or self.lang)
+        cache_key = WIKI_ENTRY_CACHE_KEY("entry", menu, lang or self.lang)
         data = await self.request_wiki("get_entry_page_list", data=payload, lang=lang, static_cache=cache_key)
 
         cls = models._ENTRY_PAGE_MODELS.get(typing.cast(models.WikiPageType, menu), models.BaseWikiPreview)
@@ -92,7 +95,7 @@ class WikiClient(base.BaseClient):
     ) -> models.WikiPage:
         """Get a wiki page."""
         params = dict(entry_page_id=int(id))
-        cache_key = cache.cache_key("wiki", endpoint="page", id=id, lang=lang or self.lang)
+        cache_key = WIKI_PAGE_CACHE_KEY("page", id, lang or self.lang)
         data = await self.request_wiki("entry_page", lang=lang, params=params, static_cache=cache_key)
 
         data["page"].pop("lang", "")  # always an empty string
@@ -108,4 +111,4 @@ class WikiClient(base.BaseClient):
         payload = dict(entry_page_ids=[int(i) for i in ids])
         data = await self.request_wiki("entry_pages", lang=lang, data=payload)
 
-        return [models.WikiPage(**i) for i in data["entry_pages"]]
+        return models.WikiPage.parse_many(data["entry_pages"])
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import datetime
 import functools
+import heapq
 import http.cookies
 import logging
+import time
 import typing
 import warnings
 
@@ -14,7 +18,7 @@ import aiohttp.typedefs
 import yarl
 
 from genshin import errors, types
-from genshin.client import ratelimit
+from genshin.client import ratelimit, routes
 from genshin.utility import fs as fs_utility
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,6 +40,9 @@ AsyncCallableT = typing.TypeVar("AsyncCallableT", bound="typing.Callable[..., ty
 MaybeSequence = typing.Union[T, typing.Sequence[T]]
 
 
+DAILY_RESET_TIMEZONE = datetime.timezone(datetime.timedelta(hours=8))
+
+
 def parse_cookie(cookie: typing.Optional[CookieOrHeader]) -> dict[str, str]:
     """Parse a cookie or header into a cookie mapping."""
     if cookie is None:
@@ -47,6 +54,27 @@ def parse_cookie(cookie: typing.Optional[CookieOrHeader]) -> dict[str, str]:
     return {str(k): v.value if isinstance(v, http.cookies.Morsel) else str(v) for k, v in cookie.items()}
 
 
+@functools.lru_cache(maxsize=None)
+def guess_host_region(host: str) -> types.Region:
+    """Guess the region of a host.
+
+    Known hosts are looked up from international routes, unknown hosts are guessed from their name.
+    """
+    if region := routes.get_region_by_host(host):
+        return region
+
+    if "os" in host:
+        return types.Region.OVERSEAS
+
+    if "takumi" in host:
+        return types.Region.CHINESE
+
+    if "sg" in host:
+        return types.Region.OVERSEAS
+
+    return types.Region.CHINESE
+
+
 def get_cookie_identifier(cookie: typing.Mapping[str, str]) -> typing.Optional[str]:
     """Get a unique identifier for a cookie."""
     for name, value in cookie.items():
@@ -67,6 +95,21 @@ class BaseCookieManager(abc.ABC):
     _proxy: typing.Optional[yarl.URL] = None
     _socks_proxy: typing.Optional[str] = None
 
+    _session: typing.Optional[aiohttp.ClientSession] = None
+    _session_loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+    connection_limit: int = 100
+    """Total number of simultaneous connections in the pool. 0 means no limit."""
+    connection_limit_per_host: int = 0
+    """Number of simultaneous connections to a single host. 0 means no limit."""
+    keepalive_timeout: float = 15.0
+    """Seconds an idle connection is kept alive for reuse."""
+    dns_cache_ttl: typing.Optional[int] = 60
+    """Seconds resolved hosts are cached for. None caches forever."""
+
+    ratelimiter: typing.Optional[ratelimit.RateLimiter] = None
+    """Ratelimiter shared by all requests of this manager, may be shared between managers."""
+
     @classmethod
     def from_cookies(cls, cookies: typing.Optional[AnyCookieOrHeader] = None) -> BaseCookieManager:
         """Create an arbitrary cookie manager implementation instance."""
@@ -113,13 +156,17 @@ class BaseCookieManager(abc.ABC):
     def proxy(self, proxy: typing.Optional[aiohttp.typedefs.StrOrURL]) -> None:
         if proxy is None:
             self._proxy = None
-            self._socks_proxy = None
+            if self._socks_proxy is not None:
+                self._socks_proxy = None
+                self._discard_session()
             return
 
         proxy = yarl.URL(proxy)
 
         if proxy.scheme in {"socks4", "socks5"}:
-            self._socks_proxy = str(proxy)
+            if self._socks_proxy != str(proxy):
+                self._socks_proxy = str(proxy)
+                self._discard_session()
             return
 
         if proxy.scheme not in {"https", "http", "ws", "wss"}:
@@ -142,7 +189,107 @@ class BaseCookieManager(abc.ABC):
             **kwargs,
         )
 
-    @ratelimit.handle_ratelimits()
+    def _create_connector(self) -> aiohttp.BaseConnector:
+        """Create a pooled connector for the persistent session."""
+        options: dict[str, typing.Any] = dict(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+
+        if self._socks_proxy is not None:
+            import aiohttp_socks
+
+            return aiohttp_socks.ProxyConnector.from_url(self._socks_proxy, **options)
+
+        return aiohttp.TCPConnector(**options)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the persistent client session, creating it when needed.
+
+        The session is bound to the running event loop and is recreated if the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is not None and not self._session.closed and self._session_loop is loop:
+            return self._session
+
+        self._discard_session()
+        self._session = aiohttp.ClientSession(
+            cookie_jar=aiohttp.DummyCookieJar(),
+            connector=self._create_connector(),
+        )
+        self._session_loop = loop
+
+        return self._session
+
+    def configure_pool(
+        self,
+        *,
+        limit: typing.Optional[int] = None,
+        limit_per_host: typing.Optional[int] = None,
+        keepalive_timeout: typing.Optional[float] = None,
+        dns_cache_ttl: typing.Optional[int] = None,
+    ) -> None:
+        """Configure the connection pool of the persistent session.
+
+        Unspecified options are left unchanged. The current session is replaced on the next request.
+        """
+        if limit is not None:
+            self.connection_limit = limit
+        if limit_per_host is not None:
+            self.connection_limit_per_host = limit_per_host
+        if keepalive_timeout is not None:
+            self.keepalive_timeout = keepalive_timeout
+        if dns_cache_ttl is not None:
+            self.dns_cache_ttl = dns_cache_ttl
+
+        self._discard_session()
+
+    def inherit_session(self, other: BaseCookieManager) -> None:
+        """Take over the pool configuration, ratelimiter and persistent session of another manager."""
+        self.ratelimiter = other.ratelimiter
+        self.connection_limit = other.connection_limit
+        self.connection_limit_per_host = other.connection_limit_per_host
+        self.keepalive_timeout = other.keepalive_timeout
+        self.dns_cache_ttl = other.dns_cache_ttl
+
+        if self._socks_proxy == other._socks_proxy:
+            self._session, self._session_loop = other._session, other._session_loop
+            other._session, other._session_loop = None, None
+        else:
+            other._discard_session()
+
+    def _discard_session(self) -> None:
+        """Detach the persistent session and close it, in the background if its loop is running."""
+        session, loop = self._session, self._session_loop
+        self._session, self._session_loop = None, None
+
+        if session is None or session.closed or loop is None or loop.is_closed():
+            return
+
+        if loop.is_running():
+            loop.create_task(session.close())
+            return
+
+        try:
+            loop.run_until_complete(session.close())
+        except RuntimeError:  # another loop is running in this thread
+            if session.connector is not None:
+                session.connector.close()
+
+            session.detach()
+
+    async def close(self) -> None:
+        """Close the persistent session and release all pooled connections."""
+        session = self._session
+        self._session, self._session_loop = None, None
+
+        if session is not None and not session.closed:
+            await session.close()
+
     async def _request(
         self,
         method: str,
@@ -150,21 +297,44 @@ class BaseCookieManager(abc.ABC):
         cookies: typing.MutableMapping[str, str],
         **kwargs: typing.Any,
     ) -> typing.Any:
-        """Make a request towards any json resource."""
-        async with self.create_session() as session:
-            async with session.request(method, str_or_url, proxy=self.proxy, cookies=cookies, **kwargs) as response:
-                if response.content_type != "application/json":
-                    content = await response.text()
-                    raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
-
-                data = await response.json()
-
-                if not self.multi:
-                    new_cookies = parse_cookie(response.cookies)
-                    new_keys = new_cookies.keys() - cookies.keys()
-                    if new_keys:
-                        cookies.update(new_cookies)
-                        _LOGGER.debug("Updating cookies for %s: %s", get_cookie_identifier(cookies), new_keys)
+        """Make a request towards any json resource, retrying it when ratelimited."""
+        return await ratelimit.retry_ratelimited(
+            functools.partial(self._send_request, method, str_or_url, cookies, **kwargs),
+            limiter=self.ratelimiter,
+            url=str_or_url,
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        str_or_url: aiohttp.typedefs.StrOrURL,
+        cookies: typing.MutableMapping[str, str],
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Make a single request towards any json resource."""
+        if self.ratelimiter is not None:
+            await self.ratelimiter.acquire(str_or_url)
+
+        session = self.get_session()
+        async with session.request(method, str_or_url, proxy=self.proxy, cookies=cookies, **kwargs) as response:
+            retry_after = ratelimit.parse_retry_after(response.headers.get("Retry-After"))
+            if response.status == 429:
+                error = errors.VisitsTooFrequently()
+                error.retry_after = retry_after
+                raise error
+
+            if response.content_type != "application/json":
+                content = await response.text()
+                raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
+
+            data = await response.json()
+
+            if not self.multi:
+                new_cookies = parse_cookie(response.cookies)
+                new_keys = new_cookies.keys() - cookies.keys()
+                if new_keys:
+                    cookies.update(new_cookies)
+                    _LOGGER.debug("Updating cookies for %s: %s", get_cookie_identifier(cookies), new_keys)
 
         errors.check_for_geetest(data)
 
@@ -174,7 +344,39 @@ class BaseCookieManager(abc.ABC):
                 return data["data"]
             return data
 
-        errors.raise_for_retcode(data)
+        try:
+            errors.raise_for_retcode(data)
+        except errors.VisitsTooFrequently as e:
+            e.retry_after = retry_after
+            raise
+
+    async def _request_rotating(
+        self,
+        cookies: CookieSequence,
+        method: str,
+        url: aiohttp.typedefs.StrOrURL,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Make a request with the best available cookie from a pool, rotating on failure."""
+        while (state := cookies.acquire()) is not None:
+            try:
+                data = await self._request(method, url, cookies=state.cookies, **kwargs)
+            except errors.TooManyRequests:
+                _LOGGER.debug("Putting cookie %s on cooldown.", state.account_id)
+                cookies.mark_exhausted(state)
+                cookies.release(state)
+            except errors.InvalidCookies:
+                warnings.warn(f"Deleting invalid cookie {state.cookies}")
+                cookies.remove(state)
+            except BaseException:
+                cookies.release(state)
+                raise
+            else:
+                cookies.release(state, success=True)
+                return data
+
+        msg = f"All cookies have hit their request limit of {cookies.MAX_USES} accounts per day."
+        raise errors.TooManyRequests({"retcode": 10101}, msg)
 
     @abc.abstractmethod
     async def request(
@@ -283,11 +485,69 @@ class CookieManager(BaseCookieManager):
         return await self._request(method, url, cookies=self.cookies, **kwargs)
 
 
+def get_next_daily_reset(now: typing.Optional[float] = None) -> float:
+    """Get the timestamp of the next daily ratelimit reset (midnight in UTC+8)."""
+    now = time.time() if now is None else now
+    day = datetime.datetime.fromtimestamp(now, DAILY_RESET_TIMEZONE).date() + datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, datetime.time(), DAILY_RESET_TIMEZONE).timestamp()
+
+
+class CookieState:
+    """Scheduling state of a single cookie in a pool."""
+
+    __slots__ = ("account_id", "cookies", "exhausted_until", "in_use", "reset_at", "uses", "version")
+
+    account_id: str
+    cookies: dict[str, str]
+    uses: int
+    """Successful requests made since the last daily reset."""
+    reset_at: float
+    """Timestamp of the daily reset after which uses are zeroed."""
+    in_use: int
+    """Requests currently being made with the cookie."""
+    exhausted_until: float
+    """Timestamp until which the cookie has hit its daily limit."""
+    version: int
+
+    def __init__(self, account_id: str, cookies: dict[str, str]) -> None:
+        self.account_id = account_id
+        self.cookies = cookies
+        self.uses = 0
+        self.reset_at = get_next_daily_reset()
+        self.in_use = 0
+        self.exhausted_until = 0
+        self.version = 0
+
+    def refresh(self, now: float) -> None:
+        """Zero the uses if the daily reset has passed."""
+        if now >= self.reset_at:
+            self.uses = 0
+            self.reset_at = get_next_daily_reset(now)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.account_id} uses={self.uses} in_use={self.in_use}>"
+
+
 class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
-    MAX_USES: int = 30
+    """Pool of cookies scheduled by load and remaining daily quota.
+
+    Cookies are kept in a heap ordered by the amount of concurrent requests and uses,
+    so every pick is O(log n) and concurrent requests are spread over distinct cookies.
+    Cookies which hit their daily limit are parked until the next daily reset.
+    """
 
-    # {id: ({cookie}, uses), ...}
-    _cookies: dict[str, tuple[dict[str, str], int]]
+    MAX_USES: int = 30
+    """Daily limit of requests for different accounts per cookie."""
+
+    _cookies: dict[str, CookieState]
+    # (in_use, uses, version, account_id), stale entries are skipped lazily
+    _heap: list[tuple[int, int, int, str]]
+    # (exhausted_until, account_id)
+    _exhausted: list[tuple[float, str]]
+    # timestamp of the next daily reset of all cookies
+    _reset_at: float
+    # cookies ordered by remaining quota, None if outdated
+    _sorted: typing.Optional[list[typing.Mapping[str, str]]]
 
     def __init__(self, cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None) -> None:
         self.cookies = [parse_cookie(cookie) for cookie in cookies or []]
@@ -295,17 +555,26 @@ class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
     @property
     def cookies(self) -> typing.Sequence[typing.Mapping[str, str]]:
         """Cookies used for authentication"""
-        cookies = sorted(self._cookies.values(), key=lambda x: 0 if x[1] >= self.MAX_USES else x[1], reverse=True)
-        return [cookies for cookies, _ in cookies]
+        self._reset_daily(time.time())
+
+        if self._sorted is None:
+            states = sorted(
+                self._cookies.values(),
+                key=lambda state: (state.exhausted_until > 0 or state.uses >= self.MAX_USES, state.uses),
+            )
+            self._sorted = [state.cookies for state in states]
+
+        return self._sorted
 
     @cookies.setter
     def cookies(self, cookies: typing.Optional[typing.Sequence[CookieOrHeader]]) -> None:
-        if not cookies:
-            self._cookies = {}
-            return
-
         self._cookies = {}
-        for cookie in cookies:
+        self._heap = []
+        self._exhausted = []
+        self._reset_at = get_next_daily_reset()
+        self._sorted = None
+
+        for cookie in cookies or []:
             cookie = parse_cookie(cookie)
 
             account_id = get_cookie_identifier(cookie)
@@ -315,7 +584,8 @@ class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
             if account_id in self._cookies:
                 raise ValueError(f"Cannot use the same identifier for multiple cookies: {account_id}.")
 
-            self._cookies[account_id] = (cookie, 0)
+            self._cookies[account_id] = CookieState(account_id, cookie)
+            self._heap.append((0, 0, 0, account_id))
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} len={len(self._cookies)}>"
@@ -324,11 +594,103 @@ class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
         return self.cookies[index]
 
     def __len__(self) -> int:
-        return len(self.cookies)
+        return len(self._cookies)
 
     def __iter__(self) -> typing.Iterator[typing.Mapping[str, str]]:
         return iter(self.cookies)
 
+    def _rebuild_heap(self) -> None:
+        """Recreate the heap from the cookies which aren't exhausted, dropping stale entries."""
+        self._heap = [
+            (state.in_use, state.uses, state.version, state.account_id)
+            for state in self._cookies.values()
+            if not state.exhausted_until
+        ]
+        heapq.heapify(self._heap)
+
+    def _push(self, state: CookieState) -> None:
+        state.refresh(time.time())
+        state.version += 1
+        heapq.heappush(self._heap, (state.in_use, state.uses, state.version, state.account_id))
+        self._sorted = None
+
+        # drop stale entries once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._cookies) + 16:
+            self._rebuild_heap()
+
+    def _reset_daily(self, now: float) -> None:
+        """Zero the uses of all cookies once the daily reset has passed."""
+        if now < self._reset_at:
+            return
+
+        for state in self._cookies.values():
+            state.refresh(now)
+
+        self._reset_at = get_next_daily_reset(now)
+        self._rebuild_heap()
+        self._sorted = None
+
+    def _reset_exhausted(self, now: float) -> None:
+        """Return cookies whose daily limit has been reset into the pool."""
+        while self._exhausted and self._exhausted[0][0] <= now:
+            _, account_id = heapq.heappop(self._exhausted)
+            state = self._cookies.get(account_id)
+            if state is None or not state.exhausted_until or state.exhausted_until > now:
+                continue
+
+            state.refresh(now)
+            state.exhausted_until = 0
+            self._push(state)
+
+    def acquire(self) -> typing.Optional[CookieState]:
+        """Pick the least loaded cookie with remaining quota.
+
+        Returns None if all cookies have hit their daily limit.
+        """
+        now = time.time()
+        self._reset_daily(now)
+        self._reset_exhausted(now)
+
+        while self._heap:
+            *_, version, account_id = heapq.heappop(self._heap)
+            state = self._cookies.get(account_id)
+            if state is None or state.version != version:
+                continue
+
+            state.in_use += 1
+            self._push(state)
+            return state
+
+        return None
+
+    def release(self, state: CookieState, *, success: bool = False) -> None:
+        """Return a cookie picked with `acquire`."""
+        if state.account_id not in self._cookies:
+            return
+
+        state.in_use -= 1
+        if success:
+            state.refresh(time.time())
+            state.uses += 1
+
+        if not state.exhausted_until:
+            self._push(state)
+
+    def mark_exhausted(self, state: CookieState) -> None:
+        """Put a cookie on cooldown until the next daily reset."""
+        if state.account_id not in self._cookies or state.exhausted_until:
+            return
+
+        state.exhausted_until = get_next_daily_reset()
+        state.version += 1  # invalidate the heap entry
+        heapq.heappush(self._exhausted, (state.exhausted_until, state.account_id))
+        self._sorted = None
+
+    def remove(self, state: CookieState) -> None:
+        """Remove a cookie from the pool."""
+        self._cookies.pop(state.account_id, None)
+        self._sorted = None
+
 
 class RotatingCookieManager(BaseCookieManager):
     """Cookie Manager with rotating cookies."""
@@ -377,23 +739,7 @@ class RotatingCookieManager(BaseCookieManager):
         if not self.cookies:
             raise RuntimeError("Tried to make a request before setting cookies")
 
-        for account_id, (cookie, uses) in self._cookies._cookies.copy().items():
-            try:
-                data = await self._request(method, url, cookies=cookie, **kwargs)
-            except errors.TooManyRequests:
-                _LOGGER.debug("Putting cookie %s on cooldown.", account_id)
-                self._cookies._cookies[account_id] = (cookie, self._cookies.MAX_USES)
-            except errors.InvalidCookies:
-                warnings.warn(f"Deleting invalid cookie {cookie}")
-                # prevent race conditions
-                if account_id in self._cookies._cookies:
-                    del self._cookies._cookies[account_id]
-            else:
-                self._cookies._cookies[account_id] = (cookie, 1 if uses >= self._cookies.MAX_USES else uses + 1)
-                return data
-
-        msg = "All cookies have hit their request limit of 30 accounts per day."
-        raise errors.TooManyRequests({"retcode": 10101}, msg)
+        return await self._request_rotating(self._cookies, method, url, **kwargs)
 
 
 class InternationalCookieManager(BaseCookieManager):
@@ -438,19 +784,15 @@ class InternationalCookieManager(BaseCookieManager):
         return self.cookies
 
     def guess_region(self, url: yarl.URL) -> types.Region:
-        """Guess the region from the URL."""
-        assert url.host is not None
-
-        if "os" in url.host or "os" in url.path:
-            return types.Region.OVERSEAS
+        """Guess the region from the URL.
 
-        if "takumi" in url.host:
-            return types.Region.CHINESE
-
-        if "sg" in url.host:
+        Hosts which aren't known to belong to a single region are overseas if their path says so.
+        """
+        assert url.host is not None
+        if "os" in url.path and routes.get_region_by_host(url.host) is None:
             return types.Region.OVERSEAS
 
-        return types.Region.CHINESE
+        return guess_host_region(url.host)
 
     async def request(
         self,
@@ -465,27 +807,7 @@ class InternationalCookieManager(BaseCookieManager):
 
         region = self.guess_region(yarl.URL(url))
 
-        # TODO: less copy-paste
-        for account_id, (cookie, uses) in self._cookies[region]._cookies.copy().items():
-            try:
-                data = await self._request(method, url, cookies=cookie, **kwargs)
-            except errors.TooManyRequests:
-                _LOGGER.debug("Putting cookie %s on cooldown.", account_id)
-                self._cookies[region]._cookies[account_id] = (cookie, self._cookies[region].MAX_USES)
-            except errors.InvalidCookies:
-                warnings.warn(f"Deleting invalid cookie {cookie}")
-                # prevent race conditions
-                if account_id in self._cookies[region]._cookies:
-                    del self._cookies[region]._cookies[account_id]
-            else:
-                self._cookies[region]._cookies[account_id] = (
-                    cookie,
-                    1 if uses >= self._cookies[region].MAX_USES else uses + 1,
-                )
-                return data
-
-        msg = "All cookies have hit their request limit of 30 accounts per day."
-        raise errors.TooManyRequests({"retcode": 10101}, msg)
+        return await self._request_rotating(self._cookies[region], method, url, **kwargs)
 
 
 def no_multi(func: CallableT) -> CallableT:
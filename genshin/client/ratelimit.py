@@ -1,34 +1,217 @@
 """Ratelimit handlers."""
 
+from __future__ import annotations
+
 import asyncio
+import email.utils
 import functools
+import random
+import time
 import typing
 
+import yarl
+
 from genshin import errors
 
+if typing.TYPE_CHECKING:
+    import aiohttp.typedefs as aiohttp_typedefs
+
+__all__ = [
+    "RateLimiter",
+    "TokenBucket",
+    "get_endpoint_family",
+    "handle_ratelimits",
+    "parse_retry_after",
+    "retry_ratelimited",
+]
+
+T = typing.TypeVar("T")
 CallableT = typing.TypeVar("CallableT", bound=typing.Callable[..., typing.Awaitable[typing.Any]])
 
+EndpointFamily = typing.Literal["game_record", "gacha", "hoyolab"]
+
+
+def get_endpoint_family(url: yarl.URL) -> EndpointFamily:
+    """Get the ratelimit family of an endpoint."""
+    if "game_record" in url.path:
+        return "game_record"
+
+    if "gacha" in url.path.lower():
+        return "gacha"
+
+    return "hoyolab"
+
+
+def parse_retry_after(value: typing.Optional[str]) -> typing.Optional[float]:
+    """Parse a Retry-After header into seconds."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(date.timestamp() - time.time(), 0)
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of up to `capacity` requests."""
+
+    rate: float
+    capacity: float
+
+    _tokens: float
+    _updated: float
+
+    def __init__(self, rate: float, capacity: typing.Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, until: float = 0) -> None:
+        """Empty the bucket so no tokens are available for `until` seconds."""
+        self._refill()
+        self._tokens = min(self._tokens, -until * self.rate)
+
+    async def acquire(self) -> float:
+        """Take a token, waiting until one is available.
+
+        Returns the time spent waiting.
+        """
+        self._refill()
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return 0
+
+        # the token is reserved so concurrent callers queue up behind each other
+        wait = -self._tokens / self.rate
+        await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Per-host and per-endpoint-family ratelimiter.
+
+    A single instance may be shared between multiple clients by assigning it to their cookie managers.
+    """
+
+    DEFAULT_RATES: typing.ClassVar[typing.Mapping[EndpointFamily, float]] = {
+        "game_record": 5,
+        "gacha": 2,
+        "hoyolab": 10,
+    }
+
+    rates: dict[EndpointFamily, float]
+    buckets: dict[tuple[str, EndpointFamily], TokenBucket]
+
+    throttled_time: float
+    """Total time requests spent waiting for a token."""
+    throttled_requests: int
+    """Amount of requests which had to wait for a token."""
+    backoff_time: float
+    """Total time spent backing off after being ratelimited."""
+    retries: int
+    """Amount of requests retried after being ratelimited."""
+
+    def __init__(self, rates: typing.Optional[typing.Mapping[EndpointFamily, float]] = None) -> None:
+        self.rates = {**self.DEFAULT_RATES, **(rates or {})}
+        self.buckets = {}
+
+        self.throttled_time = 0
+        self.throttled_requests = 0
+        self.backoff_time = 0
+        self.retries = 0
+
+    def get_bucket(self, url: aiohttp_typedefs.StrOrURL) -> TokenBucket:
+        """Get the token bucket for a url."""
+        url = yarl.URL(url)
+        family = get_endpoint_family(url)
+        key = (url.host or "", family)
+
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(self.rates[family])
+
+        return self.buckets[key]
+
+    async def acquire(self, url: aiohttp_typedefs.StrOrURL) -> None:
+        """Wait until a request towards a url is allowed."""
+        waited = await self.get_bucket(url).acquire()
+        if waited:
+            self.throttled_time += waited
+            self.throttled_requests += 1
+
+    def record_backoff(self, url: aiohttp_typedefs.StrOrURL, delay: float) -> None:
+        """Record a backoff and hold back other requests towards the same endpoint family."""
+        self.retries += 1
+        self.backoff_time += delay
+        self.get_bucket(url).delay(delay)
+
+
+async def retry_ratelimited(
+    func: typing.Callable[[], typing.Awaitable[T]],
+    *,
+    tries: int = 5,
+    exception: type[errors.GenshinException] = errors.VisitsTooFrequently,
+    delay: float = 0.3,
+    max_delay: float = 10,
+    limiter: typing.Optional[RateLimiter] = None,
+    url: typing.Optional[aiohttp_typedefs.StrOrURL] = None,
+) -> T:
+    """Call a function, retrying it whenever it gets ratelimited.
+
+    Retries use exponential backoff with full jitter and honor any Retry-After delay.
+    With a limiter, other requests towards the url are held back while backing off.
+    """
+    for attempt in range(tries):
+        try:
+            return await func()
+        except exception as e:
+            backoff = random.uniform(0, min(max_delay, delay * 2**attempt))
+            backoff = max(backoff, getattr(e, "retry_after", None) or 0)
+
+            if limiter is not None and url is not None:
+                limiter.record_backoff(url, backoff)
+
+            await asyncio.sleep(backoff)
+
+    raise exception({}, f"Got ratelimited {tries} times in a row")
+
 
 def handle_ratelimits(
     tries: int = 5,
     exception: type[errors.GenshinException] = errors.VisitsTooFrequently,
     delay: float = 0.3,
+    max_delay: float = 10,
 ) -> typing.Callable[[CallableT], CallableT]:
-    """Handle ratelimits for requests."""
-    # TODO: Support exponential backoff
+    """Handle ratelimits for requests.
+
+    Retries use exponential backoff with full jitter and honor any Retry-After delay.
+    """
 
     def wrapper(func: typing.Callable[..., typing.Awaitable[typing.Any]]) -> typing.Any:
         @functools.wraps(func)
         async def inner(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
-            for _ in range(tries):
-                try:
-                    x = await func(*args, **kwargs)
-                except exception:
-                    await asyncio.sleep(delay)
-                else:
-                    return x
-            else:
-                raise exception({}, f"Got ratelimited {tries} times in a row")
+            return await retry_ratelimited(
+                functools.partial(func, *args, **kwargs),
+                tries=tries,
+                exception=exception,
+                delay=delay,
+                max_delay=max_delay,
+            )
 
         return inner
 
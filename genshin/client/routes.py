@@ -1,6 +1,7 @@
 """API routes."""
 
 import abc
+import functools
 import typing
 
 import yarl
@@ -42,6 +43,7 @@ __all__ = [
     "WEB_LOGIN_URL",
     "YSULOG_URL",
     "Route",
+    "get_region_by_host",
 ]
 
 
@@ -330,3 +332,57 @@ GET_FP_URL = InternationalRoute(
 )
 
 MIMO_URL = Route("https://sg-public-api.hoyolab.com/event/e2023mimotravel")
+
+# routes whose hosts tell the region of a url
+_REGIONAL_ROUTES: tuple[typing.Union[InternationalRoute, GameRoute], ...] = (
+    WEBSTATIC_URL,
+    WEBAPI_URL,
+    ACCOUNT_URL,
+    BBS_URL,
+    BBS_REFERER_URL,
+    TAKUMI_URL,
+    COMMUNITY_URL,
+    RECORD_URL,
+    CARD_WAPI_URL,
+    LINEUP_URL,
+    INFO_LEDGER_URL,
+    DETAIL_LEDGER_URL,
+    CALCULATOR_URL,
+    TEAPOT_URL,
+    REWARD_URL,
+    CODE_URL,
+    GACHA_URL,
+    YSULOG_URL,
+    CREATE_MMT_URL,
+    GAME_RISKY_CHECK_URL,
+    SHIELD_LOGIN_URL,
+    PRE_GRANT_TICKET_URL,
+    DEVICE_GRANT_URL,
+    GAME_LOGIN_URL,
+    GET_FP_URL,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_host_regions() -> typing.Mapping[str, types.Region]:
+    """Build a host to region table from the regional routes.
+
+    Hosts used by both regions are left out.
+    """
+    regions: dict[str, set[types.Region]] = {}
+    for route in _REGIONAL_ROUTES:
+        if isinstance(route, InternationalRoute):
+            urls = list(route.urls.items())
+        else:
+            urls = [(region, url) for region, game_urls in route.urls.items() for url in game_urls.values()]
+
+        for region, url in urls:
+            if url.host:
+                regions.setdefault(url.host, set()).add(region)
+
+    return {host: next(iter(host_regions)) for host, host_regions in regions.items() if len(host_regions) == 1}
+
+
+def get_region_by_host(host: str) -> typing.Optional[types.Region]:
+    """Get the region of a host known from international routes."""
+    return _get_host_regions().get(host)
@@ -104,6 +104,9 @@ class VisitsTooFrequently(GenshinException):
     retcode = -110
     msg = "Visits too frequently."
 
+    retry_after: typing.Optional[float] = None
+    """Seconds to wait before retrying, if provided by the server."""
+
 
 class AlreadyClaimed(GenshinException):
     """Already claimed the daily reward today."""
@@ -1,9 +1,60 @@
 """API models."""
 
-from .auth import *
-from .genshin import *
-from .honkai import *
-from .hoyolab import *
-from .model import *
-from .starrail import *
-from .zzz import *
+import importlib
+import types
+import typing
+
+if typing.TYPE_CHECKING:
+    from .auth import *
+    from .genshin import *
+    from .honkai import *
+    from .hoyolab import *
+    from .model import *
+    from .starrail import *
+    from .zzz import *
+
+# models of each game are only created once one of them is accessed
+_SUBMODULES = ("auth", "genshin", "honkai", "hoyolab", "model", "starrail", "zzz")
+
+
+def _get_public_names(module: types.ModuleType) -> typing.Sequence[str]:
+    """Get the names a star import of a module would import."""
+    if hasattr(module, "__all__"):
+        return module.__all__
+
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name == "__all__":
+        names = {*_SUBMODULES}
+        for module_name in _SUBMODULES:
+            names.update(_get_public_names(importlib.import_module(f".{module_name}", __name__)))
+
+        value: typing.Any = sorted(names)
+        globals()[name] = value
+        return value
+
+    found: typing.Any = None
+    for module_name in _SUBMODULES:
+        module = importlib.import_module(f".{module_name}", __name__)
+        if name not in _get_public_names(module):
+            continue
+
+        found = getattr(module, name)
+        # re-exported submodules follow star import priority, so keep searching
+        if not isinstance(found, types.ModuleType):
+            break
+
+    if found is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = found
+    return found
+
+
+def __dir__() -> typing.Sequence[str]:
+    return sorted({*globals(), *__getattr__("__all__")})
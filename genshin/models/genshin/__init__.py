@@ -7,6 +7,7 @@ from .constants import *
 from .daily import *
 from .diary import *
 from .gacha import *
+from .gachatable import *
 from .lineup import *
 from .teapot import *
 from .transaction import *
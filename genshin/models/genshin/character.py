@@ -1,5 +1,6 @@
 """Genshin character model."""
 
+import functools
 import logging
 import re
 import typing
@@ -7,7 +8,7 @@ import typing
 import pydantic
 
 from genshin.models.model import APIModel, Unique
-from genshin.utility import deprecation
+from genshin.utility import deprecation, extdb
 
 from . import constants
 
@@ -18,24 +19,34 @@ _LOGGER = logging.getLogger(__name__)
 ENKA_ICON_BASE = "https://enka.network/ui/"
 AMBR_ICON_BASE = "https://gi.yatta.moe/assets/UI/"
 
+ICON_PATTERN = re.compile(r"UI_AvatarIcon(?:_Side)?_(.*).png")
 
-def _parse_icon(icon: typing.Union[str, int]) -> str:
-    if isinstance(icon, int):
-        for names in constants.CHARACTER_NAMES.values():
-            char = names.get(icon)
-            if char:
-                return char.icon_name
-
-        raise ValueError(f"Invalid character id {icon}")
 
-    match = re.search(r"UI_AvatarIcon(?:_Side)?_(.*).png", icon)
+@functools.lru_cache(maxsize=1024)
+def _parse_icon_url(icon: str) -> str:
+    match = ICON_PATTERN.search(icon)
     if match:
         return match[1]
 
     return icon
 
 
+def _parse_icon(icon: typing.Union[str, int], *, lang: typing.Optional[str] = None) -> str:
+    if isinstance(icon, int):
+        extdb.load_cached_characters(lang)
+        chars = constants.CHARACTER_NAMES.get(lang) if lang else None
+        char = chars.get(icon) if chars else None
+        icon_name = char.icon_name if char else constants.CHARACTER_NAMES.get_icon_name(icon)
+        if icon_name is None:
+            raise ValueError(f"Invalid character id {icon}")
+
+        return icon_name
+
+    return _parse_icon_url(icon)
+
+
 def _get_icon_name_from_id(character_id: int) -> str:
+    extdb.load_cached_characters("en-us")
     if "en-us" not in constants.CHARACTER_NAMES:
         raise ValueError(
             "Character names not loaded for en-us. Please run `await genshin.utility.update_characters_any()`."
@@ -71,35 +82,38 @@ def _get_db_char(
     lang: str,
 ) -> constants.DBChar:
     """Get the appropriate DBChar object from specific fields."""
+    extdb.load_cached_characters(lang)
     if lang not in constants.CHARACTER_NAMES:
         if id and name and icon and element and rarity:
-            return constants.DBChar(id or 0, _parse_icon(icon), name, element, rarity, guessed=True)
+            return constants.DBChar(id or 0, _parse_icon(icon, lang=lang), name, element, rarity, guessed=True)
         raise Exception(
             f"Character names not loaded for {lang!r}. Please run `await genshin.utility.update_characters_any()`."
         )
 
-    if id and id in constants.CHARACTER_NAMES[lang]:
-        char = constants.CHARACTER_NAMES[lang][id]
+    chars = constants.CHARACTER_NAMES[lang]
+
+    if id and id in chars:
+        char = chars[id]
         if name is not None:
             char = char._replace(name=name, element=element or char.element or "")
 
         return char
 
     if icon and "genshin" in icon:
-        icon_name = _parse_icon(icon)
+        icon_name = _parse_icon(icon, lang=lang)
 
-        for char in constants.CHARACTER_NAMES[lang].values():
-            if char.icon_name == icon_name:
-                if name is not None:
-                    char = char._replace(name=name)
+        icon_char = chars.get_by_icon(icon_name)
+        if icon_char is not None:
+            if name is not None:
+                icon_char = icon_char._replace(name=name)
 
-                return char
+            return icon_char
 
         # might as well just update the CHARACTER_NAMES if we have all required data
         if id and name and icon and element and rarity:
             char = constants.DBChar(id, icon_name, name, element, rarity, guessed=True)
             _LOGGER.debug("Updating CHARACTER_NAMES with %s", char)
-            constants.CHARACTER_NAMES[lang][char.id] = char
+            chars[char.id] = char
             return char
 
         return constants.DBChar(
@@ -112,9 +126,9 @@ def _get_db_char(
         )
 
     if name:
-        for char in constants.CHARACTER_NAMES[lang].values():
-            if char.name == name:
-                return char
+        name_char = chars.get_by_name(name)
+        if name_char is not None:
+            return name_char
 
         return constants.DBChar(id or 0, icon or name, name, element or "Anemo", rarity or 5, guessed=True)
 
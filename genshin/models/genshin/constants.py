@@ -2,7 +2,7 @@
 
 import typing
 
-__all__ = ["CHARACTER_NAMES", "DBChar"]
+__all__ = ["CHARACTER_NAMES", "CharacterDatabase", "CharacterNames", "DBChar"]
 
 
 class DBChar(typing.NamedTuple):
@@ -92,4 +92,195 @@ class DBChar(typing.NamedTuple):
 #     10000071: ("Cyno", "Electro", 5),
 #     10000072: ("Candace", "Hydro", 4),
 # }
-CHARACTER_NAMES: dict[str, dict[int, DBChar]] = {}
+
+
+class CharacterNames(dict[int, DBChar]):
+    """Characters of a single language indexed by id, icon name and name.
+
+    New characters are indexed as they're added, any other change rebuilds the indexes on the next lookup.
+    """
+
+    __slots__ = ("_by_icon", "_by_name", "_database", "_dirty")
+
+    _by_icon: dict[str, int]
+    _by_name: dict[str, int]
+    _database: typing.Optional["CharacterDatabase"]
+    _dirty: bool
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._by_icon = {}
+        self._by_name = {}
+        self._database = None
+        self._dirty = True
+
+    def _invalidate(self) -> None:
+        self._dirty = True
+        if self._database is not None:
+            self._database._dirty = True
+
+    def _reindex(self) -> None:
+        self._by_icon.clear()
+        self._by_name.clear()
+        for id, char in self.items():
+            self._by_icon.setdefault(char.icon_name, id)
+            self._by_name.setdefault(char.name, id)
+
+        self._dirty = False
+
+    def __setitem__(self, id: int, char: DBChar) -> None:
+        if id in self:
+            super().__setitem__(id, char)
+            self._invalidate()
+            return
+
+        super().__setitem__(id, char)
+        if not self._dirty:
+            self._by_icon.setdefault(char.icon_name, id)
+            self._by_name.setdefault(char.name, id)
+        if self._database is not None and not self._database._dirty:
+            self._database._icon_names.setdefault(id, char.icon_name)
+
+    def __delitem__(self, id: int) -> None:
+        super().__delitem__(id)
+        self._invalidate()
+
+    def setdefault(self, id: int, char: DBChar) -> DBChar:  # type: ignore[override]
+        """Insert a character if its id is missing and return the stored one."""
+        if id not in self:
+            self[id] = char
+
+        return self[id]
+
+    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Update characters, rebuilding the indexes on the next lookup."""
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def pop(self, *args: typing.Any) -> typing.Any:
+        """Remove a character by id and return it."""
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def popitem(self) -> tuple[int, DBChar]:
+        """Remove and return the last inserted character."""
+        item = super().popitem()
+        self._invalidate()
+        return item
+
+    def clear(self) -> None:
+        """Remove all characters."""
+        super().clear()
+        self._invalidate()
+
+    def __or__(self, other: typing.Mapping[int, DBChar]) -> "CharacterNames":  # type: ignore[override]
+        chars = CharacterNames(self)
+        chars.update(other)
+        return chars
+
+    def __ior__(self, other: typing.Mapping[int, DBChar]) -> "CharacterNames":  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def get_by_icon(self, icon_name: str) -> typing.Optional[DBChar]:
+        """Get the first character with an icon name."""
+        if self._dirty:
+            self._reindex()
+
+        id = self._by_icon.get(icon_name)
+        return None if id is None else self[id]
+
+    def get_by_name(self, name: str) -> typing.Optional[DBChar]:
+        """Get the first character with a localized name."""
+        if self._dirty:
+            self._reindex()
+
+        id = self._by_name.get(name)
+        return None if id is None else self[id]
+
+
+class CharacterDatabase(dict[str, CharacterNames]):
+    """Characters of all languages.
+
+    Assigned mappings are converted to `CharacterNames`.
+    """
+
+    __slots__ = ("_dirty", "_icon_names")
+
+    _icon_names: dict[int, str]
+    _dirty: bool
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__()
+        self._icon_names = {}
+        self._dirty = True
+        self.update(*args, **kwargs)
+
+    def _adopt(self, chars: typing.Mapping[int, DBChar]) -> CharacterNames:
+        if not isinstance(chars, CharacterNames) or chars._database not in (None, self):
+            chars = CharacterNames(chars)
+
+        chars._database = self
+        return chars
+
+    def __setitem__(self, lang: str, chars: typing.Mapping[int, DBChar]) -> None:
+        super().__setitem__(lang, self._adopt(chars))
+        self._dirty = True
+
+    def __delitem__(self, lang: str) -> None:
+        super().__delitem__(lang)
+        self._dirty = True
+
+    def setdefault(self, lang: str, chars: typing.Optional[typing.Mapping[int, DBChar]] = None) -> CharacterNames:  # type: ignore[override]
+        """Insert the characters of a language if it's missing and return the stored ones."""
+        if lang not in self:
+            self[lang] = chars or {}
+
+        return self[lang]
+
+    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Update languages, converting their characters to `CharacterNames`."""
+        for lang, chars in dict(*args, **kwargs).items():
+            self[lang] = chars
+
+    def pop(self, *args: typing.Any) -> typing.Any:
+        """Remove a language and return its characters."""
+        value = super().pop(*args)
+        self._dirty = True
+        return value
+
+    def popitem(self) -> tuple[str, CharacterNames]:
+        """Remove and return the last inserted language."""
+        item = super().popitem()
+        self._dirty = True
+        return item
+
+    def clear(self) -> None:
+        """Remove all languages."""
+        super().clear()
+        self._dirty = True
+
+    def __or__(self, other: typing.Mapping[str, typing.Mapping[int, DBChar]]) -> "CharacterDatabase":  # type: ignore[override]
+        database = CharacterDatabase(self)
+        database.update(other)
+        return database
+
+    def __ior__(self, other: typing.Mapping[str, typing.Mapping[int, DBChar]]) -> "CharacterDatabase":  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def get_icon_name(self, id: int) -> typing.Optional[str]:
+        """Get the icon name of a character in any language."""
+        if self._dirty:
+            self._icon_names.clear()
+            for chars in self.values():
+                for char_id, char in chars.items():
+                    self._icon_names.setdefault(char_id, char.icon_name)
+
+            self._dirty = False
+
+        return self._icon_names.get(id)
+
+
+CHARACTER_NAMES: CharacterDatabase = CharacterDatabase()
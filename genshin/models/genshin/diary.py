@@ -95,6 +95,7 @@ class DiaryPage(BaseDiary):
     """Page of a diary."""
 
     actions: typing.Sequence[DiaryAction] = Aliased("list")
+    total: typing.Optional[int] = None
 
 
 class StarRailDiaryActionCategory(APIModel):
@@ -161,3 +162,4 @@ class StarRailDiaryPage(BaseDiary):
     """Page of a diary."""
 
     actions: typing.Sequence[StarRailDiaryAction] = Aliased("list")
+    total: typing.Optional[int] = None
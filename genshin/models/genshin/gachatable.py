@@ -0,0 +1,312 @@
+"""Columnar storage and statistics of gacha histories."""
+
+from __future__ import annotations
+
+import array
+import collections
+import datetime
+import itertools
+import typing
+
+if typing.TYPE_CHECKING:
+    from genshin.models.genshin import gacha
+
+__all__ = ["GachaRow", "GachaTable"]
+
+Backend = typing.Literal["auto", "numpy", "python"]
+
+DAY = 24 * 60 * 60
+
+
+class GachaRow(typing.NamedTuple):
+    """A single pull in a gacha table."""
+
+    id: int
+    item_id: int
+    name: str
+    rarity: int
+    banner_type: int
+    time: datetime.datetime
+
+
+class GachaTable:
+    """Compact table of pulls stored as parallel typed arrays.
+
+    A pull takes 28 bytes, names are interned and stored once. Statistics are computed over whole
+    columns at once, with NumPy when it's installed.
+    """
+
+    __slots__ = (
+        "backend",
+        "ids",
+        "item_ids",
+        "rarities",
+        "banner_types",
+        "times",
+        "tz_offsets",
+        "name_ids",
+        "names",
+        "_name_index",
+    )
+
+    backend: Backend
+    """Backend used for statistics. Auto uses NumPy when it's installed."""
+
+    ids: array.array[int]
+    item_ids: array.array[int]
+    rarities: array.array[int]
+    banner_types: array.array[int]
+    times: array.array[int]
+    """Unix time of each pull."""
+    tz_offsets: array.array[int]
+    """Number of hours from UTC+8."""
+    name_ids: array.array[int]
+    """Index of each name in names."""
+    names: list[str]
+
+    _name_index: dict[str, int]
+
+    def __init__(self, pulls: typing.Iterable[gacha.BaseWish] = (), *, backend: Backend = "auto") -> None:
+        self.backend = backend
+        self.ids = array.array("q")
+        self.item_ids = array.array("i")
+        self.rarities = array.array("b")
+        self.banner_types = array.array("h")
+        self.times = array.array("q")
+        self.tz_offsets = array.array("b")
+        self.name_ids = array.array("i")
+        self.names = []
+        self._name_index = {}
+
+        self.extend(pulls)
+
+    @classmethod
+    async def from_history(
+        cls,
+        history: typing.AsyncIterable[gacha.BaseWish],
+        *,
+        backend: Backend = "auto",
+    ) -> GachaTable:
+        """Build a table from a history paginator without keeping any of its models."""
+        table = cls(backend=backend)
+        async for pull in history:
+            table.append(pull)
+
+        return table
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = self._name_index[name] = len(self.names)
+            self.names.append(name)
+
+        return name_id
+
+    def append(self, pull: gacha.BaseWish) -> None:
+        """Add a pull to the table."""
+        self.ids.append(pull.id)
+        self.item_ids.append(getattr(pull, "item_id", 0))
+        self.rarities.append(pull.rarity)
+        self.banner_types.append(getattr(pull, "banner_type", 0))
+        self.times.append(int(pull.time.timestamp()))
+        self.tz_offsets.append(pull.tz_offset)
+        self.name_ids.append(self._intern(pull.name))
+
+    def extend(self, pulls: typing.Iterable[gacha.BaseWish]) -> None:
+        """Add several pulls to the table."""
+        for pull in pulls:
+            self.append(pull)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> GachaRow:
+        timezone = datetime.timezone(datetime.timedelta(hours=8 + self.tz_offsets[index]))
+        return GachaRow(
+            id=self.ids[index],
+            item_id=self.item_ids[index],
+            name=self.names[self.name_ids[index]],
+            rarity=self.rarities[index],
+            banner_type=self.banner_types[index],
+            time=datetime.datetime.fromtimestamp(self.times[index], timezone),
+        )
+
+    def __iter__(self) -> typing.Iterator[GachaRow]:
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} pulls={len(self)} names={len(self.names)}>"
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the columns in bytes."""
+        columns = (self.ids, self.item_ids, self.rarities, self.banner_types, self.times, self.tz_offsets)
+        return sum(column.itemsize * len(column) for column in (*columns, self.name_ids))
+
+    def _get_numpy(self) -> typing.Any:
+        """Get the NumPy module if it should be used."""
+        if self.backend == "python":
+            return None
+
+        try:
+            import numpy
+        except ImportError:
+            if self.backend == "numpy":
+                raise
+
+            return None
+
+        return numpy
+
+    def _group_banners(
+        self,
+        *columns: array.array[int],
+        banner_types: typing.Optional[typing.Collection[int]] = None,
+    ) -> dict[int, tuple[typing.Sequence[int], ...]]:
+        """Split columns by banner, oldest pull first.
+
+        Pull ids only ever increase so they give the order of pulls.
+        """
+        np = self._get_numpy()
+        if np is not None and len(self):
+            ids = np.frombuffer(self.ids, dtype=self.ids.typecode)
+            banners = np.frombuffer(self.banner_types, dtype=self.banner_types.typecode)
+            values = [np.frombuffer(column, dtype=column.typecode) for column in columns]
+
+            order = np.argsort(ids, kind="stable")
+            banners = banners[order]
+            values = [value[order] for value in values]
+
+            groups: dict[int, tuple[typing.Sequence[int], ...]] = {}
+            for banner in np.unique(banners).tolist():
+                if banner_types is None or banner in banner_types:
+                    mask = banners == banner
+                    groups[banner] = tuple(value[mask] for value in values)
+
+            return groups
+
+        ids = self.ids
+        if all(a > b for a, b in zip(ids, itertools.islice(ids, 1, None))):
+            chronological: typing.Iterable[int] = range(len(ids) - 1, -1, -1)  # already newest first
+        else:
+            chronological = sorted(range(len(ids)), key=ids.__getitem__)
+
+        indexes: dict[int, list[int]] = {}
+        for i in chronological:
+            banner = self.banner_types[i]
+            if banner_types is None or banner in banner_types:
+                indexes.setdefault(banner, []).append(i)
+
+        return {
+            banner: tuple([column[i] for i in banner_indexes] for column in columns)
+            for banner, banner_indexes in indexes.items()
+        }
+
+    def _get_hits(self, rarities: typing.Sequence[int], rarity: int) -> list[int]:
+        """Get the positions of pulls of at least a rarity."""
+        if not isinstance(rarities, list):  # numpy array
+            return (rarities >= rarity).nonzero()[0].tolist()  # type: ignore
+
+        return [i for i, r in enumerate(rarities) if r >= rarity]
+
+    def pity(self, rarity: int = 5) -> dict[int, int]:
+        """Get the amount of pulls made on each banner since the last pull of a rarity."""
+        pity: dict[int, int] = {}
+        for banner, (rarities,) in self._group_banners(self.rarities).items():
+            hits = self._get_hits(rarities, rarity)
+            pity[banner] = len(rarities) - (hits[-1] + 1 if hits else 0)
+
+        return pity
+
+    def pity_counts(self, rarity: int = 5) -> dict[int, list[int]]:
+        """Get the amount of pulls it took to get each pull of a rarity on each banner, oldest first."""
+        counts: dict[int, list[int]] = {}
+        for banner, (rarities,) in self._group_banners(self.rarities).items():
+            hits = self._get_hits(rarities, rarity)
+            counts[banner] = [b - a for a, b in zip([-1, *hits], hits)]
+
+        return counts
+
+    def fifty_fifty(
+        self,
+        standard: typing.Collection[str],
+        banner_types: typing.Optional[typing.Collection[int]] = None,
+        *,
+        rarity: int = 5,
+    ) -> dict[int, list[bool]]:
+        """Get whether each 50/50 on each banner was won, oldest first.
+
+        A pull of a standard item is a lost 50/50 and makes the next one guaranteed.
+        Only banners with rate-up items should be included.
+        """
+        standard_ids = {self._name_index[name] for name in standard if name in self._name_index}
+
+        results: dict[int, list[bool]] = {}
+        for banner, (rarities, name_ids) in self._group_banners(
+            self.rarities, self.name_ids, banner_types=banner_types
+        ).items():
+            guaranteed = False
+            results[banner] = []
+            for i in self._get_hits(rarities, rarity):
+                lost = int(name_ids[i]) in standard_ids
+                if not guaranteed:
+                    results[banner].append(not lost)
+                guaranteed = lost and not guaranteed
+
+        return results
+
+    def streaks(
+        self,
+        standard: typing.Collection[str],
+        banner_types: typing.Optional[typing.Collection[int]] = None,
+        *,
+        rarity: int = 5,
+    ) -> dict[int, list[tuple[bool, int]]]:
+        """Get the win and loss streaks of 50/50s on each banner as (won, length), oldest first."""
+        return {
+            banner: [(won, len(list(group))) for won, group in itertools.groupby(results)]
+            for banner, results in self.fifty_fifty(standard, banner_types, rarity=rarity).items()
+        }
+
+    def rarity_rates(self, banner_types: typing.Optional[typing.Collection[int]] = None) -> dict[int, float]:
+        """Get the share of pulls of each rarity."""
+        np = self._get_numpy()
+        if np is not None and len(self):
+            rarities = np.frombuffer(self.rarities, dtype=self.rarities.typecode)
+            if banner_types is not None:
+                banners = np.frombuffer(self.banner_types, dtype=self.banner_types.typecode)
+                rarities = rarities[np.isin(banners, list(banner_types))]
+
+            values, counts = np.unique(rarities, return_counts=True)
+            return {int(value): int(count) / len(rarities) for value, count in zip(values, counts)}
+
+        if banner_types is None:
+            counter = collections.Counter(self.rarities)
+        else:
+            counter = collections.Counter(r for r, b in zip(self.rarities, self.banner_types) if b in banner_types)
+
+        total = sum(counter.values())
+        return {rarity: count / total for rarity, count in sorted(counter.items())}
+
+    def pull_counts(
+        self,
+        interval: int = DAY,
+        banner_types: typing.Optional[typing.Collection[int]] = None,
+    ) -> dict[int, int]:
+        """Get the amount of pulls in each time bucket, keyed by the unix time the bucket starts at."""
+        np = self._get_numpy()
+        if np is not None and len(self):
+            times = np.frombuffer(self.times, dtype=self.times.typecode)
+            if banner_types is not None:
+                banners = np.frombuffer(self.banner_types, dtype=self.banner_types.typecode)
+                times = times[np.isin(banners, list(banner_types))]
+
+            buckets, counts = np.unique(times // interval * interval, return_counts=True)
+            return {int(bucket): int(count) for bucket, count in zip(buckets, counts)}
+
+        counter = collections.Counter(
+            t // interval * interval
+            for t, b in zip(self.times, self.banner_types)
+            if banner_types is None or b in banner_types
+        )
+        return dict(sorted(counter.items()))
@@ -13,12 +13,52 @@ from genshin.constants import CN_TIMEZONE
 
 __all__ = ["APIModel", "Aliased", "Unique"]
 
+T = typing.TypeVar("T")
+APIModelT = typing.TypeVar("APIModelT", bound="APIModel")
+
+
+_LIST_ADAPTERS: dict[typing.Any, pydantic.TypeAdapter[typing.Any]] = {}
+
+
+def _get_list_adapter(tp: typing.Any) -> pydantic.TypeAdapter[typing.Any]:
+    """Get a cached adapter validating a list of a type."""
+    adapter = _LIST_ADAPTERS.get(tp)
+    if adapter is None:
+        adapter = _LIST_ADAPTERS[tp] = pydantic.TypeAdapter(list[tp])  # type: ignore
+
+    return adapter
+
+
+def parse_many(
+    tp: typing.Union[type[T], typing.Any], data: typing.Iterable[typing.Mapping[str, typing.Any]], **shared: typing.Any
+) -> list[T]:
+    """Validate a list of items in a single pass.
+
+    Shared fields are added to every item.
+    """
+    if shared:
+        data = [{**item, **shared} for item in data]
+    elif not isinstance(data, list):
+        data = list(data)
+
+    return _get_list_adapter(tp).validate_python(data)
+
 
 class APIModel(pydantic.BaseModel):
     """Modified pydantic model."""
 
     model_config: pydantic.ConfigDict = pydantic.ConfigDict(arbitrary_types_allowed=True)  # type: ignore
 
+    @classmethod
+    def parse_many(
+        cls: type[APIModelT], data: typing.Iterable[typing.Mapping[str, typing.Any]], **shared: typing.Any
+    ) -> list[APIModelT]:
+        """Validate a list of models in a single pass.
+
+        Shared fields are added to every model.
+        """
+        return parse_many(cls, data, **shared)
+
 
 class Unique(abc.ABC):
     """A hashable model with an id."""
@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import collections
+import datetime
 import typing
 import warnings
+import weakref
 
 from . import base
 
@@ -18,6 +22,9 @@ T = typing.TypeVar("T")
 T_co = typing.TypeVar("T_co", covariant=True)
 UniqueT = typing.TypeVar("UniqueT", bound="models.Unique")
 
+_PREFETCH_TASKS: set[asyncio.Task[None]] = set()
+"""Running prefetch tasks, they only hold a weak reference to their paginator."""
+
 
 class GetterCallback(typing.Protocol[T_co]):
     """Callback for returning resources based on a page or cursor."""
@@ -35,22 +42,201 @@ class TokenGetterCallback(typing.Protocol[T_co]):
         ...
 
 
+_PrefetchedPage = tuple[typing.Optional[dict[str, typing.Any]], typing.Optional[typing.Iterable[T]]]
+
+
+def _aware(value: typing.Optional[datetime.datetime]) -> typing.Optional[datetime.datetime]:
+    """Treat naive datetimes as local time."""
+    if value is not None and value.tzinfo is None:
+        return value.astimezone()
+
+    return value
+
+
 class APIPaginator(typing.Generic[T], base.BufferedPaginator[T], abc.ABC):
-    """Paginator for interaction with the api."""
+    """Paginator for interaction with the api.
+
+    With `prefetch` set, up to that many pages are fetched in the background while the current page is consumed.
+    Background fetches are cancelled once the paginator is exhausted, closed or garbage collected.
+    Use the paginator as an async context manager to stop them as soon as iteration stops.
+
+    With `since` or `until` set, only items whose time is within the window are yielded. Resources are
+    returned newest first, so no more pages are requested once a page reaches past `since`.
+    """
 
-    __slots__ = ("getter",)
+    __slots__ = (
+        "getter",
+        "prefetch",
+        "since",
+        "until",
+        "_prefetched",
+        "_prefetch_slots",
+        "_prefetch_task",
+        "__weakref__",
+    )
 
     getter: typing.Callable[..., typing.Awaitable[object]]
     """Underlying getter that yields the next page."""
 
+    prefetch: int
+    """Amount of pages to fetch ahead of the consumer. 0 disables prefetching."""
+
+    since: typing.Optional[datetime.datetime]
+    """Time of the oldest item to yield."""
+
+    until: typing.Optional[datetime.datetime]
+    """Time of the newest item to yield."""
+
+    _prefetched: typing.Optional[asyncio.Queue[typing.Union[_PrefetchedPage[T], BaseException]]]
+    """Pages fetched ahead of the consumer with the state they were requested with."""
+
+    _prefetch_slots: typing.Optional[asyncio.Semaphore]
+    """Limits the amount of pages fetched ahead of the consumer."""
+
+    _prefetch_task: typing.Optional[asyncio.Task[None]]
+    """Background task fetching pages."""
+
+    def __init__(
+        self,
+        *,
+        limit: typing.Optional[int] = None,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+    ) -> None:
+        super().__init__(limit=limit)
+        self.prefetch = prefetch
+        self.since = _aware(since)
+        self.until = _aware(until)
+
+        self._prefetched = None
+        self._prefetch_slots = None
+        self._prefetch_task = None
+
+    def __del__(self) -> None:
+        try:
+            self._cancel_fetches()
+        except (AttributeError, RuntimeError):  # not initialized or the event loop is already closed
+            pass
+
+    @staticmethod
+    async def _prefetch_pages(
+        ref: weakref.ReferenceType[APIPaginator[T]],
+        queue: asyncio.Queue[typing.Union[_PrefetchedPage[T], BaseException]],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """Fetch pages into the queue until the paginator or the limit is exhausted.
+
+        The paginator is only referenced while a page is being fetched, so dropping it cancels the task.
+        """
+        paginator = ref()
+        if paginator is None:
+            return
+
+        fetched = paginator._counter - paginator._skip
+        paginator = None
+        try:
+            while True:
+                await slots.acquire()
+                paginator = ref()
+                if paginator is None:
+                    return
+
+                state = paginator._get_state()
+                page = await paginator.next_page()
+                if page is not None:
+                    page = list(page)
+                    fetched += len(page)
+
+                await queue.put((state, page))
+                if not page:
+                    return
+
+                if paginator.limit and fetched >= paginator.limit:
+                    await queue.put((paginator._get_state(), None))
+                    return
+
+                paginator = None
+        except Exception as e:
+            await queue.put(e)
+
+    async def _next_buffer(self) -> typing.Optional[typing.Iterable[T]]:
+        if self.prefetch <= 0:
+            return await super()._next_buffer()
+
+        if self._prefetched is None or self._prefetch_slots is None:
+            self._prefetched = asyncio.Queue()
+            self._prefetch_slots = asyncio.Semaphore(self.prefetch)
+            self._prefetch_task = asyncio.create_task(
+                self._prefetch_pages(weakref.ref(self), self._prefetched, self._prefetch_slots)
+            )
+            _PREFETCH_TASKS.add(self._prefetch_task)
+            self._prefetch_task.add_done_callback(_PREFETCH_TASKS.discard)
+
+        prefetched = await self._prefetched.get()
+        self._prefetch_slots.release()
+        if isinstance(prefetched, BaseException):
+            self._cancel_fetches()
+            raise prefetched
+
+        self._buffer_state, page = prefetched
+        return page
+
+    def _clip_page(self, data: typing.Sequence[T]) -> typing.Sequence[T]:
+        """Drop items outside of the time window, stopping once a page reaches past its start."""
+        if self.since is None and self.until is None:
+            return data
+
+        page = [
+            item
+            for item in data
+            if (self.since is None or item.time >= self.since)  # type: ignore
+            and (self.until is None or item.time <= self.until)  # type: ignore
+        ]
+        if self.since is not None and data and data[-1].time < self.since:  # type: ignore
+            self._stop()
+
+        return page
+
+    @abc.abstractmethod
+    def _stop(self) -> None:
+        """Stop requesting pages."""
+
+    def _cancel_fetches(self) -> None:
+        """Cancel outstanding background fetches."""
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+
+        self._prefetch_task = None
+        self._prefetched = None
+        self._prefetch_slots = None
+
+    def _complete(self) -> typing.NoReturn:
+        self._cancel_fetches()
+
+        super()._complete()
+        raise  # pyright bug
+
+    async def aclose(self) -> None:
+        """Stop the paginator early, cancelling any outstanding background fetches."""
+        task = self._prefetch_task
+        self._cancel_fetches()
+        self._buffer = None
+
+        if task is not None:
+            await asyncio.wait([task])
+
 
 class PagedPaginator(typing.Generic[T], APIPaginator[T]):
     """Paginator for resources which only require a page number.
 
-    Due to ratelimits the requests must be sequential.
+    Due to ratelimits the requests are sequential by default. With `concurrency` set, the first page is requested
+    alone and the following ones up to that many at once, yielded in order. The `total` amount of items is read
+    from the first page with `_get_total`, once it's known no pages past the end are requested. Otherwise at most
+    `concurrency - 1` requests are wasted past the last page.
     """
 
-    __slots__ = ("_page_size", "current_page")
+    __slots__ = ("_page_size", "current_page", "concurrency", "total", "_pending", "_started")
 
     getter: GetterCallback[T]
     """Underlying getter that yields the next page."""
@@ -61,36 +247,132 @@ class PagedPaginator(typing.Generic[T], APIPaginator[T]):
     current_page: typing.Optional[int]
     """Current page counter.."""
 
+    concurrency: int
+    """Maximum amount of pages requested at once."""
+
+    total: typing.Optional[int]
+    """Total amount of items, if known."""
+
+    _pending: collections.deque[asyncio.Future[typing.Sequence[T]]]
+    """Requests for the pages following the current page, in order."""
+
+    _started: bool
+    """Whether the first page has been requested."""
+
     def __init__(
         self,
         getter: GetterCallback[T],
         *,
         limit: typing.Optional[int] = None,
         page_size: typing.Optional[int] = None,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+        concurrency: int = 1,
+        total: typing.Optional[int] = None,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch, since=since, until=until)
         self.getter = getter
         self._page_size = page_size
+        self.concurrency = concurrency
+        self.total = total
 
         self.current_page = 1
+        self._pending = collections.deque()
+        self._started = False
+
+    @property
+    def last_page(self) -> typing.Optional[int]:
+        """The last page number, if the total amount of items is known."""
+        if self.total is None or not self._page_size:
+            return None
+
+        return -(-self.total // self._page_size)
+
+    def _get_total(self) -> typing.Optional[int]:
+        """Get the total amount of items once the first page has been fetched.
+
+        Subclasses whose pages tell the total should override this.
+        """
+        return self.total
+
+    def _schedule_pages(self) -> None:
+        """Request pages ahead of the current page up to the concurrency limit."""
+        assert self.current_page is not None
+
+        last_page = self.last_page
+        if self.limit and self._page_size:
+            limit_page = -(-self.limit // self._page_size)
+            last_page = min(last_page or limit_page, limit_page)
+
+        while len(self._pending) < self.concurrency:
+            page = self.current_page + len(self._pending)
+            if last_page is not None and page > last_page:
+                break
+
+            self._pending.append(asyncio.ensure_future(self.getter(page)))
+
+    async def _get_concurrent_page(self) -> typing.Sequence[T]:
+        """Get the current page while requesting the following ones."""
+        self._schedule_pages()
+        if not self._pending:
+            return []
+
+        try:
+            return await self._pending.popleft()
+        except BaseException:
+            self._cancel_pending()
+            raise
+
+    def _cancel_pending(self) -> None:
+        """Cancel requests for the following pages."""
+        for future in self._pending:
+            future.cancel()
+
+        self._pending.clear()
+
+    def _cancel_fetches(self) -> None:
+        self._cancel_pending()
+        super()._cancel_fetches()
+
+    def _stop(self) -> None:
+        self.current_page = None
+        self._cancel_pending()
+
+    def _get_state(self) -> dict[str, typing.Any]:
+        return {"page": self.current_page}
+
+    def _set_state(self, state: typing.Mapping[str, typing.Any]) -> None:
+        self._cancel_pending()
+        self.current_page = state["page"]
 
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
         """Get the next page of the paginator."""
-        if self.current_page is None:
-            return None
+        while self.current_page is not None:
+            if self.concurrency > 1 and self._page_size is not None and (self._started or self.total is not None):
+                data = await self._get_concurrent_page()
+            else:
+                data = await self.getter(self.current_page)
+                if not self._started and self.total is None:
+                    self.total = self._get_total()
 
-        data = await self.getter(self.current_page)
+            self._started = True
 
-        if self._page_size is None:
-            warnings.warn("No page size specified for resource, having to guess.")
-            self._page_size = len(data)
+            if self._page_size is None:
+                warnings.warn("No page size specified for resource, having to guess.")
+                self._page_size = len(data)
 
-        if len(data) < self._page_size:
-            self.current_page = None
-            return data
+            if len(data) < self._page_size:
+                self._stop()
+            else:
+                self.current_page += 1
+
+            # pages entirely newer than the window are skipped
+            page = self._clip_page(data)
+            if page or self.current_page is None:
+                return page
 
-        self.current_page += 1
-        return data
+        return None
 
 
 class TokenPaginator(typing.Generic[T], APIPaginator[T]):
@@ -112,29 +394,42 @@ class TokenPaginator(typing.Generic[T], APIPaginator[T]):
         *,
         limit: typing.Optional[int] = None,
         page_size: typing.Optional[int] = None,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch, since=since, until=until)
         self.getter = getter
         self._page_size = page_size
 
         self.token = ""
 
+    def _stop(self) -> None:
+        self.token = None
+
+    def _get_state(self) -> dict[str, typing.Any]:
+        return {"token": self.token}
+
+    def _set_state(self, state: typing.Mapping[str, typing.Any]) -> None:
+        self.token = state["token"]
+
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
         """Get the next page of the paginator."""
-        if self.token is None:
-            return None
+        while self.token is not None:
+            self.token, data = await self.getter(self.token)
 
-        self.token, data = await self.getter(self.token)
+            if self._page_size is None:
+                warnings.warn("No page size specified for resource, having to guess.")
+                self._page_size = len(data)
 
-        if self._page_size is None:
-            warnings.warn("No page size specified for resource, having to guess.")
-            self._page_size = len(data)
+            if len(data) < self._page_size:
+                self._stop()
 
-        if len(data) < self._page_size:
-            self.token = None
-            return data
+            page = self._clip_page(data)
+            if page or self.token is None:
+                return page
 
-        return data
+        return None
 
 
 class CursorPaginator(typing.Generic[UniqueT], APIPaginator[UniqueT]):
@@ -158,27 +453,41 @@ class CursorPaginator(typing.Generic[UniqueT], APIPaginator[UniqueT]):
         limit: typing.Optional[int] = None,
         end_id: int = 0,
         page_size: typing.Optional[int] = 20,
+        prefetch: int = 0,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch, since=since, until=until)
         self.getter = getter
         self.end_id = end_id
 
         self._page_size = page_size
 
+    def _stop(self) -> None:
+        self.end_id = None
+
+    def _get_state(self) -> dict[str, typing.Any]:
+        return {"end_id": self.end_id}
+
+    def _set_state(self, state: typing.Mapping[str, typing.Any]) -> None:
+        self.end_id = state["end_id"]
+
     async def next_page(self) -> typing.Optional[typing.Iterable[UniqueT]]:
         """Get the next page of the paginator."""
-        if self.end_id is None:
-            return None
+        while self.end_id is not None:
+            data = await self.getter(self.end_id)
 
-        data = await self.getter(self.end_id)
+            if self._page_size is None:
+                warnings.warn("No page size specified for resource, having to guess.")
+                self._page_size = len(data)
 
-        if self._page_size is None:
-            warnings.warn("No page size specified for resource, having to guess.")
-            self._page_size = len(data)
+            if len(data) < self._page_size:
+                self._stop()
+            else:
+                self.end_id = data[-1].id
 
-        if len(data) < self._page_size:
-            self.end_id = None
-            return data
+            page = self._clip_page(data)
+            if page or self.end_id is None:
+                return page
 
-        self.end_id = data[-1].id
-        return data
+        return None
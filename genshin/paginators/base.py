@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import collections
 import heapq
-import random
+import itertools
 import typing
 
 __all__ = ["BufferedPaginator", "MergedPaginator", "Paginator"]
 
 T = typing.TypeVar("T")
+PaginatorT = typing.TypeVar("PaginatorT", bound="Paginator[typing.Any]")
 
 
 async def flatten(iterable: typing.AsyncIterable[T]) -> typing.Sequence[T]:
@@ -69,6 +71,19 @@ class Paginator(typing.Generic[T], abc.ABC):
         yield -1
         yield ")"
 
+    def checkpoint(self) -> dict[str, typing.Any]:
+        """Get a json-serializable checkpoint of the yielded items."""
+        raise TypeError(f"{type(self).__name__} does not support checkpoints.")
+
+    def _resume(self, checkpoint: typing.Mapping[str, typing.Any]) -> None:
+        """Restore the state of a checkpoint."""
+        raise TypeError(f"{type(self).__name__} does not support checkpoints.")
+
+    def resume(self: PaginatorT, checkpoint: typing.Mapping[str, typing.Any]) -> PaginatorT:
+        """Continue from a checkpoint instead of the start. Returns the paginator itself."""
+        self._resume(checkpoint)
+        return self
+
     async def next(self) -> T:
         """Return the next element."""
         try:
@@ -83,6 +98,15 @@ class Paginator(typing.Generic[T], abc.ABC):
     def __aiter__(self) -> Paginator[T]:
         return self
 
+    async def __aenter__(self: PaginatorT) -> PaginatorT:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the paginator early, cancelling any outstanding requests."""
+
     async def flatten(self) -> typing.Sequence[T]:
         """Flatten the paginator."""
         return [item async for item in self]
@@ -116,9 +140,12 @@ class BasicPaginator(typing.Generic[T], Paginator[T], abc.ABC):
 
 
 class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
-    """Paginator with a support for buffers."""
+    """Paginator with a support for buffers.
 
-    __slots__ = ("limit", "_buffer", "_counter")
+    Subclasses which implement `_get_state` and `_set_state` can be checkpointed and resumed.
+    """
+
+    __slots__ = ("limit", "_buffer", "_counter", "_buffer_state", "_buffer_offset", "_skip")
 
     limit: typing.Optional[int]
     """Limit of items to be yielded."""
@@ -129,11 +156,23 @@ class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
     _counter: int
     """Amount of yielded items so far. No guarantee to be synchronized."""
 
+    _buffer_state: typing.Optional[dict[str, typing.Any]]
+    """State of the paginator before the buffered page was requested."""
+
+    _buffer_offset: int
+    """Amount of items of the buffered page which have been yielded."""
+
+    _skip: int
+    """Amount of already yielded items to skip in the next page after resuming."""
+
     def __init__(self, *, limit: typing.Optional[int] = None) -> None:
         self.limit = limit
 
         self._buffer = iter(())
         self._counter = 0
+        self._buffer_state = None
+        self._buffer_offset = 0
+        self._skip = 0
 
     @property
     def exhausted(self) -> bool:
@@ -150,6 +189,61 @@ class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
         """Get the next page of the paginator."""
 
+    def _get_state(self) -> typing.Optional[dict[str, typing.Any]]:
+        """Get the json-serializable state the next page is requested with. None if not supported."""
+        return None
+
+    def _set_state(self, state: typing.Mapping[str, typing.Any]) -> None:
+        """Restore the state the next page is requested with."""
+        raise TypeError(f"{type(self).__name__} does not support checkpoints.")
+
+    async def _next_buffer(self) -> typing.Optional[typing.Iterable[T]]:
+        """Get the next page to be buffered."""
+        state = self._get_state()
+        page = await self.next_page()
+        self._buffer_state = state
+        return page
+
+    def checkpoint(self) -> dict[str, typing.Any]:
+        """Get a json-serializable checkpoint of the yielded items.
+
+        A new paginator resumed from it continues right after the last yielded item,
+        re-requesting at most the page that item was on.
+        """
+        state = self._buffer_state if self._buffer_state is not None else self._get_state()
+        if state is None:
+            raise TypeError(f"{type(self).__name__} does not support checkpoints.")
+
+        return {"counter": self._counter, "state": state, "offset": self._buffer_offset + self._skip}
+
+    def _resume(self, checkpoint: typing.Mapping[str, typing.Any]) -> None:
+        if self._counter or self._buffer_state is not None:
+            raise RuntimeError("Cannot resume a paginator which has already been iterated.")
+
+        self._set_state(checkpoint["state"])
+        self._counter = checkpoint["counter"]
+        self._skip = checkpoint["offset"]
+
+    async def _next_item(self) -> T:
+        """Get the next buffered item, requesting pages until one has items left."""
+        assert self._buffer is not None
+
+        while True:
+            try:
+                return next(self._buffer)
+            except StopIteration:
+                pass
+
+            buffer = await self._next_buffer()
+            if not buffer:
+                self._complete()
+
+            self._buffer = iter(buffer)
+            self._buffer_offset = self._skip
+            if self._skip:
+                self._buffer = itertools.islice(self._buffer, self._skip, None)
+                self._skip = 0
+
     async def __anext__(self) -> T:
         if not self._buffer:
             self._complete()
@@ -160,35 +254,36 @@ class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
         self._counter += 1
 
         try:
-            return next(self._buffer)
-        except StopIteration:
-            pass
-
-        buffer = await self.next_page()
-        if not buffer:
-            self._complete()
+            value = await self._next_item()
+        except BaseException:
+            self._counter -= 1
+            raise
 
-        self._buffer = iter(buffer)
-        return next(self._buffer)
+        self._buffer_offset += 1
+        return value
 
 
 class MergedPaginator(typing.Generic[T], Paginator[T]):
-    """A paginator merging a collection of iterators."""
+    """A paginator merging a collection of iterators.
 
-    __slots__ = ("iterators", "_heap", "limit", "_key", "_prepared", "_counter")
+    Items are yielded in ascending order of their key, equal items in the order of their iterators.
+    Iterators are only advanced when their current item is yielded and stop as soon as the limit is reached.
+    Without a limit every item will be needed, so the next item of each iterator is requested ahead
+    and iterators whose pages run dry are refilled concurrently.
+    Requests made ahead are cancelled once the paginator is exhausted, closed or garbage collected.
 
-    # TODO: Use named tuples for the heap
+    If all iterators are paginators supporting checkpoints, so does the merged paginator.
+    """
 
-    iterators: typing.Sequence[typing.AsyncIterator[T]]
-    """Entry iterators.
+    __slots__ = ("iterators", "_heap", "limit", "_key", "_prepared", "_counter", "_pending", "_snapshots")
 
-    Only used as pointers to a heap.
-    """
+    iterators: typing.Sequence[typing.AsyncIterator[T]]
+    """Entry iterators."""
 
-    _heap: list[tuple[typing.Any, int, T, typing.AsyncIterator[T]]]
+    _heap: list[tuple[typing.Any, int, T]]
     """Underlying heap queue.
 
-    List of (comparable, unique order id, value, iterator)
+    List of (comparable, iterator index, value)
     """
 
     limit: typing.Optional[int]
@@ -201,7 +296,13 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
     """Whether the paginator is prepared"""
 
     _counter: int
-    """Amount of yielded items so far. No guarantee to be synchronized."""
+    """Amount of yielded items so far."""
+
+    _pending: dict[int, asyncio.Future[T]]
+    """Requests for the next item of iterators, by iterator index."""
+
+    _snapshots: list[collections.deque[typing.Optional[dict[str, typing.Any]]]]
+    """Checkpoints of iterators taken before each of their not yet yielded items was requested."""
 
     def __init__(
         self,
@@ -214,11 +315,22 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
         self._key = key
         self.limit = limit
 
+        self._heap = []
         self._prepared = False
         self._counter = 0
+        self._pending = {}
+        self._snapshots = [collections.deque() for _ in self.iterators]
+
+    def __del__(self) -> None:
+        try:
+            self._cancel_pending()
+        except (AttributeError, RuntimeError):  # not initialized or the event loop is already closed
+            pass
 
     def _complete(self) -> typing.NoReturn:
         """Mark paginator as complete and clear memory."""
+        self._cancel_pending()
+
         # free memory in heaps
         self._heap = []
         self.iterators = []
@@ -226,66 +338,137 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
         super()._complete()
         raise  # pyright bug
 
-    def _create_heap_item(
-        self,
-        value: T,
-        iterator: typing.AsyncIterator[T],
-        order: typing.Optional[int] = None,
-    ) -> tuple[typing.Any, int, T, typing.AsyncIterator[T]]:
-        """Create a new item for the heap queue."""
-        sort_value = self._key(value) if self._key else value
-        if order is None:
-            order = random.getrandbits(16)
+    def _cancel_pending(self) -> None:
+        """Cancel requests for next items."""
+        for future in self._pending.values():
+            future.cancel()
+
+        self._pending.clear()
 
-        return (sort_value, order, value, iterator)
+    def _checkpoint_iterator(self, index: int) -> typing.Optional[dict[str, typing.Any]]:
+        """Get the checkpoint of an iterator, if it supports them."""
+        iterator = self.iterators[index]
+        if not isinstance(iterator, Paginator):
+            return None
+
+        try:
+            return iterator.checkpoint()
+        except TypeError:
+            return None
+
+    def _request_next(self, index: int) -> asyncio.Future[T]:
+        """Request the next item of an iterator."""
+        self._snapshots[index].append(self._checkpoint_iterator(index))
+        return asyncio.ensure_future(self.iterators[index].__anext__())
+
+    def _push(self, index: int, value: T) -> None:
+        """Push an item on the heap and request the following one if it's going to be needed."""
+        heapq.heappush(self._heap, (self._key(value) if self._key else value, index, value))
+
+        if self.limit is None:
+            self._pending[index] = self._request_next(index)
 
     async def _prepare(self) -> None:
         """Prepare the heap queue by filling it with initial values."""
-        coros = (it.__anext__() for it in self.iterators)
-        first_values = await asyncio.gather(*coros, return_exceptions=True)
+        futures = [self._request_next(index) for index in range(len(self.iterators))]
+        first_values = await asyncio.gather(*futures, return_exceptions=True)
 
-        self._heap = []
-        for order, (it, value) in enumerate(zip(self.iterators, first_values)):
+        for index, value in enumerate(first_values):
             if isinstance(value, BaseException):
                 if isinstance(value, StopAsyncIteration):
                     continue
 
+                self._cancel_pending()
                 raise value
 
-            heapq.heappush(self._heap, self._create_heap_item(value, iterator=it, order=order))
+            self._push(index, value)
 
         self._prepared = True
 
+    async def _advance(self, index: int) -> None:
+        """Replace the smallest item, which came from an iterator, with that iterator's next item."""
+        future = self._pending.pop(index, None) or self._request_next(index)
+        try:
+            value = await future
+        except StopAsyncIteration:
+            heapq.heappop(self._heap)
+            return
+        except BaseException:
+            self._cancel_pending()
+            raise
+
+        heapq.heappop(self._heap)
+        self._push(index, value)
+
+    async def aclose(self) -> None:
+        """Stop the paginator early, stopping all iterators."""
+        self._cancel_pending()
+        for iterator in self.iterators:
+            if isinstance(iterator, Paginator):
+                await iterator.aclose()
+
+        self._heap = []
+        self.iterators = []
+
     async def __anext__(self) -> T:
         if not self._prepared:
             await self._prepare()
 
-        if not self._heap:
+        if not self._heap or (self.limit and self._counter >= self.limit):
+            await self.aclose()
             self._complete()
 
-        if self.limit and self._counter >= self.limit:
-            self._complete()
+        _, index, value = self._heap[0]
+        if self.limit and self._counter + 1 >= self.limit:
+            # the last item, no need for anything more
+            self._heap = []
+            self._snapshots[index][0] = self._checkpoint_iterator(index)
+        else:
+            await self._advance(index)
+            self._snapshots[index].popleft()
 
         self._counter += 1
+        return value
 
-        _, order, value, it = self._heap[0]
+    def checkpoint(self) -> dict[str, typing.Any]:
+        """Get a json-serializable checkpoint of the yielded items.
 
-        try:
-            new_value = await it.__anext__()
-        except StopAsyncIteration:
-            heapq.heappop(self._heap)
-            return value
+        It holds the checkpoint of every iterator from before its oldest item which hasn't been yielded.
+        """
+        sources = [snapshots[0] if snapshots else None for snapshots in self._snapshots]
+        if not self._prepared:
+            sources = [self._checkpoint_iterator(index) for index in range(len(self.iterators))]
 
-        heapq.heapreplace(self._heap, self._create_heap_item(new_value, iterator=it, order=order))
+        if any(source is None for source in sources):
+            raise TypeError("All merged iterators must support checkpoints.")
 
-        return value
+        return {"counter": self._counter, "sources": sources}
+
+    def _resume(self, checkpoint: typing.Mapping[str, typing.Any]) -> None:
+        if self._prepared:
+            raise RuntimeError("Cannot resume a paginator which has already been iterated.")
+
+        sources: typing.Sequence[typing.Mapping[str, typing.Any]] = checkpoint["sources"]
+        if len(sources) != len(self.iterators):
+            raise ValueError("The checkpoint is of a different amount of iterators.")
+
+        for iterator, source in zip(self.iterators, sources):
+            if not isinstance(iterator, Paginator):
+                raise TypeError("All merged iterators must support checkpoints.")
+
+            iterator.resume(source)
+
+        self._counter = checkpoint["counter"]
 
     async def flatten(self, *, lazy: bool = False) -> typing.Sequence[T]:
-        """Flatten the paginator."""
-        if self.limit is not None and lazy:
+        """Flatten the paginator.
+
+        With a limit items are merged as they come, otherwise all iterators are flattened at once.
+        """
+        if self.limit is not None or lazy or self._prepared:
             return [item async for item in self]
 
         coros = (flatten(i) for i in self.iterators)
         lists: typing.Sequence[typing.Sequence[T]] = await asyncio.gather(*coros)  # pyright: ignore
 
-        return list(heapq.merge(*lists, key=self._key))[: self.limit]  # pyright: ignore
+        return list(heapq.merge(*lists, key=self._key))  # pyright: ignore
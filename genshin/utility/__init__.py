@@ -3,7 +3,9 @@
 from .auth import *
 from .concurrency import *
 from .ds import *
+from .export import *
 from .extdb import *
 from .fs import *
+from .httpcache import *
 from .logfile import *
 from .uid import *
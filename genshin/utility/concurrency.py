@@ -6,7 +6,7 @@ import asyncio
 import functools
 import typing
 
-__all__ = ["prevent_concurrency"]
+__all__ = ["SingleFlight", "prevent_concurrency"]
 
 T = typing.TypeVar("T")
 AnyCallable = typing.Callable[..., typing.Any]
@@ -36,6 +36,50 @@ def prevent_concurrency(func: CallableT) -> CallableT:
     return typing.cast("CallableT", MethodDecorator(func, wrapper))
 
 
+class SingleFlight:
+    """Table of in-flight calls which lets concurrent identical calls share a single result.
+
+    The shared call runs as a separate task so cancelling one caller does not affect the others.
+    """
+
+    calls: int
+    coalesced: int
+
+    _tasks: dict[typing.Hashable, asyncio.Future[typing.Any]]
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._tasks = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _forget(self, key: typing.Hashable, task: asyncio.Future[typing.Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        if not task.cancelled():
+            task.exception()  # mark as retrieved
+
+    def start(self, key: typing.Hashable, factory: typing.Callable[[], typing.Awaitable[T]]) -> asyncio.Future[T]:
+        """Get the call for a key, starting it only if there is none in flight."""
+        task = self._tasks.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.coalesced += 1
+
+        return task
+
+    async def run(self, key: typing.Hashable, factory: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """Await the call for a key, starting it only if there is none in flight."""
+        return await asyncio.shield(self.start(key, factory))
+
+
 class MethodDecorator:
     """Descriptor which applies decorators per-instance."""
 
@@ -0,0 +1,186 @@
+"""Streaming export of histories."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import pathlib
+import typing
+
+__all__ = ["AsyncFileWriter", "export_histories", "export_history"]
+
+ExportFormat = typing.Literal["jsonl", "csv"]
+PathLike = typing.Union[str, pathlib.Path]
+
+
+class AsyncFileWriter:
+    """Buffered text file writer which writes in a thread.
+
+    Only one write is in flight at a time. Writing while it's still going waits for it,
+    so a slow disk slows down the producer instead of piling up data in memory.
+    """
+
+    path: pathlib.Path
+    buffer_size: int
+    """Amount of characters collected before they're written."""
+
+    _file: typing.Optional[typing.TextIO]
+    _buffer: list[str]
+    _buffered: int
+    _pending: typing.Optional[asyncio.Future[int]]
+
+    def __init__(self, path: PathLike, *, buffer_size: int = 64 * 1024) -> None:
+        self.path = pathlib.Path(path)
+        self.buffer_size = buffer_size
+
+        self._file = None
+        self._buffer = []
+        self._buffered = 0
+        self._pending = None
+
+    async def __aenter__(self) -> AsyncFileWriter:
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Open the file, replacing its contents."""
+        self._file = await asyncio.to_thread(self.path.open, "w", encoding="utf-8", newline="")
+
+    async def write(self, data: str) -> None:
+        """Write text, waiting for the previous write once the buffer is full."""
+        self._buffer.append(data)
+        self._buffered += len(data)
+
+        if self._buffered >= self.buffer_size:
+            await self._write_buffer()
+
+    async def _write_buffer(self) -> None:
+        if self._file is None:
+            raise RuntimeError("The file is not open.")
+
+        if self._pending is not None:
+            await self._pending
+
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        self._pending = asyncio.ensure_future(asyncio.to_thread(self._file.write, data))
+
+    async def flush(self) -> None:
+        """Write all buffered text."""
+        if self._buffer:
+            await self._write_buffer()
+
+        if self._pending is not None:
+            await self._pending
+            self._pending = None
+
+    async def close(self) -> None:
+        """Write all buffered text and close the file."""
+        if self._file is None:
+            return
+
+        try:
+            await self.flush()
+        finally:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+
+def _dump(item: typing.Any) -> dict[str, typing.Any]:
+    """Turn a model into a json-compatible dict."""
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json")
+
+    return dict(item)
+
+
+class _CSVEncoder:
+    """Encodes dicts as csv rows, the header is written before the first one."""
+
+    fields: typing.Optional[typing.Sequence[str]]
+
+    def __init__(self, fields: typing.Optional[typing.Sequence[str]] = None) -> None:
+        self.fields = fields
+        self._header = False
+        self._stream = io.StringIO()
+        self._writer = csv.writer(self._stream)
+
+    def _encode_row(self, row: typing.Iterable[typing.Any]) -> str:
+        self._stream.seek(0)
+        self._stream.truncate()
+        self._writer.writerow(row)
+        return self._stream.getvalue()
+
+    def encode(self, data: typing.Mapping[str, typing.Any]) -> str:
+        header = ""
+        if not self._header:
+            self.fields = self.fields or list(data)
+            self._header = True
+            header = self._encode_row(self.fields)
+
+        values = (data.get(field) for field in self.fields or ())
+        return header + self._encode_row(
+            json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value for value in values
+        )
+
+
+async def export_history(
+    history: typing.AsyncIterable[typing.Any],
+    path: PathLike,
+    *,
+    format: typing.Optional[ExportFormat] = None,
+    fields: typing.Optional[typing.Sequence[str]] = None,
+    buffer_size: int = 64 * 1024,
+) -> int:
+    """Write a history to a JSONL or CSV file as it's being fetched.
+
+    Only the current page of every source paginator is kept in memory. The format is guessed
+    from the file suffix. CSV columns are the fields of the first item unless given.
+    Returns the amount of exported items.
+    """
+    path = pathlib.Path(path)
+    format = format or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    if format not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported export format: {format}")
+
+    csv_encoder = _CSVEncoder(fields) if format == "csv" else None
+
+    count = 0
+    async with AsyncFileWriter(path, buffer_size=buffer_size) as writer:
+        async for item in history:
+            data = _dump(item)
+            if csv_encoder is not None:
+                await writer.write(csv_encoder.encode(data))
+            else:
+                await writer.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+            count += 1
+
+    return count
+
+
+async def export_histories(
+    histories: typing.Mapping[PathLike, typing.AsyncIterable[typing.Any]],
+    *,
+    format: typing.Optional[ExportFormat] = None,
+    concurrency: int = 4,
+    buffer_size: int = 64 * 1024,
+) -> dict[str, int]:
+    """Export several histories, for example of different accounts, at the same time.
+
+    Returns the amount of exported items of each file.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def export(path: PathLike, history: typing.AsyncIterable[typing.Any]) -> int:
+        async with semaphore:
+            return await export_history(history, path, format=format, buffer_size=buffer_size)
+
+    counts = await asyncio.gather(*(export(path, history) for path, history in histories.items()))
+    return {str(path): count for path, count in zip(histories, counts)}
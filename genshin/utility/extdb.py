@@ -1,8 +1,14 @@
 """External databases for Genshin Impact data."""
 
 import asyncio
+import codecs
+import functools
 import json
 import logging
+import os
+import pathlib
+import re
+import tempfile
 import time
 import typing
 import warnings
@@ -12,9 +18,15 @@ import aiohttp
 
 from genshin.constants import LANGS
 from genshin.models.genshin import constants as model_constants
-from genshin.utility import fs
+from genshin.utility import concurrency, fs, httpcache
 
 __all__ = (
+    "CHARACTER_REFRESHER",
+    "CHARACTER_STORE",
+    "HTTP_CACHE",
+    "CharacterRefresher",
+    "CharacterStore",
+    "load_cached_characters",
     "update_characters_ambr",
     "update_characters_any",
     "update_characters_enka",
@@ -23,18 +35,147 @@ __all__ = (
 
 LOGGER_ = logging.getLogger(__name__)
 
-CACHE_FILE = fs.get_tempdir() / "characters.json"
+CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+class CharacterStore:
+    """On-disk store of character names with one shard per language.
+
+    Each shard starts with a line of metadata so its freshness can be checked without parsing it.
+    Shards are replaced atomically, so processes sharing the directory never see a partial file.
+    """
+
+    VERSION: typing.ClassVar[int] = 1
+
+    directory: pathlib.Path
+    max_age: float
+    """Seconds after which a shard is no longer loaded."""
+
+    loaded: set[str]
+    """Languages which have already been loaded."""
+    loaded_all: bool
+
+    def __init__(self, directory: typing.Union[str, pathlib.Path], *, max_age: float = CACHE_MAX_AGE) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_age = max_age
+        self.loaded = set()
+        self.loaded_all = False
+
+    def get_path(self, lang: str) -> pathlib.Path:
+        """Get the path of a language shard."""
+        return self.directory / f"{lang}.json"
+
+    def get_langs(self) -> typing.Sequence[str]:
+        """Get all languages with a shard."""
+        if not self.directory.exists():
+            return []
+
+        return [path.stem for path in self.directory.glob("*.json")]
+
+    def get_metadata(self, lang: str) -> typing.Optional[typing.Mapping[str, typing.Any]]:
+        """Read the metadata of a shard without parsing its data."""
+        try:
+            with self.get_path(lang).open("rb") as file:
+                metadata = json.loads(file.readline())
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(metadata, dict) or metadata.get("version") != self.VERSION:
+            return None
+
+        return metadata
+
+    def get_updated(self, lang: str) -> typing.Optional[float]:
+        """Get the unix time when a shard was last written."""
+        metadata = self.get_metadata(lang)
+        return metadata["updated"] if metadata else None
+
+    def is_fresh(self, lang: str) -> bool:
+        """Check whether a shard exists and is not older than max_age."""
+        updated = self.get_updated(lang)
+        return updated is not None and time.time() - updated < self.max_age
+
+    def read(self, lang: str) -> typing.Optional[dict[int, model_constants.DBChar]]:
+        """Read a fresh shard."""
+        if not self.is_fresh(lang):
+            return None
+
+        try:
+            with self.get_path(lang).open("rb") as file:
+                file.readline()
+                data: typing.Mapping[str, typing.Any] = json.loads(file.read())
+
+            return {int(char_id): model_constants.DBChar(*char) for char_id, char in data.items()}
+        except Exception:
+            warnings.warn(f"Failed to load {lang} character names from cache")
+            return None
+
+    def _write(self, lang: str, chars: typing.Mapping[int, model_constants.DBChar]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        metadata = {"version": self.VERSION, "lang": lang, "updated": time.time()}
+        content = json.dumps(metadata).encode() + b"\n" + json.dumps(chars).encode()
+
+        fd, temp = tempfile.mkstemp(prefix=f".{lang}.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+
+            os.replace(temp, self.get_path(lang))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    async def write(self, lang: str, chars: typing.Mapping[int, model_constants.DBChar]) -> None:
+        """Atomically replace a shard without blocking the event loop."""
+        await asyncio.to_thread(self._write, lang, dict(chars))
+
+    async def write_many(self, langs: typing.Iterable[str]) -> None:
+        """Write the current character names of several languages."""
+        await asyncio.gather(
+            *(
+                self.write(lang, model_constants.CHARACTER_NAMES[lang])
+                for lang in set(langs)
+                if lang in model_constants.CHARACTER_NAMES
+            )
+        )
+
+    def load(self, lang: typing.Optional[str] = None) -> None:
+        """Load the character names of a language, or of all languages, into CHARACTER_NAMES."""
+        if lang is None:
+            if self.loaded_all:
+                return
+
+            self.loaded_all = True
+            langs = self.get_langs()
+        else:
+            langs = [lang]
+
+        for lang in langs:
+            if lang in self.loaded:
+                continue
+
+            self.loaded.add(lang)
+            chars = self.read(lang)
+            if chars is None:
+                continue
+
+            # names added before the first use take priority over the cache
+            chars.update(model_constants.CHARACTER_NAMES.get(lang, {}))
+            model_constants.CHARACTER_NAMES[lang] = chars
+
+
+CHARACTER_STORE = CharacterStore(fs.get_tempdir() / "characters")
+"""Process-wide character store."""
+
+
+def load_cached_characters(lang: typing.Optional[str] = None) -> None:
+    """Load character names from the cache.
+
+    Each language is only read once, the first time its names are needed.
+    """
+    if lang not in CHARACTER_STORE.loaded:
+        CHARACTER_STORE.load(lang)
 
-if CACHE_FILE.exists() and time.time() - CACHE_FILE.stat().st_mtime < 7 * 24 * 60 * 60:
-    names: typing.Mapping[str, typing.Any] = json.loads(CACHE_FILE.read_text())
-    try:
-        model_constants.CHARACTER_NAMES = {
-            lang: {int(char_id): model_constants.DBChar(*char) for char_id, char in chars.items()}
-            for lang, chars in names.items()
-        }
-    except Exception:
-        warnings.warn("Failed to load character names from cache")
-        CACHE_FILE.unlink()
 
 GENSHINDATA_REPO = parse_token("aHR0cHM6Ly9naXRsYWIuY29tL0RpbWJyZWF0aC9BbmltZUdhbWVEYXRhLy0vcmF3L21hc3Rlci8=").decode()
 GENSHINDATA_CHARACTERS_URL = GENSHINDATA_REPO + "ExcelBinOutput/AvatarExcelConfigData.json"
@@ -45,6 +186,12 @@ GENSHINDATA_TEXTMAP_URL = GENSHINDATA_REPO + "TextMap/TextMap{lang}.json"
 ENKA_CHARACTERS_URL = "https://raw.githubusercontent.com/EnkaNetwork/API-docs/master/store/characters.json"
 ENKA_LOC_URL = "https://raw.githubusercontent.com/EnkaNetwork/API-docs/master/store/loc.json"
 
+HTTP_CACHE: httpcache.BaseValidatorCache = httpcache.FileValidatorCache(fs.get_tempdir() / "http")
+"""Cache of downloaded data which is revalidated instead of being downloaded again."""
+
+TEXTMAP_CONCURRENCY = 3
+"""Amount of TextMaps streamed at once."""
+
 AMBR_URL = "https://gi.yatta.moe/api/v2/{lang}/avatar"
 AMBR_VERSION_URL = "https://gi.yatta.moe/api/v2/static/version"
 
@@ -100,14 +247,9 @@ ENKA_LANG_MAP = {
 
 
 async def _fetch_jsons(*urls: str) -> typing.Sequence[typing.Any]:
-    """Fetch multiple JSON endpoints."""
+    """Fetch multiple JSON endpoints, revalidating previously fetched ones."""
     async with aiohttp.ClientSession() as session:
-
-        async def _fetch_and_parse(url: str) -> typing.Any:
-            r = await session.get(url)
-            return await r.json(content_type=None)
-
-        return await asyncio.gather(*(_fetch_and_parse(url) for url in urls))
+        return await asyncio.gather(*(httpcache.conditional_get(session, url, HTTP_CACHE) for url in urls))
 
 
 def update_character_name(
@@ -119,55 +261,117 @@ def update_character_name(
     rarity: int,
 ) -> None:
     """Update the character names for a specific language."""
+    load_cached_characters(lang)
     char = model_constants.DBChar(id, icon_name, name, element, rarity)
     model_constants.CHARACTER_NAMES.setdefault(lang, {})[id] = char
 
 
+_JSON_STRING = r'"((?:[^"\\]|\\.)*)"'
+_JSON_OBJECT_ITEM = re.compile(r"\s*[{,]\s*" + _JSON_STRING + r"\s*:\s*" + _JSON_STRING)
+_JSON_OBJECT_END = re.compile(r"\s*}?\s*")
+
+
+async def _stream_json_strings(
+    response: aiohttp.ClientResponse, keys: typing.Collection[str], chunk_size: int = 64 * 1024
+) -> dict[str, str]:
+    """Pick string values out of a flat JSON object of strings without loading it all into memory."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    found: dict[str, str] = {}
+    buffer = ""
+
+    async for chunk in response.content.iter_chunked(chunk_size):
+        buffer += decoder.decode(chunk)
+
+        pos = 0
+        while match := _JSON_OBJECT_ITEM.match(buffer, pos):
+            pos = match.end()
+            key = match[1]
+            if key in keys:
+                found[key] = json.loads(f'"{match[2]}"')
+
+        buffer = buffer[pos:]
+
+    buffer += decoder.decode(b"", final=True)
+    if not _JSON_OBJECT_END.fullmatch(buffer):
+        raise ValueError(f"Expected a JSON object of strings, got {buffer[:32]!r}")
+
+    return found
+
+
 async def update_characters_genshindata(langs: typing.Sequence[str] = ()) -> None:
     """Update characters with https://github.com/Dimbreath/GenshinData/.
 
-    This method requires the download of >20MB per language so it's not recommended.
+    TextMaps are >20MB per language, they're streamed and only the character names are kept.
+    Unchanged TextMaps are not downloaded again.
     """
     langs = langs or list(LANGS.keys())
-    urls = [GENSHINDATA_TEXTMAP_URL.format(lang=LANG_MAP[lang].upper()) for lang in langs]
 
-    # I love spamming github
-    characters, talent_depot, talents, *textmaps = await _fetch_jsons(
+    characters, talent_depot, talents = await _fetch_jsons(
         GENSHINDATA_CHARACTERS_URL,
         GENSHINDATA_TALENT_DEPOT_URL,
         GENSHINDATA_TALENT_URL,
-        *urls,
     )
 
     talent_depot = {talent["id"]: talent for talent in talent_depot}
     talents = {talent["id"]: talent for talent in talents}
 
+    # (id, icon_name, name hash, element, rarity)
+    entries: list[tuple[int, str, str, str, int]] = []
     for char in characters:
-        for lang, textmap in zip(langs, textmaps):
-            if char["skillDepotId"] == 101 or char["iconName"].endswith("_Kate") or str(char["id"])[:2] == "11":
-                continue  # test character
+        if char["skillDepotId"] == 101 or char["iconName"].endswith("_Kate") or str(char["id"])[:2] == "11":
+            continue  # test character
 
-            if char["candSkillDepotIds"]:
-                raw_element = "Wind"  # traveler
-            else:
-                talent = talent_depot[char["skillDepotId"]]
-                raw_element = talents[talent["energySkill"]]["costElemType"]
+        if char["candSkillDepotIds"]:
+            raw_element = "Wind"  # traveler
+        else:
+            talent = talent_depot[char["skillDepotId"]]
+            raw_element = talents[talent["energySkill"]]["costElemType"]
+
+        entries.append(
+            (
+                char["id"],
+                char["iconName"][len("UI_AvatarIcon_") :],  # noqa: E203
+                str(char["nameTextMapHash"]),
+                ELEMENTS_MAP[raw_element],
+                RARITY_MAP[char["qualityType"]],
+            )
+        )
+
+    hashes = {entry[2] for entry in entries}
+    semaphore = asyncio.Semaphore(TEXTMAP_CONCURRENCY)
+
+    async def update_lang(session: aiohttp.ClientSession, lang: str) -> None:
+        async with semaphore:
+            url = GENSHINDATA_TEXTMAP_URL.format(lang=LANG_MAP[lang].upper())
+            # only the picked names are cached, they're reused while the TextMap is unchanged
+            textmap: dict[str, str] = await httpcache.conditional_get(
+                session,
+                url,
+                HTTP_CACHE,
+                reader=lambda r: _stream_json_strings(r, hashes),
+                usable=lambda names: hashes <= names.keys(),
+            )
 
+        for id, icon_name, name_hash, element, rarity in entries:
             update_character_name(
                 lang=lang,
-                id=char["id"],
-                icon_name=char["iconName"][len("UI_AvatarIcon_") :],  # noqa: E203
-                name=textmap[str(char["nameTextMapHash"])],
-                element=ELEMENTS_MAP[raw_element],
-                rarity=RARITY_MAP[char["qualityType"]],
+                id=id,
+                icon_name=icon_name,
+                name=textmap[name_hash],
+                element=element,
+                rarity=rarity,
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(update_lang(session, lang) for lang in langs))
+
+    await CHARACTER_STORE.write_many(langs)
 
 
 async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
     """Update characters with https://github.com/EnkaNetwork/API-docs/."""
     characters, locs = await _fetch_jsons(ENKA_CHARACTERS_URL, ENKA_LOC_URL)
+    updated: set[str] = set()
 
     for strid, char in characters.items():
         if "-" in strid:
@@ -176,6 +380,7 @@ async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
         for short_lang, loc in locs.items():
             if (lang := ENKA_LANG_MAP.get(short_lang)) is None:
                 continue
+            updated.add(lang)
             update_character_name(
                 lang=lang,
                 id=int(strid),
@@ -185,7 +390,7 @@ async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
                 rarity=RARITY_MAP[char["QualityType"]],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    await CHARACTER_STORE.write_many(updated)
 
 
 async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
@@ -210,7 +415,7 @@ async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
                 rarity=char["rank"],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    await CHARACTER_STORE.write_many(langs)
 
 
 async def update_characters_any(
@@ -227,6 +432,8 @@ async def update_characters_any(
     if isinstance(langs, str):
         langs = [langs]
     if lenient:
+        for lang in langs:
+            load_cached_characters(lang)
         langs = [lang for lang in langs if not model_constants.CHARACTER_NAMES.get(lang)]
         if len(langs) == 0:
             return
@@ -247,3 +454,95 @@ async def update_characters_any(
             return
 
     raise Exception("Failed to update characters, all functions raised an error.")
+
+
+class CharacterRefresher:
+    """Keeps character names of each language up to date.
+
+    There is at most one update in flight per language. Once a language is loaded, checking it is
+    a single dict lookup until the ttl runs out, after which it's refreshed in the background
+    while the current names keep being used.
+    """
+
+    ttl: float
+    """Seconds until loaded names are refreshed."""
+    retry_interval: float
+    """Seconds until a failed refresh of loaded names is retried."""
+
+    _fresh_until: dict[str, float]
+    _inflight: concurrency.SingleFlight
+    _refreshing: dict[str, asyncio.Future[None]]
+
+    def __init__(self, ttl: float = 24 * 60 * 60, retry_interval: float = 5 * 60) -> None:
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+
+        self._fresh_until = {}
+        self._inflight = concurrency.SingleFlight()
+        self._refreshing = {}
+
+    async def _refresh(self, lang: str) -> None:
+        try:
+            await update_characters_any(lang)
+        except Exception:
+            if model_constants.CHARACTER_NAMES.get(lang):
+                self._fresh_until[lang] = time.monotonic() + self.retry_interval
+            raise
+
+        self._fresh_until[lang] = time.monotonic() + self.ttl
+
+    def _forget(self, lang: str, future: asyncio.Future[None]) -> None:
+        if self._refreshing.get(lang) is future:
+            del self._refreshing[lang]
+
+        if not future.cancelled():
+            future.exception()  # errors are raised to the waiting callers or logged
+
+    def refresh(self, lang: str) -> asyncio.Future[None]:
+        """Start refreshing a language unless it's already being refreshed."""
+        loop = asyncio.get_running_loop()
+        future = self._refreshing.get(lang)
+        if future is not None and future.get_loop() is loop:
+            return future
+
+        future = asyncio.shield(self._inflight.start((loop, lang), lambda: self._refresh(lang)))
+        self._refreshing[lang] = future
+        future.add_done_callback(functools.partial(self._forget, lang))
+        return future
+
+    def ensure(self, lang: str) -> typing.Optional[asyncio.Future[None]]:
+        """Make sure the names of a language are loaded.
+
+        Returns a future to await if there are no names yet.
+        """
+        if self._fresh_until.get(lang, 0) > time.monotonic():
+            return None
+
+        refreshing = self._refreshing.get(lang)
+        if refreshing is not None and refreshing.get_loop() is asyncio.get_running_loop():
+            # only wait if there are no names to serve in the meantime
+            return None if model_constants.CHARACTER_NAMES.get(lang) else refreshing
+
+        load_cached_characters(lang)
+        if not model_constants.CHARACTER_NAMES.get(lang):
+            return self.refresh(lang)
+
+        if lang not in self._fresh_until:
+            # loaded from the store or set by the user
+            updated = CHARACTER_STORE.get_updated(lang) or time.time()
+            self._fresh_until[lang] = time.monotonic() + self.ttl - (time.time() - updated)
+            if self._fresh_until[lang] > time.monotonic():
+                return None
+
+        # stale, keep serving the current names
+        self.refresh(lang).add_done_callback(_log_refresh_error)
+        return None
+
+
+def _log_refresh_error(future: asyncio.Future[None]) -> None:
+    if not future.cancelled() and (e := future.exception()):
+        LOGGER_.warning("Failed to refresh characters: %r", e)
+
+
+CHARACTER_REFRESHER = CharacterRefresher()
+"""Process-wide character refresher."""
@@ -0,0 +1,168 @@
+"""Conditional requests for static data."""
+
+import abc
+import asyncio
+import collections
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import typing
+
+import aiohttp
+import aiohttp.typedefs
+
+__all__ = ("BaseValidatorCache", "CachedResponse", "FileValidatorCache", "ValidatorCache", "conditional_get")
+
+ReaderT = typing.Callable[[aiohttp.ClientResponse], typing.Awaitable[typing.Any]]
+
+
+class CachedResponse(typing.NamedTuple):
+    """Validators of a response along with its parsed body."""
+
+    etag: typing.Optional[str]
+    last_modified: typing.Optional[str]
+    body: typing.Any
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Headers making a request conditional on the response having changed."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class BaseValidatorCache(abc.ABC):
+    """Base cache of responses which can be revalidated."""
+
+    @abc.abstractmethod
+    async def get(self, url: str) -> typing.Optional[CachedResponse]:
+        """Get a cached response."""
+
+    @abc.abstractmethod
+    async def set(self, url: str, response: CachedResponse) -> None:
+        """Cache a response."""
+
+
+class ValidatorCache(BaseValidatorCache):
+    """In-memory LRU cache of responses which can be revalidated."""
+
+    maxsize: int
+    _cache: collections.OrderedDict[str, CachedResponse]
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._cache = collections.OrderedDict()
+
+    async def get(self, url: str) -> typing.Optional[CachedResponse]:
+        """Get a cached response."""
+        if url not in self._cache:
+            return None
+
+        self._cache.move_to_end(url)
+        return self._cache[url]
+
+    async def set(self, url: str, response: CachedResponse) -> None:
+        """Cache a response."""
+        self._cache[url] = response
+        self._cache.move_to_end(url)
+
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+
+class FileValidatorCache(BaseValidatorCache):
+    """On-disk cache of responses which can be revalidated, shared between processes.
+
+    Files are replaced atomically, a torn or unreadable file is treated as a miss.
+    """
+
+    directory: pathlib.Path
+
+    def __init__(self, directory: typing.Union[str, pathlib.Path]) -> None:
+        self.directory = pathlib.Path(directory)
+
+    def get_path(self, url: str) -> pathlib.Path:
+        """Get the path of a cached response."""
+        return self.directory / (hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _read(self, url: str) -> typing.Optional[CachedResponse]:
+        try:
+            with self.get_path(url).open("rb") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("url") != url:
+            return None
+
+        return CachedResponse(data.get("etag"), data.get("last_modified"), data.get("body"))
+
+    def _write(self, url: str, response: CachedResponse) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(dict(url=url, **response._asdict())).encode()
+
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+
+            os.replace(temp, self.get_path(url))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    async def get(self, url: str) -> typing.Optional[CachedResponse]:
+        """Read a cached response without blocking the event loop."""
+        return await asyncio.to_thread(self._read, url)
+
+    async def set(self, url: str, response: CachedResponse) -> None:
+        """Atomically write a cached response without blocking the event loop."""
+        await asyncio.to_thread(self._write, url, response)
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> typing.Any:
+    return await response.json(content_type=None)
+
+
+async def conditional_get(
+    session: aiohttp.ClientSession,
+    url: aiohttp.typedefs.StrOrURL,
+    cache: BaseValidatorCache,
+    *,
+    reader: ReaderT = _read_json,
+    usable: typing.Optional[typing.Callable[[typing.Any], bool]] = None,
+    headers: typing.Optional[typing.Mapping[str, str]] = None,
+    **kwargs: typing.Any,
+) -> typing.Any:
+    """Make a GET request which reuses the cached body if the server responds with 304 Not Modified.
+
+    The reader parses the response, its result is what gets cached. A cached body for which usable
+    returns False is not revalidated and gets replaced.
+    """
+    key = str(url)
+    cached = await cache.get(key)
+    if cached is not None and usable is not None and not usable(cached.body):
+        cached = None
+
+    headers = dict(headers or {})
+    if cached is not None:
+        headers.update(cached.headers)
+
+    async with session.get(url, headers=headers, **kwargs) as r:
+        if r.status == 304 and cached is not None:
+            return cached.body
+
+        r.raise_for_status()
+        body = await reader(r)
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+    if etag or last_modified:
+        await cache.set(key, CachedResponse(etag, last_modified, body))
+
+    return body
@@ -0,0 +1,76 @@
+import datetime
+import pathlib
+import typing
+
+import pytest
+
+import genshin
+
+
+def make_wishes(ids: typing.Iterable[int], banner_type: int = 301) -> list[genshin.models.Wish]:
+    start = datetime.datetime(2023, 1, 1)
+    data = [
+        {
+            "uid": "710785423",
+            "id": str(i),
+            "item_id": "",
+            "count": "1",
+            "time": str(start + datetime.timedelta(minutes=i)),
+            "name": f"Item {i}",
+            "lang": "en-us",
+            "item_type": "Weapon",
+            "rank_type": "3",
+        }
+        for i in ids
+    ]
+    return genshin.models.Wish.parse_many(data, banner_type=banner_type, tz_offset=-13)
+
+
+@pytest.fixture(name="history")
+def history_fixture(
+    monkeypatch: pytest.MonkeyPatch,
+) -> tuple[genshin.Client, dict[int, list[genshin.models.Wish]], list[int]]:
+    client = genshin.Client()
+    history = {301: make_wishes(range(50, 0, -1)), 200: make_wishes(range(100, 90, -1), banner_type=200)}
+    requests: list[int] = []
+
+    async def get_wish_page(end_id: int, banner_type: int, **kwargs: typing.Any) -> list[genshin.models.Wish]:
+        requests.append(banner_type)
+        wishes = [wish for wish in history[banner_type] if not end_id or wish.id < end_id]
+        return wishes[:20]
+
+    monkeypatch.setattr(client, "_get_wish_page", get_wish_page)
+    return client, history, requests
+
+
+@pytest.mark.parametrize("archive_type", ["memory", "sqlite"])
+async def test_sync_wish_history(
+    history: tuple[genshin.Client, dict[int, list[genshin.models.Wish]], list[int]],
+    archive_type: str,
+    tmp_path: pathlib.Path,
+):
+    client, banners, requests = history
+    if archive_type == "memory":
+        archive = genshin.GachaArchive()
+    else:
+        archive = genshin.SQLiteGachaArchive(db_name=str(tmp_path / "gacha.db"))
+
+    wishes = await client.sync_wish_history(archive, [301, 200])
+    assert sorted(requests) == [200] + [301] * 3
+    assert wishes == sorted(banners[301] + banners[200], key=lambda wish: wish.time, reverse=True)
+
+    banners[301] = make_wishes(range(55, 50, -1)) + banners[301]
+    requests.clear()
+
+    wishes = await client.sync_wish_history(archive, [301, 200])
+    assert requests == [301, 200]
+    assert [wish.id for wish in wishes] == [*range(100, 90, -1), *range(55, 0, -1)]
+    assert wishes[0].time.utcoffset() == datetime.timedelta(hours=-5)
+
+    if isinstance(archive, genshin.SQLiteGachaArchive):
+        await archive.close()
+
+        archive = genshin.SQLiteGachaArchive(db_name=str(tmp_path / "gacha.db"))
+        since = banners[301][0].time
+        assert await archive.get(genshin.Game.GENSHIN, 710785423, [301], since=since) == banners[301][:1]
+        await archive.close()
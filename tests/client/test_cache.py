@@ -0,0 +1,199 @@
+import dataclasses
+import sqlite3
+import time
+import typing
+
+import pytest
+
+import genshin
+from genshin.client import cache as client_cache
+
+
+async def test_cache_lru_eviction():
+    cache = genshin.Cache(maxsize=3)
+
+    for key in "abc":
+        await cache.set(key, key.upper())
+
+    assert await cache.get("a") == "A"
+    await cache.set("d", "D")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    assert list(cache.cache) == ["c", "d", "a"]
+
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+
+async def test_cache_expiration():
+    cache = genshin.Cache(ttl=-1, static_ttl=60)
+
+    await cache.set("dynamic", 1)
+    await cache.set_static("static", 2)
+
+    assert await cache.get("dynamic") is None
+    assert await cache.get_static("static") == 2
+    assert len(cache) == 1
+
+
+async def test_static_cache():
+    cache = genshin.StaticCache()
+
+    await cache.set("dynamic", 1)
+    await cache.set_static("static", 2)
+
+    assert await cache.get("dynamic") is None
+    assert await cache.get("static") == 2
+
+
+async def test_sqlite_cache(tmp_path):
+    cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"), ttl=60)
+
+    await cache.set("a", {"value": 1})
+    await cache.set_many({"b": [2], "c": None})
+
+    assert await cache.get("a") == {"value": 1}
+    assert await cache.get_many(["c", "missing", "b"]) == [None, None, [2]]
+
+    await cache.close()
+
+    cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"), ttl=60)
+    assert await cache.get("a") == {"value": 1}
+    async with cache.conn.execute("PRAGMA journal_mode") as cursor:  # type: ignore
+        assert (await cursor.fetchone())[0] == "wal"  # type: ignore
+
+    await cache.close()
+
+
+async def test_sqlite_cache_setup_retry(tmp_path):
+    cache = genshin.SQLiteCache(db_name=str(tmp_path / "missing" / "cache.db"))
+
+    with pytest.raises(sqlite3.OperationalError):
+        await cache.get("a")
+
+    (tmp_path / "missing").mkdir()
+    assert await cache.get("a") is None
+
+    await cache.close()
+
+
+async def test_cache_bulk():
+    cache = genshin.Cache()
+
+    await cache.set_many({"a": 1, "b": 2})
+    await cache.set_many({"c": 3}, static=True)
+    assert await cache.get_many(["a", "b", "c", "d"]) == [1, 2, 3, None]
+
+    await cache.delete_many(["a", "c"])
+    assert await cache.get_many(["a", "b", "c"]) == [None, 2, None]
+
+
+def test_compressed_serializer():
+    serializer = genshin.CompressedSerializer(threshold=64)
+    small = {"retcode": 0}
+    large = {"list": [{"id": i, "name": "Character"} for i in range(100)]}
+
+    for value in (small, large):
+        data = serializer.dumps(value)
+        assert serializer.loads(data) == value
+
+    assert len(serializer.dumps(large)) < len(genshin.JSONSerializer().dumps(large))
+    assert serializer.loads(genshin.JSONSerializer().dumps(large)) == large
+
+
+def test_cache_key():
+    family = client_cache.CacheKeyFamily("lineup", "endpoint", "lang")
+    key = family("detail", lang=None)
+
+    assert str(key) == "lineup:detail:null"
+    assert key == client_cache.cache_key("lineup", endpoint="detail", lang=None)
+    assert hash(key) == hash(str(key))
+    assert key.endpoint == "detail"
+
+    assert client_cache.cache_key("a", b=1).family is client_cache.cache_key("a", b=2).family
+    assert genshin.RedisCache(None).serialize_key(key) is str(key)  # type: ignore
+
+    with pytest.raises(ValueError, match="values"):
+        client_cache.CacheKeyFamily("a", "values")
+
+
+def test_cache_key_matches_dataclass_keys():
+    # keys used to be dataclasses stringified field by field
+    @dataclasses.dataclass(eq=False)
+    class WikiCacheKey:
+        key: str
+        endpoint: str
+        id: int
+        lang: str
+
+        def __str__(self) -> str:
+            return client_cache._separate(getattr(self, field.name) for field in dataclasses.fields(self))
+
+    family = client_cache.CacheKeyFamily("wiki", "endpoint", "id", "lang")
+    old = WikiCacheKey("wiki", "page", 1, "en-us")
+    new = family("page", 1, "en-us")
+
+    assert str(new) == str(old)
+    assert hash(new) == hash(str(old))
+    assert (new.key, new.endpoint, new.id, new.lang) == (old.key, old.endpoint, old.id, old.lang)
+    assert type(new) is type(family("page", 2, "en-us"))
+    assert str(new) is str(new)
+
+
+async def test_custom_cache_without_delete():
+    class DictCache(client_cache.BaseCache):
+        def __init__(self) -> None:
+            self.data: dict[typing.Any, typing.Any] = {}
+
+        async def get(self, key: typing.Any) -> typing.Any:
+            return self.data.get(key)
+
+        async def set(self, key: typing.Any, value: typing.Any) -> None:
+            self.data[key] = value
+
+        async def get_static(self, key: typing.Any) -> typing.Any:
+            return await self.get(key)
+
+        async def set_static(self, key: typing.Any, value: typing.Any) -> None:
+            await self.set(key, value)
+
+    cache = DictCache()
+    await cache.set_many({"a": 1, "b": 2}, static=True)
+    assert await cache.get_many(["a", "b", "c"], static=True) == [1, 2, None]
+
+    with pytest.raises(NotImplementedError, match="DictCache does not support deleting"):
+        await cache.delete_many(["a"])
+
+
+@pytest.mark.parametrize("custom_cache", [False, True])
+async def test_banner_details_bulk_cache(monkeypatch: pytest.MonkeyPatch, custom_cache: bool):
+    client = genshin.Client(game=genshin.Game.GENSHIN)
+    if custom_cache:
+        client.set_cache()
+
+    requested: list[str] = []
+
+    async def request_banner_details(banner_id: str, **kwargs: typing.Any) -> dict[str, typing.Any]:
+        requested.append(banner_id)
+        return {
+            "gacha_type": 301,
+            "title": banner_id,
+            "content": "",
+            "date_range": "",
+            **dict.fromkeys(["r5_up_prob", "r4_up_prob", "r5_prob", "r4_prob", "r3_prob"]),
+            **dict.fromkeys(["r5_baodi_prob", "r4_baodi_prob", "r3_baodi_prob"]),
+            **dict.fromkeys(["r5_up_items", "r4_up_items", "r5_prob_list", "r4_prob_list", "r3_prob_list"], []),
+        }
+
+    monkeypatch.setattr(client, "_request_banner_details", request_banner_details)
+
+    await client.get_banner_details(["a", "b"])
+    banners = await client.get_banner_details(["a", "b", "c"])
+
+    assert [banner.title for banner in banners] == ["a", "b", "c"]
+    assert requested == ["a", "b", "c"]
+
+    # banner details are static resources
+    assert isinstance(client.cache, client_cache.Cache)
+    assert len(client.cache) == 3
+    assert all(expiration > time.time() + client.cache.ttl for expiration, _ in client.cache.cache.values())
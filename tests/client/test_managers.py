@@ -0,0 +1,120 @@
+import asyncio
+
+import yarl
+
+import genshin
+from genshin.client.manager import managers
+
+
+def make_cookies(amount: int) -> list[dict[str, str]]:
+    return [{"ltuid": str(i), "ltoken": "x"} for i in range(1, amount + 1)]
+
+
+def test_cookie_sequence_distinct_picks():
+    sequence = managers.CookieSequence(make_cookies(5))
+
+    states = [sequence.acquire() for _ in range(5)]
+    assert len({state.account_id for state in states if state}) == 5
+
+    for state in states:
+        assert state
+        sequence.release(state, success=True)
+
+    state = sequence.acquire()
+    assert state and state.in_use == 1 and state.uses == 1
+
+
+def test_cookie_sequence_exhaustion():
+    sequence = managers.CookieSequence(make_cookies(2))
+
+    for _ in range(2):
+        state = sequence.acquire()
+        assert state
+        sequence.mark_exhausted(state)
+        sequence.release(state)
+
+    assert sequence.acquire() is None
+
+    sequence._reset_exhausted(managers.get_next_daily_reset())
+    assert sequence.acquire() is not None
+
+
+def test_cookie_sequence_daily_reset():
+    sequence = managers.CookieSequence(make_cookies(2))
+
+    state = sequence.acquire()
+    assert state
+    sequence.release(state, success=True)
+    assert sequence.cookies is sequence.cookies
+    assert sequence.cookies[-1]["ltuid"] == state.account_id
+
+    # uses are zeroed after the reset even for cookies which never got exhausted
+    sequence._reset_daily(state.reset_at)
+    assert state.uses == 0
+    assert sequence._heap[0][1] == 0
+
+    # the next reset is derived from the given time
+    now = state.reset_at + 3 * 86400 + 1
+    state.uses = 5
+    sequence._reset_daily(now)
+    assert state.uses == 0
+    assert state.reset_at == managers.get_next_daily_reset(now) == sequence._reset_at
+    assert managers.CookieSequence.MAX_USES == 30
+
+
+def test_next_daily_reset():
+    # 2024-01-01 15:59:59 UTC is 23:59:59 in UTC+8
+    assert managers.get_next_daily_reset(1704124799) == 1704124800
+    assert managers.get_next_daily_reset(1704124800) == 1704124800 + 86400
+
+
+async def test_rotating_cookie_manager():
+    manager = genshin.RotatingCookieManager(make_cookies(3))
+    used: list[str] = []
+
+    async def _request(method: str, url: str, cookies: dict[str, str], **kwargs: object) -> str:
+        used.append(cookies["ltuid"])
+        if cookies["ltuid"] == "1":
+            raise genshin.errors.TooManyRequests({"retcode": 10101})
+
+        await asyncio.sleep(0.01)
+        return cookies["ltuid"]
+
+    manager._request = _request  # type: ignore
+
+    results = await asyncio.gather(*(manager.request("https://example.com") for _ in range(2)))
+    assert sorted(results) == ["2", "3"]
+    assert used.count("1") == 1
+
+
+def test_guess_host_region():
+    assert managers.guess_host_region("bbs-api-os.hoyolab.com") == genshin.Region.OVERSEAS
+    assert managers.guess_host_region("api-takumi-record.mihoyo.com") == genshin.Region.CHINESE
+    assert managers.guess_host_region("api-os-takumi.mihoyo.com") == genshin.Region.OVERSEAS
+    assert managers.guess_host_region("unknown-sg.example.com") == genshin.Region.OVERSEAS
+
+
+def test_guess_region_path_fallback():
+    manager = genshin.InternationalCookieManager()
+
+    assert manager.guess_region(yarl.URL("https://api.example.com/event/os/info")) == genshin.Region.OVERSEAS
+    assert manager.guess_region(yarl.URL("https://api.example.com/event/info")) == genshin.Region.CHINESE
+    url = yarl.URL("https://api-takumi-record.mihoyo.com/game_record/app/os/index")
+    assert manager.guess_region(url) == genshin.Region.CHINESE
+
+
+async def test_international_cookie_manager():
+    manager = genshin.InternationalCookieManager(
+        {
+            genshin.Region.OVERSEAS: make_cookies(2),
+            genshin.Region.CHINESE: [{"ltuid": "100", "ltoken": "x"}],
+        }
+    )
+
+    async def _request(method: str, url: str, cookies: dict[str, str], **kwargs: object) -> str:
+        return cookies["ltuid"]
+
+    manager._request = _request  # type: ignore
+
+    assert await manager.request("https://api-takumi-record.mihoyo.com/game_record/app") == "100"
+    assert await manager.request("https://bbs-api-os.hoyolab.com/game_record/app") in ("1", "2")
@@ -0,0 +1,76 @@
+import time
+import typing
+
+import pytest
+import yarl
+
+import genshin
+from genshin.client import ratelimit
+
+
+async def test_token_bucket():
+    bucket = ratelimit.TokenBucket(rate=100, capacity=2)
+
+    start = time.perf_counter()
+    waits = [await bucket.acquire() for _ in range(6)]
+
+    assert waits[:2] == [0, 0]
+    assert all(wait > 0 for wait in waits[2:])
+    assert time.perf_counter() - start >= 0.03
+
+
+def test_endpoint_family():
+    game_record = "https://bbs-api-os.hoyolab.com/game_record/genshin/api/index"
+    gacha = "https://public-operation-hk4e-sg.hoyoverse.com/gacha_info/api/getGachaLog"
+
+    limiter = ratelimit.RateLimiter()
+    assert ratelimit.get_endpoint_family(yarl.URL(game_record)) == "game_record"
+    assert limiter.get_bucket(gacha) is not limiter.get_bucket(game_record)
+    assert limiter.get_bucket(gacha).rate == limiter.rates["gacha"]
+
+
+def test_parse_retry_after():
+    assert ratelimit.parse_retry_after("1.5") == 1.5
+    assert ratelimit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert ratelimit.parse_retry_after("soon") is None
+
+
+async def test_handle_ratelimits_backoff():
+    calls = 0
+
+    @ratelimit.handle_ratelimits(tries=3, delay=0.01)
+    async def request(succeed_after: int) -> str:
+        nonlocal calls
+        calls += 1
+        if calls <= succeed_after:
+            raise genshin.errors.VisitsTooFrequently
+
+        return "ok"
+
+    assert await request(2) == "ok"
+
+    calls = 0
+    with pytest.raises(genshin.errors.VisitsTooFrequently):
+        await request(3)
+
+
+async def test_retry_ratelimited_limiter(monkeypatch: pytest.MonkeyPatch):
+    manager = genshin.CookieManager({"ltuid": "1", "ltoken": "x"})
+    manager.ratelimiter = ratelimit.RateLimiter()
+    calls = 0
+
+    async def send_request(*args: typing.Any, **kwargs: typing.Any) -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            error = genshin.errors.VisitsTooFrequently()
+            error.retry_after = 0.01
+            raise error
+
+        return "ok"
+
+    monkeypatch.setattr(manager, "_send_request", send_request)
+
+    assert await manager.request("https://example.com") == "ok"
+    assert manager.ratelimiter.retries == 2
+    assert manager.ratelimiter.backoff_time >= 0.02
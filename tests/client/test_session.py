@@ -0,0 +1,112 @@
+import asyncio
+
+import aiohttp.test_utils
+import aiohttp.web
+import pytest
+
+import genshin
+
+REQUESTS = 200
+
+
+@pytest.fixture(name="server")
+async def server_fixture():
+    peers: set[object] = set()
+
+    async def handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        assert request.transport is not None
+        peers.add(request.transport.get_extra_info("peername"))
+        return aiohttp.web.json_response({"retcode": 0, "message": "OK", "data": {"ok": True}})
+
+    async def slow_handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        server.hits += 1  # type: ignore
+        await asyncio.sleep(0.05)
+        return aiohttp.web.json_response({"retcode": 0, "message": "OK", "data": {"hits": server.hits}})  # type: ignore
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/", handler)
+    app.router.add_get("/slow", slow_handler)
+
+    server = aiohttp.test_utils.TestServer(app)
+    await server.start_server()
+    server.peers = peers  # type: ignore
+    server.hits = 0  # type: ignore
+
+    yield server
+
+    await server.close()
+
+
+async def test_session_is_reused(server: aiohttp.test_utils.TestServer):
+    manager = genshin.CookieManager({"ltuid": "1", "ltoken": "x"})
+
+    for _ in range(10):
+        assert await manager.request(server.make_url("/")) == {"ok": True}
+
+    session = manager.get_session()
+    assert len(server.peers) == 1  # type: ignore
+
+    await manager.close()
+    assert session.closed
+
+
+async def test_session_inherited_by_new_cookies(server: aiohttp.test_utils.TestServer):
+    async with genshin.Client({"ltuid": "1", "ltoken": "x"}) as client:
+        client.cookie_manager.configure_pool(limit_per_host=4)
+        session = client.cookie_manager.get_session()
+
+        client.set_cookies({"ltuid": "2", "ltoken": "y"})
+        assert client.cookie_manager.get_session() is session
+        assert client.cookie_manager.connection_limit_per_host == 4
+
+    assert session.closed
+
+
+async def test_pooled_session_connections(server: aiohttp.test_utils.TestServer):
+    url = server.make_url("/")
+    cookies = {"ltuid": "1", "ltoken": "x"}
+
+    class UnpooledCookieManager(genshin.CookieManager):
+        async def request(self, url, *, method="GET", **kwargs):  # type: ignore
+            async with self.create_session() as session:
+                async with session.request(method, url, cookies=self.cookies, **kwargs) as response:
+                    return (await response.json())["data"]
+
+    await asyncio.gather(*(UnpooledCookieManager(cookies).request(url) for _ in range(REQUESTS)))
+    unpooled_peers = len(server.peers)  # type: ignore
+    server.peers.clear()  # type: ignore
+
+    pooled_manager = genshin.CookieManager(cookies)
+    await asyncio.gather(*(pooled_manager.request(url) for _ in range(REQUESTS)))
+    await pooled_manager.close()
+
+    assert len(server.peers) <= pooled_manager.connection_limit < unpooled_peers  # type: ignore
+
+
+def test_session_closed_after_loop_stopped():
+    manager = genshin.CookieManager({"ltuid": "1", "ltoken": "x"})
+    loop = asyncio.new_event_loop()
+
+    async def get_session() -> aiohttp.ClientSession:
+        return manager.get_session()
+
+    session = loop.run_until_complete(get_session())
+    manager.configure_pool(limit=10)
+    loop.close()
+
+    assert session.closed
+
+
+async def test_request_coalescing(server: aiohttp.test_utils.TestServer):
+    async with genshin.Client({"ltuid": "1", "ltoken": "x"}) as client:
+        url = server.make_url("/slow")
+        key = genshin.client.cache.cache_key("slow", uid=1)
+
+        results = await asyncio.gather(*(client.request(url, cache=key) for _ in range(10)))
+        assert results == [{"hits": 1}] * 10
+
+        results = await asyncio.gather(*(client.request(url, params={"a": 1}) for _ in range(10)))
+        assert results == [{"hits": 2}] * 10
+
+        assert server.hits == 2  # type: ignore
+        assert client.coalesced_requests == 18
@@ -0,0 +1,52 @@
+import pathlib
+
+import pytest
+
+from genshin.models.genshin import character, constants
+from genshin.utility import extdb
+
+AYAKA = constants.DBChar(10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)
+JEAN = constants.DBChar(10000003, "Qin", "Jean", "Anemo", 5)
+
+
+@pytest.fixture(name="db", autouse=True)
+def db_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> constants.CharacterDatabase:
+    db = constants.CharacterDatabase({"en-us": {AYAKA.id: AYAKA}})
+    monkeypatch.setattr(constants, "CHARACTER_NAMES", db)
+    monkeypatch.setattr(extdb, "CHARACTER_STORE", extdb.CharacterStore(tmp_path))
+    return db
+
+
+def test_character_lookups(db: constants.CharacterDatabase):
+    db["en-us"][JEAN.id] = JEAN
+
+    assert character._get_db_char(name="Jean", lang="en-us") == JEAN
+    assert character._get_db_char(icon="https://genshin/UI_AvatarIcon_Side_Qin.png", lang="en-us") == JEAN
+    assert character._parse_icon(JEAN.id) == "Qin"
+    assert character._parse_icon(JEAN.id, lang="en-us") == "Qin"
+
+    with pytest.raises(ValueError, match="Invalid character id 1"):
+        character._parse_icon(1, lang="en-us")
+
+
+def test_character_guessed(db: constants.CharacterDatabase):
+    icon = "https://genshin/UI_AvatarIcon_Side_Nilou.png"
+    guessed = character._get_db_char(10000070, "Nilou", icon, "Hydro", 5, lang="en-us")
+
+    assert guessed.guessed
+    assert db["en-us"].get_by_icon("Nilou") == guessed
+    assert character._parse_icon(10000070) == "Nilou"
+
+
+def test_character_index_consistency(db: constants.CharacterDatabase):
+    db.setdefault("ja-jp", {})[AYAKA.id] = AYAKA._replace(name="神里綾華")
+    db["en-us"][AYAKA.id] = AYAKA._replace(name="Ayaka")
+
+    assert db["en-us"].get_by_name("Kamisato Ayaka") is None
+    assert db["en-us"].get_by_name("Ayaka") is not None
+    assert db["ja-jp"].get_by_name("神里綾華") is not None
+
+    del db["en-us"]
+    assert db.get_icon_name(AYAKA.id) == "Ayaka"
+    db.clear()
+    assert db.get_icon_name(AYAKA.id) is None
@@ -0,0 +1,77 @@
+import typing
+
+import pytest
+
+import genshin
+
+STANDARD = {"Diluc", "Jean"}
+
+
+def make_wishes(pulls: typing.Sequence[tuple[int, str]], banner_type: int = 301) -> list[genshin.models.Wish]:
+    data = [
+        {
+            "uid": "710785423",
+            "id": str(i + 1),
+            "time": f"2023-01-{i // 100 + 1:02} 12:00:00",
+            "name": name,
+            "item_type": "Character",
+            "rank_type": str(rarity),
+        }
+        for i, (rarity, name) in enumerate(pulls)
+    ]
+    return genshin.models.Wish.parse_many(data[::-1], banner_type=banner_type, tz_offset=0)
+
+
+# 5* at pull 10 (won), 30 (lost), 40 (guaranteed), 45 (won), then 10 more pulls
+PULLS = [(5, "Ayaka") if i == 9 else (5, "Diluc") if i == 29 else (5, "Nahida") if i in (39, 44) else (3, "Slingshot") for i in range(55)]  # fmt: skip # noqa: E501
+
+
+@pytest.fixture(params=["python", "numpy"], name="backend")
+def backend_fixture(request: pytest.FixtureRequest) -> str:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+
+    return request.param
+
+
+def test_gacha_table(backend: typing.Any):
+    wishes = make_wishes(PULLS) + make_wishes([(4, "Xiangling")] * 3, banner_type=200)
+    table = genshin.models.GachaTable(wishes, backend=backend)
+
+    assert len(table) == 58
+    assert table.names == ["Slingshot", "Nahida", "Diluc", "Ayaka", "Xiangling"]
+    assert table[0] == (wishes[0].id, 0, "Slingshot", 3, 301, wishes[0].time)
+
+    assert table.pity() == {200: 3, 301: 10}
+    assert table.pity(4) == {200: 0, 301: 10}
+    assert table.pity_counts() == {200: [], 301: [10, 20, 10, 5]}
+    assert table.fifty_fifty(STANDARD, [301]) == {301: [True, False, True]}
+    assert table.streaks(STANDARD) == {200: [], 301: [(True, 1), (False, 1), (True, 1)]}
+    assert table.rarity_rates([301]) == {3: 51 / 55, 5: 4 / 55}
+    assert table.pull_counts() == {1672531200: 58}
+
+
+def test_gacha_table_nbytes(backend: typing.Any):
+    table = genshin.models.GachaTable(backend=backend)
+    for _ in range(10):
+        table.extend(make_wishes(PULLS * 20))
+
+    assert len(table) == 11000
+    assert 0 < table.nbytes <= 32 * len(table)
+
+
+def test_gacha_table_backend_parity():
+    pytest.importorskip("numpy")
+
+    wishes = make_wishes(PULLS * 20) + make_wishes([(4, "Xiangling"), (3, "Slingshot")] * 30, banner_type=200)
+    python = genshin.models.GachaTable(wishes, backend="python")
+    numpy = genshin.models.GachaTable(wishes, backend="numpy")
+
+    for rarity in (4, 5):
+        assert numpy.pity(rarity) == python.pity(rarity)
+        assert numpy.pity_counts(rarity) == python.pity_counts(rarity)
+
+    assert numpy.fifty_fifty(STANDARD) == python.fifty_fifty(STANDARD)
+    assert numpy.streaks(STANDARD) == python.streaks(STANDARD)
+    assert numpy.rarity_rates() == python.rarity_rates()
+    assert numpy.pull_counts() == python.pull_counts()
@@ -0,0 +1,35 @@
+import typing
+
+import genshin
+
+WISHES: list[dict[str, typing.Any]] = [
+    {
+        "uid": "710785423",
+        "gacha_type": "301",
+        "item_id": "",
+        "count": "1",
+        "time": "2023-01-01 12:00:00",
+        "name": "Kamisato Ayaka",
+        "lang": "en-us",
+        "item_type": "Character",
+        "rank_type": "5",
+        "id": str(1672545600000000000 + i),
+    }
+    for i in range(100)
+]
+
+
+def test_parse_many():
+    wishes = genshin.models.Wish.parse_many(WISHES[:20], banner_type=301, tz_offset=-13)
+    expected = [genshin.models.Wish(**i, banner_type=301, tz_offset=-13) for i in WISHES[:20]]
+
+    assert wishes == expected
+    assert wishes[0].time.utcoffset().total_seconds() == -5 * 3600  # type: ignore
+    assert "banner_type" not in WISHES[0]
+
+
+def test_parse_many_iterable():
+    data = ({**i, "banner_type": 301, "tz_offset": 0} for i in WISHES)
+    expected = [genshin.models.Wish(**i, banner_type=301, tz_offset=0) for i in WISHES]
+
+    assert genshin.models.Wish.parse_many(data) == expected
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout  # noqa: S603
+
+
+def test_lazy_import():
+    output = run_python(
+        "import sys, genshin; "
+        "print(*(name in sys.modules for name in ('aiohttp', 'pydantic', 'genshin.client', 'genshin.models.zzz')))"
+    )
+    assert output.split() == ["False"] * 4
+
+
+def test_lazy_attributes():
+    output = run_python(
+        "import sys, genshin; "
+        "genshin.Game; "
+        "print('genshin.client' in sys.modules); "
+        "print(genshin.Client.__name__, genshin.models.Wish.__name__, genshin.errors.GenshinException.__name__)"
+    )
+    assert output.split() == ["False", "Client", "Wish", "GenshinException"]
+
+
+def test_no_leaked_imports():
+    output = run_python("import genshin; print(*(hasattr(genshin, name) for name in ('importlib', 'typing', 'types')))")
+    assert output.split() == ["False", "False", "True"]
+
+    output = run_python("import genshin; print(*(name in dir(genshin) for name in ('importlib', 'typing', 'Client')))")
+    assert output.split() == ["False", "False", "True"]
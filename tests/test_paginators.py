@@ -1,3 +1,6 @@
+import asyncio
+import datetime
+import json
 import typing
 
 import pytest
@@ -79,3 +82,283 @@ async def test_merged_paginator_with_key():
 
     paginator = paginators.MergedPaginator(iterators, key=len, limit=5)
     assert await paginator.flatten(lazy=True) == ["dog", "cat", "fish", "horse", "kangaroo"]
+
+
+class MockPagedGetter:
+    def __init__(self, pages: int, page_size: int = 5) -> None:
+        self.pages = pages
+        self.page_size = page_size
+        self.requested: list[int] = []
+
+    async def __call__(self, page: int) -> typing.Sequence[int]:
+        self.requested.append(page)
+        await asyncio.sleep(0.01)
+        if page > self.pages:
+            return []
+
+        start = (page - 1) * self.page_size
+        return list(range(start, start + self.page_size))
+
+
+async def test_prefetching_paginator():
+    getter = MockPagedGetter(pages=4)
+    paginator = paginators.PagedPaginator(getter, page_size=5, prefetch=2)
+
+    values = []
+    async for value in paginator:
+        if value == 0:
+            await asyncio.sleep(0.05)
+            # pages were fetched in the background while the first one was consumed
+            assert len(getter.requested) == 3
+
+        values.append(value)
+
+    assert values == list(range(20))
+
+
+async def test_prefetching_paginator_limit():
+    getter = MockPagedGetter(pages=100)
+    paginator = paginators.PagedPaginator(getter, page_size=5, prefetch=3, limit=7)
+
+    assert await paginator.flatten() == list(range(7))
+
+    await asyncio.sleep(0.05)
+    assert getter.requested == [1, 2]
+
+
+async def test_prefetching_paginator_aclose():
+    getter = MockPagedGetter(pages=100)
+    paginator = paginators.PagedPaginator(getter, page_size=5, prefetch=2)
+
+    assert await paginator.next() == 0
+    await paginator.aclose()
+    requested = len(getter.requested)
+
+    await asyncio.sleep(0.05)
+    assert len(getter.requested) == requested
+    assert paginator.exhausted
+
+
+def pending_tasks() -> list[asyncio.Task[typing.Any]]:
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
+
+
+async def test_prefetching_paginator_break():
+    getter = MockPagedGetter(pages=100)
+
+    async for _ in paginators.PagedPaginator(getter, page_size=5, prefetch=2):
+        # the prefetch task fills up and waits for the consumer
+        await asyncio.sleep(0.05)
+        break
+
+    await asyncio.sleep(0.05)
+    assert not pending_tasks()
+    assert getter.requested == [1, 2, 3]
+
+
+async def test_prefetching_paginator_context_manager():
+    getter = MockPagedGetter(pages=100)
+
+    async with paginators.PagedPaginator(getter, page_size=5, prefetch=2) as paginator:
+        async for value in paginator:
+            if value == 7:
+                break
+
+    requested = len(getter.requested)
+    assert not pending_tasks()
+
+    await asyncio.sleep(0.05)
+    assert len(getter.requested) == requested
+    assert paginator.exhausted
+
+
+async def test_concurrent_paged_paginator():
+    getter = MockPagedGetter(pages=10)
+    paginator = paginators.PagedPaginator(getter, page_size=5, concurrency=4)
+
+    assert await paginator.flatten() == list(range(50))
+    # at most concurrency - 1 requests past the end
+    assert max(getter.requested) <= 14
+
+
+async def test_concurrent_paged_paginator_total():
+    getter = MockPagedGetter(pages=10)
+    paginator = paginators.PagedPaginator(getter, page_size=5, concurrency=4, total=50)
+
+    assert await paginator.flatten() == list(range(50))
+    assert sorted(getter.requested) == list(range(1, 11))
+
+
+class TotalPagedPaginator(paginators.PagedPaginator[int]):
+    def __init__(self, getter: MockPagedGetter, **kwargs: typing.Any) -> None:
+        super().__init__(getter, page_size=getter.page_size, **kwargs)
+        self.mock = getter
+
+    def _get_total(self) -> typing.Optional[int]:
+        return self.mock.pages * self.mock.page_size
+
+
+async def test_concurrent_paged_paginator_first_page_total():
+    getter = MockPagedGetter(pages=10)
+    paginator = TotalPagedPaginator(getter, concurrency=4)
+
+    assert await paginator.flatten() == list(range(50))
+    assert paginator.total == 50
+    assert getter.requested[0] == 1
+    assert sorted(getter.requested) == list(range(1, 11))
+
+
+async def test_concurrent_paged_paginator_single_page():
+    getter = MockPagedGetter(pages=1, page_size=5)
+    paginator = paginators.PagedPaginator(getter, page_size=10, concurrency=4)
+
+    assert await paginator.flatten() == list(range(5))
+    assert getter.requested == [1]
+
+
+async def test_concurrent_paged_paginator_limit():
+    getter = MockPagedGetter(pages=10)
+    paginator = paginators.PagedPaginator(getter, page_size=5, concurrency=4, limit=12)
+
+    assert await paginator.flatten() == list(range(12))
+    assert sorted(getter.requested) == [1, 2, 3]
+
+
+async def test_merged_paginator_limit():
+    getters = [MockPagedGetter(pages=100) for _ in range(5)]
+    iterators = [paginators.PagedPaginator(getter, page_size=5) for getter in getters]
+    paginator = paginators.MergedPaginator(iterators, limit=12)
+
+    assert await paginator.flatten() == sorted([*range(5)] * 5 + [5, 5])[:12]
+    # only the pages needed for the first 12 items are requested
+    assert [getter.requested for getter in getters] == [[1]] * 5
+
+
+async def test_merged_paginator_ties():
+    sequences = [[(1, "a"), (2, "a")], [(1, "b"), (2, "b")], [(1, "c")]]
+    iterators = [paginators.base.aiterate(x) for x in sequences]
+
+    paginator = paginators.MergedPaginator(iterators, key=lambda item: item[0], limit=10)
+    assert [item[1] async for item in paginator] == ["a", "b", "c", "a", "b"]
+
+
+async def test_merged_paginator_concurrent_pages():
+    getters = [MockPagedGetter(pages=4) for _ in range(5)]
+    iterators = [paginators.PagedPaginator(getter, page_size=5) for getter in getters]
+    paginator = paginators.MergedPaginator(iterators)
+
+    start = asyncio.get_running_loop().time()
+    assert await paginator.flatten(lazy=True) == sorted([*range(20)] * 5)
+    # every getter sleeps 10ms per page, pages of different iterators are requested at once
+    assert asyncio.get_running_loop().time() - start < 5 * 5 * 0.01
+
+
+async def test_merged_paginator_break():
+    getters = [MockPagedGetter(pages=100, page_size=1) for _ in range(3)]
+    iterators = [paginators.PagedPaginator(getter, page_size=1) for getter in getters]
+
+    async for _ in paginators.MergedPaginator(iterators):
+        break
+
+    await asyncio.sleep(0)
+    assert not pending_tasks()
+
+    await asyncio.sleep(0.05)
+    assert [getter.requested for getter in getters] == [[1, 2], [1, 2], [1, 2]]
+
+
+async def test_merged_paginator_context_manager():
+    getters = [MockPagedGetter(pages=100) for _ in range(3)]
+    iterators = [paginators.PagedPaginator(getter, page_size=5, prefetch=2) for getter in getters]
+
+    async with paginators.MergedPaginator(iterators) as paginator:
+        assert await paginator.next() == 0
+
+    assert not pending_tasks()
+    assert all(iterator.exhausted for iterator in iterators)
+
+
+class TimedItem(typing.NamedTuple):
+    id: int
+    time: datetime.datetime
+
+
+class MockCursorGetter:
+    """Returns items newest first, one per hour."""
+
+    def __init__(self, items: int, page_size: int = 5) -> None:
+        start = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        self.items = [TimedItem(i, start + datetime.timedelta(hours=i)) for i in range(items, 0, -1)]
+        self.page_size = page_size
+        self.requested: list[int] = []
+
+    async def __call__(self, end_id: int) -> typing.Sequence[TimedItem]:
+        self.requested.append(end_id)
+        return [item for item in self.items if not end_id or item.id < end_id][: self.page_size]
+
+
+async def test_cursor_paginator_since():
+    getter = MockCursorGetter(items=100)
+    since = getter.items[0].time - datetime.timedelta(hours=11)
+    paginator = paginators.CursorPaginator(getter, page_size=5, since=since)  # type: ignore
+
+    assert [item.id async for item in paginator] == list(range(100, 88, -1))
+    assert getter.requested == [0, 96, 91]
+
+
+async def test_paged_paginator_until():
+    getter = MockCursorGetter(items=100)
+    until = getter.items[0].time - datetime.timedelta(hours=12)
+
+    async def get_page(page: int) -> typing.Sequence[TimedItem]:
+        return getter.items[(page - 1) * 5 : page * 5]
+
+    since = until - datetime.timedelta(hours=2)
+    paginator = paginators.PagedPaginator(get_page, page_size=5, until=until, since=since)
+
+    assert [item.id async for item in paginator] == [88, 87, 86]
+
+
+async def test_paged_paginator_resume():
+    paginator = paginators.PagedPaginator(MockPagedGetter(pages=4), page_size=5)
+    values = [await paginator.next() for _ in range(7)]
+    checkpoint = json.loads(json.dumps(paginator.checkpoint()))
+
+    getter = MockPagedGetter(pages=4)
+    paginator = paginators.PagedPaginator(getter, page_size=5, limit=15).resume(checkpoint)
+    values += await paginator.flatten()
+
+    assert values == list(range(15))
+    # only the page of the last yielded item is requested again
+    assert getter.requested == [2, 3]
+
+
+async def test_cursor_paginator_resume_prefetch():
+    paginator = paginators.CursorPaginator(MockCursorGetter(items=30), page_size=5, prefetch=3)  # type: ignore
+    ids = [(await paginator.next()).id for _ in range(10)]
+    checkpoint = paginator.checkpoint()
+    await paginator.aclose()
+
+    getter = MockCursorGetter(items=30)
+    paginator = paginators.CursorPaginator(getter, page_size=5, prefetch=3).resume(checkpoint)  # type: ignore
+    ids += [item.id async for item in paginator]
+
+    assert ids == list(range(30, 0, -1))
+    assert getter.requested[0] == 26
+
+
+async def test_merged_paginator_resume():
+    def create() -> paginators.MergedPaginator[int]:
+        getters = [MockPagedGetter(pages=3, page_size=size) for size in (2, 5)]
+        iterators = [paginators.PagedPaginator(getter, page_size=getter.page_size) for getter in getters]
+        return paginators.MergedPaginator(iterators)
+
+    paginator = create()
+    values = [await paginator.next() for _ in range(9)]
+    checkpoint = json.loads(json.dumps(paginator.checkpoint()))
+
+    values += await create().resume(checkpoint).flatten(lazy=True)
+    assert values == sorted([*range(6), *range(15)])
+
+    with pytest.raises(TypeError):
+        paginators.MergedPaginator([paginators.base.aiterate([1])]).checkpoint()
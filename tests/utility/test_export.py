@@ -0,0 +1,61 @@
+import asyncio
+import csv
+import json
+import pathlib
+import typing
+
+import genshin
+from genshin.utility import export
+
+WISH = {
+    "uid": "710785423",
+    "time": "2023-01-01 12:00:00",
+    "name": "Kamisato Ayaka",
+    "item_type": "Character",
+    "rank_type": "5",
+}
+
+
+class Pages(genshin.paginators.PagedPaginator[genshin.models.Wish]):
+    """Paginator of wishes with ids going down from start + 1000."""
+
+    def __init__(self, pages: int, start: int = 0) -> None:
+        async def getter(page: int) -> typing.Sequence[genshin.models.Wish]:
+            if page > pages:
+                return []
+
+            await asyncio.sleep(0)
+            data = [dict(WISH, id=str(start + (10 - page) * 100 + i)) for i in range(19, -1, -1)]
+            return genshin.models.Wish.parse_many(data, banner_type=301, tz_offset=0)
+
+        super().__init__(getter, page_size=20)
+
+
+async def test_export_jsonl(tmp_path: pathlib.Path):
+    count = await export.export_history(Pages(3), tmp_path / "wishes.jsonl", buffer_size=100)
+
+    lines = (tmp_path / "wishes.jsonl").read_text(encoding="utf-8").splitlines()
+    assert count == len(lines) == 60
+    assert json.loads(lines[0])["name"] == "Kamisato Ayaka"
+    assert json.loads(lines[-1])["id"] == 700
+
+
+async def test_export_csv(tmp_path: pathlib.Path):
+    history = genshin.paginators.MergedPaginator([Pages(2), Pages(2, start=50)], key=lambda wish: -wish.id)
+    await export.export_history(history, tmp_path / "wishes.csv")
+
+    with (tmp_path / "wishes.csv").open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+
+    assert len(rows) == 80
+    assert rows[0]["rarity"] == "5"
+    assert [int(row["id"]) for row in rows] == sorted(int(row["id"]) for row in rows)[::-1]
+
+
+async def test_export_histories(tmp_path: pathlib.Path):
+    counts = await export.export_histories(
+        {tmp_path / f"{uid}.jsonl": Pages(uid) for uid in range(1, 4)},
+        concurrency=2,
+    )
+
+    assert counts == {str(tmp_path / f"{uid}.jsonl"): uid * 20 for uid in range(1, 4)}
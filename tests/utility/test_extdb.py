@@ -0,0 +1,122 @@
+import asyncio
+import json
+import pathlib
+import typing
+
+import aiohttp.test_utils
+import aiohttp.web
+import pytest
+
+from genshin.models.genshin import constants
+from genshin.utility import extdb
+
+AYAKA = constants.DBChar(10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)
+
+
+@pytest.fixture(name="updates")
+def updates_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> list[str]:
+    updates: list[str] = []
+
+    async def update_characters_any(langs: typing.Any = None, *, lenient: bool = False) -> None:
+        updates.append(langs)
+        await asyncio.sleep(0.01)
+        if langs == "broken":
+            raise RuntimeError("Failed to update characters")
+
+        extdb.update_character_name(langs, *AYAKA[:5])
+
+    monkeypatch.setattr(constants, "CHARACTER_NAMES", constants.CharacterDatabase())
+    monkeypatch.setattr(extdb, "CHARACTER_STORE", extdb.CharacterStore(tmp_path))
+    monkeypatch.setattr(extdb, "update_characters_any", update_characters_any)
+    return updates
+
+
+async def test_refresher_single_flight(updates: list[str]):
+    refresher = extdb.CharacterRefresher()
+
+    futures = [refresher.ensure("en-us") for _ in range(10)]
+    await asyncio.gather(*futures)  # type: ignore
+
+    assert updates == ["en-us"]
+    assert len({id(future) for future in futures}) == 1
+    assert refresher.ensure("en-us") is None
+    assert constants.CHARACTER_NAMES["en-us"][AYAKA.id] == AYAKA
+    assert not refresher._refreshing
+
+
+async def test_refresher_background(updates: list[str]):
+    refresher = extdb.CharacterRefresher(ttl=0)
+    constants.CHARACTER_NAMES["en-us"] = {AYAKA.id: AYAKA}
+
+    assert refresher.ensure("en-us") is None  # names set by the user
+    assert refresher.ensure("en-us") is None  # stale, refreshed in the background
+    assert refresher.ensure("en-us") is None
+
+    # the in-flight refresh is found without going through the single flight table
+    assert refresher._inflight.calls == 1
+    assert refresher._inflight.coalesced == 0
+
+    await asyncio.sleep(0.02)
+    assert updates == ["en-us"]
+    assert not refresher._refreshing
+
+
+async def test_refresher_failure(updates: list[str]):
+    refresher = extdb.CharacterRefresher()
+
+    with pytest.raises(RuntimeError, match="Failed to update characters"):
+        await refresher.ensure("broken")  # type: ignore
+
+    assert refresher.ensure("broken") is not None
+
+
+async def test_stream_json_strings():
+    textmap = {str(i): f"Name {i}" for i in range(1000)}
+    textmap.update({"1": 'Quoted "name" \\ 神里綾華', "2": "Line\nbreak"})
+    body = json.dumps(textmap, ensure_ascii=False, indent=1).encode()
+
+    async def handler(request: aiohttp.web.Request) -> aiohttp.web.StreamResponse:
+        response = aiohttp.web.StreamResponse()
+        await response.prepare(request)
+        for i in range(0, len(body), 7):  # split everything, including multi-byte characters
+            await response.write(body[i : i + 7])
+        return response
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/", handler)
+
+    async with aiohttp.test_utils.TestServer(app) as server, aiohttp.ClientSession() as session:
+        async with session.get(server.make_url("/")) as response:
+            names = await extdb._stream_json_strings(response, {"1", "2", "999", "missing"}, chunk_size=5)
+
+    assert names == {"1": textmap["1"], "2": textmap["2"], "999": "Name 999"}
+
+
+async def test_character_store(tmp_path: pathlib.Path):
+    store = extdb.CharacterStore(tmp_path)
+    assert store.read("en-us") is None
+
+    await store.write("en-us", {AYAKA.id: AYAKA})
+    await asyncio.gather(*(store.write("ja-jp", {AYAKA.id: AYAKA._replace(name=str(i))}) for i in range(10)))
+
+    assert store.is_fresh("en-us")
+    assert store.read("en-us") == {AYAKA.id: AYAKA}
+    assert store.read("ja-jp")[AYAKA.id].name in {str(i) for i in range(10)}  # type: ignore
+    assert sorted(store.get_langs()) == ["en-us", "ja-jp"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["en-us.json", "ja-jp.json"]
+
+    store.get_path("ko-kr").write_text("{")  # torn or foreign file
+    assert store.get_metadata("ko-kr") is None
+    assert extdb.CharacterStore(tmp_path, max_age=0).read("en-us") is None
+
+
+async def test_character_store_load(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(constants, "CHARACTER_NAMES", constants.CharacterDatabase())
+    await extdb.CharacterStore(tmp_path).write("en-us", {AYAKA.id: AYAKA})
+
+    store = extdb.CharacterStore(tmp_path)
+    store.load("ja-jp")
+    assert "en-us" not in constants.CHARACTER_NAMES
+
+    store.load("en-us")
+    assert constants.CHARACTER_NAMES["en-us"][AYAKA.id] == AYAKA
@@ -0,0 +1,68 @@
+import json
+import pathlib
+import typing
+
+import aiohttp.test_utils
+import aiohttp.web
+import pytest
+
+from genshin.utility import extdb, httpcache
+
+
+@pytest.fixture(name="server")
+async def server_fixture() -> typing.AsyncIterator[tuple[aiohttp.test_utils.TestServer, dict[str, typing.Any]]]:
+    state: dict[str, typing.Any] = {"body": {"version": 1}, "full": 0, "not_modified": 0}
+
+    async def handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        etag = f'"{state["body"]["version"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            state["not_modified"] += 1
+            return aiohttp.web.Response(status=304, headers={"ETag": etag})
+
+        state["full"] += 1
+        return aiohttp.web.Response(text=json.dumps(state["body"]), headers={"ETag": etag})
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/{name}", handler)
+
+    async with aiohttp.test_utils.TestServer(app) as server:
+        yield server, state
+
+
+@pytest.mark.parametrize("cache_type", ["memory", "file"])
+async def test_conditional_get(
+    server: tuple[aiohttp.test_utils.TestServer, dict[str, typing.Any]], cache_type: str, tmp_path: pathlib.Path
+):
+    test_server, state = server
+    cache = httpcache.ValidatorCache() if cache_type == "memory" else httpcache.FileValidatorCache(tmp_path)
+    url = test_server.make_url("/data.json")
+
+    async with aiohttp.ClientSession() as session:
+        assert await httpcache.conditional_get(session, url, cache) == {"version": 1}
+        assert await httpcache.conditional_get(session, url, cache) == {"version": 1}
+        assert (state["full"], state["not_modified"]) == (1, 1)
+
+        state["body"] = {"version": 2}
+        assert await httpcache.conditional_get(session, url, cache) == {"version": 2}
+        assert (state["full"], state["not_modified"]) == (2, 1)
+
+        # a cached body which cannot be used is downloaded again
+        assert await httpcache.conditional_get(session, url, cache, usable=lambda body: "other" in body)
+        assert (state["full"], state["not_modified"]) == (3, 1)
+
+
+async def test_fetch_jsons(
+    server: tuple[aiohttp.test_utils.TestServer, dict[str, typing.Any]],
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    test_server, state = server
+    monkeypatch.setattr(extdb, "HTTP_CACHE", httpcache.FileValidatorCache(tmp_path))
+    urls = [str(test_server.make_url(f"/{i}.json")) for i in range(3)]
+
+    assert await extdb._fetch_jsons(*urls) == [{"version": 1}] * 3
+    assert await extdb._fetch_jsons(*urls) == [{"version": 1}] * 3
+    assert (state["full"], state["not_modified"]) == (3, 3)
+
+    # shared between processes
+    assert await httpcache.FileValidatorCache(tmp_path).get(urls[0]) is not None